@@ -0,0 +1,37 @@
+"""Build the precomputed bank-holiday database shipped with the integration."""
+
+import argparse
+import os
+import sys
+import types
+from importlib import import_module
+
+COMPONENT = os.path.join(
+    os.path.dirname(__file__), "..", "..", "custom_components", "isitpayday"
+)
+
+
+def build_database():
+    """Build the database for the installed holidays version."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--first-year", type=int, default=2000)
+    parser.add_argument("--last-year", type=int, default=2050)
+    parser.add_argument(
+        "--output", default=os.path.join(COMPONENT, "bank_holidays.bin")
+    )
+    args = parser.parse_args()
+
+    # Load the calculator without the integration's __init__, which needs
+    # Home Assistant.
+    package = types.ModuleType("custom_components.isitpayday")
+    package.__path__ = [COMPONENT]
+    sys.modules["custom_components.isitpayday"] = package
+    calculator = import_module("custom_components.isitpayday.payday_calculator")
+
+    regions = calculator.build_holiday_database(
+        args.output, args.first_year, args.last_year
+    )
+    print(f"Wrote {regions} regions to {args.output}")
+
+
+build_database()
@@ -0,0 +1,199 @@
+"""Benchmarks for the payday calculator hot paths.
+
+Covers `get_bank_holidays`, `calculate_upcoming_paydays`,
+`calculate_last_payday` and `get_supported_countries`, each with cold
+caches (everything cached is dropped before every call) and warm caches.
+The payday benchmarks cover every frequency, counts of 1 and the maximum
+of 24, and anchors 1 and 50 years old. Every call is made once for each
+region in `REGIONS`.
+
+Results are written as JSON, so `compare.py` can diff two runs:
+
+    python benchmarks/bench_calculator.py --output before.json
+    # ... change something ...
+    python benchmarks/bench_calculator.py --output after.json
+    python benchmarks/compare.py before.json after.json
+
+"today" is pinned to `TODAY`, so runs on different days are comparable.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import types
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, timezone
+from importlib import import_module
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The helpers shared with the tests live at the top of the source tree.
+sys.path.insert(0, ROOT)
+
+from harness.git import git_commit  # noqa: E402
+
+TODAY = date(2026, 6, 15)
+
+# A spread of countries: Saturday-Sunday and Friday-Saturday weekends,
+# with and without subdivisions, few and many holidays.
+REGIONS = (
+    ("DK", None),
+    ("DE", "BY"),
+    ("US", "CA"),
+    ("GB", None),
+    ("JP", None),
+    ("BR", None),
+    ("AU", "NSW"),
+    ("SA", None),
+)
+
+FREQUENCIES = (
+    "monthly",
+    "bimonthly",
+    "14_days",
+    "28_days",
+    "quarterly",
+    "semiannual",
+    "annual",
+    "weekly",
+)
+
+# Frequencies whose paydays follow from an anchor date (the last payday).
+ANCHORED = {"bimonthly", "14_days", "28_days", "quarterly", "semiannual", "annual"}
+
+COUNTS = (1, 24)
+ANCHOR_AGES = (1, 50)
+
+
+def _time(func: Callable[[], object], setup: Callable[[], object], repeat: int):
+    """Return the seconds of `repeat` calls of func, each after setup."""
+    times = []
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def _cold(calc) -> Callable[[], None]:
+    """Return a setup function that drops every cache of the calculator."""
+    return calc.clear_holiday_cache
+
+
+def _schedules(calc, frequency: str, anchor_age: int, regions):
+    anchor = TODAY.replace(year=TODAY.year - anchor_age) - timedelta(days=3)
+    return [
+        calc.PaydaySchedule(
+            country,
+            frequency,
+            "last_bank_day" if frequency == "monthly" else None,
+            anchor if frequency in ANCHORED else None,
+            4 if frequency == "weekly" else None,
+            0,
+            subdiv,
+        )
+        for country, subdiv in regions
+    ]
+
+
+def benchmark_cases(calc, regions=REGIONS):
+    """Yield (name, func) for every benchmark."""
+    years = [TODAY.year, TODAY.year + 1, TODAY.year + 2]
+
+    def holidays():
+        for country, subdiv in regions:
+            calc.get_bank_holidays(country, years, subdiv)
+
+    yield "get_bank_holidays", holidays
+    yield "get_supported_countries", calc.get_supported_countries
+
+    for frequency in FREQUENCIES:
+        ages = ANCHOR_AGES if frequency in ANCHORED else (None,)
+        for age in ages:
+            schedules = _schedules(calc, frequency, age or 1, regions)
+            prefix = f"{frequency}/anchor={age}y" if age else frequency
+
+            def last(schedules=schedules):
+                for schedule in schedules:
+                    calc.calculate_last_payday(schedule)
+
+            yield f"calculate_last_payday/{prefix}", last
+
+            for count in COUNTS:
+
+                def upcoming(schedules=schedules, count=count):
+                    for schedule in schedules:
+                        calc.calculate_upcoming_paydays(schedule, count)
+
+                yield f"calculate_upcoming_paydays/{prefix}/count={count}", upcoming
+
+
+def run_benchmarks(calc, regions=REGIONS, repeat: int = 7) -> dict:
+    """Run every benchmark cold and warm; return results by name.
+
+    Each result holds the minimum and median seconds of one call (covering
+    all regions) and the number of calls timed.
+    """
+    cold = _cold(calc)
+    results = {}
+    for name, func in benchmark_cases(calc, regions):
+        # Warm runs are preceded by an untimed call of their own.
+        for cache, setup in (("cold", cold), ("warm", func)):
+            times = _time(func, setup, repeat)
+            results[f"{name}/{cache}"] = {
+                "min": min(times),
+                "median": statistics.median(times),
+                "repeat": repeat,
+            }
+    return results
+
+
+def load_calculator():
+    """Import the calculator with the real holidays package and pin today."""
+    package = types.ModuleType("custom_components.isitpayday")
+    package.__path__ = [os.path.join(ROOT, "custom_components", "isitpayday")]
+    sys.modules["custom_components.isitpayday"] = package
+    calc = import_module("custom_components.isitpayday.payday_calculator")
+
+    class _PinnedDate(date):
+        @classmethod
+        def today(cls):
+            return TODAY
+
+    calc.date = _PinnedDate
+    return calc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    calc = load_calculator()
+    results = run_benchmarks(calc, REGIONS, args.repeat)
+    data = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "holidays": calc.holidays_version(),
+            "regions": [calc.region_key(*region) for region in REGIONS],
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(f"{name:<{width}}  {result['min'] * 1000:10.3f} ms")
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
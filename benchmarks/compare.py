@@ -0,0 +1,68 @@
+"""Compare two benchmark result files written by bench_calculator.py.
+
+    python benchmarks/compare.py before.json after.json [--threshold 1.2]
+
+Prints the minimum time of every benchmark in both files and the ratio
+new/old. Benchmarks slower by more than the threshold are marked as
+regressions and make the script exit with status 1.
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[dict]:
+    """Return one row per benchmark present in either result set."""
+    rows = []
+    for name in sorted(old["results"].keys() | new["results"].keys()):
+        before = old["results"].get(name)
+        after = new["results"].get(name)
+        ratio = after["min"] / before["min"] if before and after else None
+        rows.append(
+            {
+                "name": name,
+                "old": before["min"] if before else None,
+                "new": after["min"] if after else None,
+                "ratio": ratio,
+                "regression": ratio is not None and ratio > threshold,
+            }
+        )
+    return rows
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.3f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    with open(args.old, encoding="UTF-8") as file:
+        old = json.load(file)
+    with open(args.new, encoding="UTF-8") as file:
+        new = json.load(file)
+
+    rows = compare(old, new, args.threshold)
+    print(f"old: {old['meta'].get('commit')}  new: {new['meta'].get('commit')}")
+    width = max((len(row["name"]) for row in rows), default=0)
+    print(f"{'benchmark':<{width}}  {'old ms':>10}  {'new ms':>10}  {'ratio':>7}")
+    for row in rows:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<{width}}  {_ms(row['old']):>10}  {_ms(row['new']):>10}"
+            f"  {ratio:>7}{flag}"
+        )
+
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{len(rows)} benchmarks, {regressions} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
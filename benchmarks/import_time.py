@@ -0,0 +1,124 @@
+"""Import time of the integration package, as Home Assistant loads it.
+
+Imports `custom_components/isitpayday/__init__.py` (and everything it
+imports) on the Home Assistant stand-in from `harness/home_assistant.py`,
+in a fresh interpreter for every run, with `-X importtime`. Reports the
+median time to load the package and the slowest modules it imported, and
+exits with status 1 if the median is over the budget:
+
+    python benchmarks/import_time.py --budget 40 --output import.json
+
+The stand-in is imported before timing starts, so only the integration's
+own imports are counted. The first run writes the bytecode and is not
+counted.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The helpers shared with the tests live at the top of the source tree.
+sys.path.insert(0, ROOT)
+
+from harness.git import git_commit  # noqa: E402
+
+_MARKER = "-- load_integration --"
+
+_SCRIPT = f"""
+import json, sys, time
+from datetime import datetime, timezone
+
+sys.path.insert(0, {ROOT!r})
+from harness.home_assistant import VirtualClock, homeassistant_modules, load_integration
+
+clock = VirtualClock(datetime.now(timezone.utc), timezone.utc)
+sys.modules.update(homeassistant_modules(clock))
+print({_MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+load_integration()
+elapsed = time.perf_counter() - start
+holidays = [name for name in sys.modules if name.split(".")[0] == "holidays"]
+print(json.dumps({{"seconds": elapsed, "holidays": bool(holidays)}}))
+"""
+
+
+def import_once() -> dict:
+    """Load the integration in a fresh interpreter and return the timings.
+
+    `modules` maps every module imported while loading the package to the
+    microseconds spent in it, excluding its own imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index(_MARKER) + 1 :]:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(self_us)
+    return {**json.loads(result.stdout), "modules": modules}
+
+
+def run(repeat: int) -> dict:
+    """Return the median load time and per-module times over `repeat` runs."""
+    import_once()
+    runs = [import_once() for _ in range(repeat)]
+    modules = {
+        name: statistics.median(run["modules"].get(name, 0) for run in runs)
+        for name in runs[0]["modules"]
+    }
+    return {
+        "median": statistics.median(run["seconds"] for run in runs),
+        "min": min(run["seconds"] for run in runs),
+        "holidays": any(run["holidays"] for run in runs),
+        "modules": dict(sorted(modules.items(), key=lambda item: -item[1])),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=40, help="milliseconds")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default="import.json")
+    args = parser.parse_args()
+
+    result = run(args.repeat)
+    print(
+        f"Loaded the integration in {result['median'] * 1000:.1f} ms"
+        f" (min {result['min'] * 1000:.1f} ms, budget {args.budget:g} ms)"
+    )
+    for name, self_us in list(result["modules"].items())[: args.top]:
+        print(f"{self_us / 1000:>8.2f} ms  {name}")
+    if result["holidays"]:
+        print("The holidays package was imported")
+
+    data = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+            "budget": args.budget,
+        },
+        "result": result,
+    }
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json.dump(data, file, indent=2)
+    print(f"Wrote the result to {args.output}")
+    if result["median"] * 1000 > args.budget or result["holidays"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Load test: set up hundreds of config entries on a Home Assistant stand-in.
+
+Creates N entries with a mix of the countries in `bench_calculator.REGIONS`
+and every pay frequency, sets each one up with `async_setup_entry` on the
+virtual-clock stand-in from `harness/home_assistant.py`, then runs the
+coordinators' timers for a simulated day. Reports, per N:
+
+- the total setup time and the executor jobs spent on setup,
+- the time per coordinator refresh over the simulated day,
+- the peak memory traced during setup and the simulated day, measured in
+  a second, separate run, so tracing does not inflate the timings.
+
+Each N starts from empty caches, like a Home Assistant restart:
+
+    python benchmarks/load_entries.py --entries 100 500 1000 --output load.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from bench_calculator import FREQUENCIES, REGIONS, TODAY, load_calculator
+
+from harness.git import git_commit
+from harness.home_assistant import (
+    Simulation,
+    VirtualClock,
+    homeassistant_modules,
+    load_integration,
+)
+
+TZ = ZoneInfo("Europe/Copenhagen")
+
+MONTHLY_PAY_DAYS = ("last_bank_day", "first_bank_day", 1, 15, 25, 31)
+
+
+def entry_configs(count: int, regions=REGIONS) -> list[dict]:
+    """Return `count` entry settings cycling through regions and frequencies."""
+    configs = []
+    pay_days = itertools.cycle(MONTHLY_PAY_DAYS)
+    combinations = itertools.cycle(itertools.product(regions, FREQUENCIES))
+    for number, ((country, subdiv), frequency) in enumerate(
+        itertools.islice(combinations, count)
+    ):
+        config = {
+            "name": f"Payday {number}",
+            "country": country,
+            "pay_frequency": frequency,
+            "bank_offset": number % 3,
+        }
+        if subdiv:
+            config["subdivision"] = subdiv
+        if frequency == "monthly":
+            config["pay_day"] = next(pay_days)
+        elif frequency == "weekly":
+            config["weekday"] = number % 5
+        else:
+            # Anchors spread over the last two years.
+            config["last_pay_date"] = (
+                TODAY - timedelta(days=3 + number * 7 % 730)
+            ).isoformat()
+        configs.append(config)
+    return configs
+
+
+async def _async_run(simulation: Simulation, configs, duration: timedelta) -> dict:
+    hass = simulation.hass
+    started = time.perf_counter()
+    await simulation.async_setup()
+    for config in configs:
+        await simulation.async_add_entry(config)
+    setup = time.perf_counter() - started
+    setup_jobs = simulation.executor_jobs
+    setup_refreshes = simulation.report().refreshes
+
+    started = time.perf_counter()
+    await simulation.async_run(duration)
+    elapsed = time.perf_counter() - started
+    refreshes = simulation.report().refreshes - setup_refreshes
+    return {
+        "entries": len(configs),
+        "setup": setup,
+        "setup_per_entry": setup / len(configs),
+        "setup_executor_jobs": setup_jobs,
+        "refreshes": refreshes,
+        "refresh": elapsed / refreshes if refreshes else None,
+        "run_executor_jobs": simulation.executor_jobs - setup_jobs,
+        "calculator_calls": simulation.calculator_calls,
+        "executor": hass.data["isitpayday"]["executor"].info(),
+    }
+
+
+def run_scenario(
+    calc,
+    configs,
+    duration: timedelta = timedelta(days=1),
+    trace_memory: bool = False,
+) -> dict:
+    """Set up the entries on a fresh stand-in and run them for `duration`.
+
+    With `trace_memory`, the result also holds the peak traced memory in
+    bytes; the timings of such a run are not representative.
+    """
+    # Drop everything the calculator caches, as after a restart.
+    calc.clear_holiday_cache()
+    start = datetime.combine(TODAY, datetime.min.time(), TZ)
+    clock = VirtualClock(start.astimezone(timezone.utc), TZ)
+    sys.modules.update(homeassistant_modules(clock))
+    simulation = Simulation(load_integration(), calc, clock)
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        result = asyncio.run(_async_run(simulation, configs, duration))
+        if trace_memory:
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        simulation.stop()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--days", type=float, default=1)
+    parser.add_argument("--output", default="load.json")
+    args = parser.parse_args()
+
+    calc = load_calculator()
+    duration = timedelta(days=args.days)
+    results = []
+    for count in args.entries:
+        configs = entry_configs(count)
+        result = run_scenario(calc, configs, duration)
+        result["peak_memory"] = run_scenario(calc, configs, duration, True)[
+            "peak_memory"
+        ]
+        results.append(result)
+        print(
+            f"{count:>5} entries: setup {result['setup']:.2f} s"
+            f" ({result['setup_per_entry'] * 1000:.2f} ms/entry,"
+            f" {result['setup_executor_jobs']} executor jobs),"
+            f" refresh {result['refresh'] * 1e6:.1f} us"
+            f" ({result['refreshes']} refreshes,"
+            f" {result['run_executor_jobs']} executor jobs),"
+            f" peak memory {result['peak_memory'] / 2**20:.1f} MiB"
+        )
+
+    data = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "holidays": calc.holidays_version(),
+            "days": args.days,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json.dump(data, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Profile the holiday generation cost of every supported region.
+
+For each country from `holidays.list_supported_countries()` and each of
+its subdivisions, `get_bank_holidays` is timed over three years starting
+at `TODAY.year`, with the calculator's caches dropped before every call.
+The memory the call allocates and keeps is measured with `tracemalloc`
+in a separate call, so tracing does not inflate the timings, and the
+holidays are counted per bank closing category.
+
+The regions are ranked by generation time, which tells which ones gain
+most from being precomputed or persisted first:
+
+    python benchmarks/profile_regions.py --output regions.json --top 40
+    python benchmarks/profile_regions.py --country DE --country US
+
+"first" is the time of the first call for a region, which includes
+anything the holidays package loads lazily on first use; "min" is the
+fastest of the `--repeat` calls after that.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+from bench_calculator import TODAY, load_calculator
+
+from harness.git import git_commit
+
+YEARS = [TODAY.year, TODAY.year + 1, TODAY.year + 2]
+
+
+def supported_regions(calc, countries=None) -> list[tuple[str, str | None]]:
+    """Return (country, subdiv) for every supported country and subdivision.
+
+    Each country is listed once without a subdivision, then once per
+    subdivision. Alpha-3 aliases of the country codes are left out.
+    """
+    supported = calc._holidays().list_supported_countries(include_aliases=False)
+    regions = []
+    for country in sorted(supported):
+        if countries and country not in countries:
+            continue
+        regions.append((country, None))
+        regions.extend((country, subdiv) for subdiv in supported[country])
+    return regions
+
+
+def _category_counts(calc, country: str, subdiv: str | None) -> dict[str, int]:
+    """Return the number of holidays in `YEARS` per bank closing category."""
+    holidays_lib = calc._holidays()
+    return {
+        category: len(
+            holidays_lib.country_holidays(
+                country, subdiv=subdiv, years=YEARS, categories=(category,)
+            )
+        )
+        for category in calc._resolve_categories(country)
+    }
+
+
+def _retained_bytes(calc, country: str, subdiv: str | None) -> int:
+    """Return the bytes a cold `get_bank_holidays` call allocates and keeps."""
+    calc.evict_holiday_cache(country)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        table = calc.get_bank_holidays(country, YEARS, subdiv)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del table
+    return retained
+
+
+def profile_region(calc, country: str, subdiv: str | None, repeat: int) -> dict:
+    """Return the generation time, memory and holiday counts of one region."""
+    times = []
+    for _ in range(repeat + 1):
+        calc.evict_holiday_cache(country)
+        started = time.perf_counter()
+        calc.get_bank_holidays(country, YEARS, subdiv)
+        times.append(time.perf_counter() - started)
+
+    categories = _category_counts(calc, country, subdiv)
+    return {
+        "region": calc.region_key(country, subdiv),
+        "country": country,
+        "subdiv": subdiv,
+        "first": times[0],
+        "min": min(times[1:]),
+        "bytes": _retained_bytes(calc, country, subdiv),
+        "holidays": len(calc.get_bank_holidays(country, YEARS, subdiv)),
+        "categories": categories,
+    }
+
+
+def profile_regions(calc, regions, repeat: int = 3) -> list[dict]:
+    """Profile every region; return the results slowest first.
+
+    Regions the holidays package fails to generate are reported with an
+    "error" and no measurements, after all the others.
+    """
+    results = []
+    errors = []
+    for country, subdiv in regions:
+        try:
+            results.append(profile_region(calc, country, subdiv, repeat))
+        except Exception as err:  # noqa: BLE001 - report it and carry on
+            errors.append(
+                {
+                    "region": calc.region_key(country, subdiv),
+                    "country": country,
+                    "subdiv": subdiv,
+                    "error": repr(err),
+                }
+            )
+    results.sort(key=lambda result: result["min"], reverse=True)
+    return results + errors
+
+
+def summarize(results: list[dict]) -> Counter:
+    """Return the total number of holidays per category over all regions."""
+    totals: Counter = Counter()
+    for result in results:
+        totals.update(result.get("categories", {}))
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="regions.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--country", action="append", help="only profile this country (repeatable)"
+    )
+    args = parser.parse_args()
+
+    calc = load_calculator()
+    regions = supported_regions(calc, args.country)
+    results = profile_regions(calc, regions, args.repeat)
+    data = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "holidays": calc.holidays_version(),
+            "years": YEARS,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="UTF-8") as file:
+        json.dump(data, file, indent=2)
+
+    measured = [result for result in results if "error" not in result]
+    print(
+        f"{'rank':>4}  {'region':<12}  {'min ms':>8}  {'first ms':>9}"
+        f"  {'KiB':>7}  {'days':>5}  categories"
+    )
+    for rank, result in enumerate(measured[: args.top], 1):
+        categories = ", ".join(f"{k}={v}" for k, v in result["categories"].items())
+        print(
+            f"{rank:>4}  {result['region']:<12}  {result['min'] * 1000:8.3f}"
+            f"  {result['first'] * 1000:9.3f}  {result['bytes'] / 1024:7.1f}"
+            f"  {result['holidays']:>5}  {categories}"
+        )
+    for result in results[len(measured) :]:
+        print(f"ERROR {result['region']}: {result['error']}", file=sys.stderr)
+
+    total = sum(result["min"] for result in measured)
+    print(
+        f"{len(measured)} regions, {len(results) - len(measured)} errors,"
+        f" {total:.2f} s to generate all, {sum(r['bytes'] for r in measured)}"
+        f" bytes retained"
+    )
+    totals = ", ".join(f"{k}={v}" for k, v in summarize(measured).most_common())
+    print(f"Holidays per category: {totals}")
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
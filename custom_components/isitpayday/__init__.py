@@ -1,58 +1,56 @@
 import logging
 from datetime import date, datetime, time, timedelta
-from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .const import (
-    CONF_BANK_OFFSET,
+    CONF_CLOSED_DAYS,
     CONF_COUNTRY,
     CONF_EVENT_TIME,
-    CONF_LAST_PAY_DATE,
     CONF_NAME,
-    CONF_PAY_DAY,
-    CONF_PAY_FREQ,
-    CONF_SUBDIV,
-    CONF_WEEKDAY,
+    CONF_OPEN_DAYS,
+    DATA_BANK_DAYS,
+    DATA_COUNTRY_INDEX,
+    DATA_EXECUTOR,
+    DATA_SHARED,
     DEFAULT_EVENT_TIME,
     DOMAIN,
     EVENT_PAYDAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
+from .executor import CalculationExecutor
 from .payday_calculator import (
-    calculate_last_payday,
-    calculate_upcoming_paydays,
-    get_supported_countries,
+    CountryIndex,
+    PaydaySchedule,
+    PaydayWindow,
+    bank_days_changes,
+    bank_years_compiled,
+    calculate_payday_window,
+    closure_days_affect,
+    compile_bank_years,
+    export_bank_closing_days,
+    get_country_index,
+    is_country_supported,
+    prefetch_bank_year,
+    restore_bank_closing_days,
+    update_payday_window,
+    window_years,
 )
+from .shared import SharedSchedules
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _normalize_pay_day(value):
-    """Normalize pay_day from older config entries.
-
-    Specific days may have been stored as strings (e.g. '31') by older
-    versions; convert those to int. String options like 'last_bank_day'
-    pass through unchanged.
-    """
-    if isinstance(value, str) and value.isdigit():
-        return int(value)
-    return value
-
-
-def _normalize_int(value, default: int) -> int:
-    """Normalize an int setting that may have been stored as a string."""
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
-
-
 def _parse_event_time(value) -> time:
     """Parse a stored 'HH:MM:SS' (or 'HH:MM') string into a time object.
 
@@ -82,6 +80,18 @@ _payday_event_unsubs: dict[str, object] = {}
 # so coordinator refreshes during the day do not fire the event repeatedly.
 _payday_last_fired: dict[str, date] = {}
 
+# Tracks the scheduled refresh at the start of the next day per config entry.
+_midnight_refresh_unsubs: dict[str, object] = {}
+
+# The coordinator refreshes at local midnight, when the sensor states (and,
+# once the cached window expires, the paydays) change. Polling only guards
+# against a missed timer, e.g. after the system clock jumped.
+_SAFETY_REFRESH_INTERVAL = timedelta(hours=6)
+
+# Never schedule the midnight refresh sooner than this, so a time zone set
+# differently in Home Assistant and the system cannot cause a refresh loop.
+_MIN_REFRESH_DELAY = timedelta(minutes=5)
+
 
 @callback
 def _fire_payday_event(hass, entry, instance_name: str, payday: date) -> None:
@@ -100,11 +110,13 @@ async def _async_check_country_supported(hass, entry, country) -> None:
     """Create or clear a repair issue based on country support."""
     issue_id = f"unsupported_country_{entry.entry_id}"
     try:
-        supported = await hass.async_add_executor_job(get_supported_countries)
+        supported = not country or await get_calculation_executor(hass).async_run(
+            ("supported", country), is_country_supported, country
+        )
     except Exception:  # pragma: no cover - defensive
         return
 
-    if country and country not in supported:
+    if not supported:
         ir.async_create_issue(
             hass,
             DOMAIN,
@@ -118,12 +130,140 @@ async def _async_check_country_supported(hass, entry, country) -> None:
         ir.async_delete_issue(hass, DOMAIN, issue_id)
 
 
+async def async_get_country_index(hass: HomeAssistant) -> CountryIndex:
+    """Return the country index shared by all flows and entries.
+
+    The index is built in the executor on first use. Callers that arrive
+    while it is loading await the same load instead of starting their own.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    task = domain_data.get(DATA_COUNTRY_INDEX)
+    if task is None:
+        task = hass.async_create_task(
+            hass.async_add_executor_job(get_country_index),
+            f"{DOMAIN} country index",
+        )
+        domain_data[DATA_COUNTRY_INDEX] = task
+    try:
+        return await task
+    except Exception:
+        # Let the next caller try again.
+        if domain_data.get(DATA_COUNTRY_INDEX) is task:
+            del domain_data[DATA_COUNTRY_INDEX]
+        raise
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    await _async_restore_bank_days(hass)
     return True
 
 
+def get_calculation_executor(hass: HomeAssistant) -> CalculationExecutor:
+    """Return the integration's thread pool for calculations.
+
+    Created on first use and shut down when Home Assistant stops.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executor = domain_data.get(DATA_EXECUTOR)
+    if executor is None:
+        executor = domain_data[DATA_EXECUTOR] = CalculationExecutor()
+
+        @callback
+        def _shutdown(_event) -> None:
+            executor.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+    return executor
+
+
+def _shared_schedules(hass: HomeAssistant) -> SharedSchedules:
+    """Return the regions and payday windows shared by all entries."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SHARED, SharedSchedules())
+
+
+# Seconds to wait before saving compiled bank days, so the first refreshes
+# of all entries after a restart end up in a single write.
+_BANK_DAYS_SAVE_DELAY = 60
+
+
+async def _async_restore_bank_days(hass: HomeAssistant) -> None:
+    """Load the bank days compiled before the last restart.
+
+    Runs once when the integration is set up, before any entry refreshes,
+    so restored years are compiled without generating any holidays.
+    """
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    stored = await store.async_load()
+    hass.data.setdefault(DOMAIN, {})[DATA_BANK_DAYS] = {
+        "store": store,
+        "saved": stored,
+    }
+    if stored:
+        await get_calculation_executor(hass).async_run(
+            ("restore",), restore_bank_closing_days, stored
+        )
+
+
+@callback
+def _async_save_bank_days(hass: HomeAssistant) -> None:
+    """Save the compiled bank days if they changed since the last save."""
+    bank_days = hass.data.get(DOMAIN, {}).get(DATA_BANK_DAYS)
+    if not bank_days:
+        return
+    # Keeps the previous year, like the calculation window. Exporting walks
+    # every compiled region, so skip it unless something was compiled.
+    first_year = dt_util.now().year - 1
+    exported = (bank_days_changes(), first_year)
+    if exported == bank_days.get("exported"):
+        return
+    bank_days["exported"] = exported
+    hass.async_create_task(
+        _async_export_bank_days(hass, bank_days, exported),
+        f"{DOMAIN} export bank days",
+    )
+
+
+async def _async_export_bank_days(
+    hass: HomeAssistant, bank_days: dict, exported: tuple[int, int]
+) -> None:
+    """Export the bank days on the integration's pool, then schedule the save."""
+    try:
+        data = await get_calculation_executor(hass).async_run(
+            ("export", *exported), export_bank_closing_days, exported[1]
+        )
+    except Exception as err:  # pragma: no cover - defensive
+        _LOGGER.warning("Could not export bank days: %s", err)
+        return
+    # A newer export replaces this one.
+    if exported == bank_days.get("exported") and data != bank_days["saved"]:
+        bank_days["saved"] = data
+        bank_days["store"].async_delay_save(lambda: data, _BANK_DAYS_SAVE_DELAY)
+
+
+# Settings that can change without reloading the integration.
+_IN_PLACE_OPTIONS = (CONF_CLOSED_DAYS, CONF_OPEN_DAYS)
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload the integration when options are changed."""
+    """Apply changed options.
+
+    A change to the closure days only is applied in place (see
+    `async_setup_entry`); any other change reloads the integration.
+    """
+    info = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    data = {**entry.data, **entry.options}
+    if info:
+        previous = info["settings"]
+        unchanged = all(
+            data.get(key) == previous.get(key)
+            for key in data.keys() | previous.keys()
+            if key not in _IN_PLACE_OPTIONS
+        )
+        if unchanged:
+            info["apply_closure_days"](PaydaySchedule.from_config(data))
+            info["settings"] = data
+            return
+
     await hass.config_entries.async_reload(entry.entry_id)
 
 
@@ -133,60 +273,131 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     data = {**entry.data, **entry.options}
     instance_name = data.get(CONF_NAME, "IsItPayday")
     event_time = _parse_event_time(data.get(CONF_EVENT_TIME))
+    # Validated once here; every refresh reuses the same schedule until the
+    # closure days change (see `_async_apply_closure_days`). Invalid settings
+    # fail setup like a failed first refresh, so HA retries it.
+    try:
+        schedule = PaydaySchedule.from_config(data)
+    except Exception as err:
+        raise ConfigEntryNotReady(f"Error calculating next payday: {err}") from err
+    info = {"name": instance_name, "schedule": schedule, "settings": data}
 
+    shared = _shared_schedules(hass)
+    executor = get_calculation_executor(hass)
     last_data: dict | None = None
+    # Closure days changed since last_data was calculated.
+    changed_days: set[date] = set()
+
+    async def _async_prefetch_year(year: int) -> None:
+        country, subdiv = info["schedule"].country, info["schedule"].subdiv
+        await executor.async_run(
+            ("region", country, subdiv, year, year + 1),
+            prefetch_bank_year,
+            country,
+            year,
+            subdiv,
+        )
+
+    async def _async_calculate_window(schedule: PaydaySchedule, today: date):
+        """Calculate the schedule's window on the integration's pool.
+
+        The region's bank days are compiled first in a job of their own,
+        which entries of the same region refreshing at the same time (at
+        startup, or on New Year) await together. Concurrent refreshes of
+        identical schedules await one calculation too.
+        """
+        country, subdiv = schedule.country, schedule.subdiv
+        years = window_years(today)
+        if not bank_years_compiled(country, years, subdiv):
+            await executor.async_run(
+                ("region", country, subdiv, years.start, years.stop),
+                compile_bank_years,
+                country,
+                years,
+                subdiv,
+            )
+        return await executor.async_run(
+            ("window", schedule, today), calculate_payday_window, schedule, 12, today
+        )
+
+    async def _async_update_window(
+        schedule: PaydaySchedule, today: date, changed: frozenset[date]
+    ):
+        """Recalculate only the cached paydays the changed closure days move."""
+        window = PaydayWindow(
+            last_data["payday_last"],
+            last_data["paydays_upcoming"],
+            last_data["valid_until"],
+        )
+        return await executor.async_run(
+            ("update", entry.entry_id, schedule, changed, today),
+            update_payday_window,
+            schedule,
+            window,
+            changed,
+            12,
+            today,
+        )
 
     async def async_update_data() -> dict:
         nonlocal last_data
-        today = date.today()
-
-        try:
-            # Only use the cached result if the next payday is strictly in
-            # the future. On payday itself we recalculate so the sensors
-            # immediately start counting towards the next payday.
-            if last_data:
-                first = last_data.get("payday_next")
-                if isinstance(first, date) and first > today:
-                    return last_data
-
-            # The holidays package is synchronous, so the calculation runs
-            # in an executor to avoid blocking the event loop.
-            upcoming = await hass.async_add_executor_job(
-                partial(
-                    calculate_upcoming_paydays,
-                    data[CONF_COUNTRY],
-                    data[CONF_PAY_FREQ],
-                    _normalize_pay_day(data.get(CONF_PAY_DAY)),
-                    data.get(CONF_LAST_PAY_DATE),
-                    data.get(CONF_WEEKDAY),
-                    _normalize_int(data.get(CONF_BANK_OFFSET), 0),
-                    data.get(CONF_SUBDIV),
-                    12,
-                )
+        # Home Assistant's date, which may differ from the system's.
+        today = dt_util.now().date()
+        schedule = info["schedule"]
+
+        # In December, compile the last year the first refresh of the new
+        # year will need in the background, so New Year costs no holiday
+        # generation. Entries sharing a region share the compiled year, so
+        # only the first of them prefetches it.
+        if today.month == 12 and shared.claim_prefetch(schedule, today.year + 3):
+            entry.async_create_background_task(
+                hass,
+                _async_prefetch_year(today.year + 3),
+                f"{DOMAIN} prefetch {today.year + 3} ({entry.entry_id})",
             )
 
-            last_payday = await hass.async_add_executor_job(
-                partial(
-                    calculate_last_payday,
-                    data[CONF_COUNTRY],
-                    data[CONF_PAY_FREQ],
-                    _normalize_pay_day(data.get(CONF_PAY_DAY)),
-                    data.get(CONF_LAST_PAY_DATE),
-                    data.get(CONF_WEEKDAY),
-                    _normalize_int(data.get(CONF_BANK_OFFSET), 0),
-                    data.get(CONF_SUBDIV),
-                )
-            )
+        changed: frozenset[date] = frozenset()
+        try:
+            # Reuse the cached result until the date on which it may change.
+            # On payday itself it stays valid for the rest of the day, and the
+            # sensors start counting towards the next payday the day after.
+            valid_until = last_data.get("valid_until") if last_data else None
+            cached = isinstance(valid_until, date) and today < valid_until
+            if cached and not changed_days:
+                return last_data
+            changed = frozenset(changed_days)
+            changed_days.clear()
+
+            # Entries with the same schedule share one window, so only the
+            # first of them to refresh calculates it.
+            window = shared.get_window(schedule, today)
+            if window is None and cached:
+                window = await _async_update_window(schedule, today, changed)
+                shared.put_window(schedule, today, window)
+                _async_save_bank_days(hass)
+            elif window is None:
+                # The holidays package is synchronous, so the calculation
+                # runs in an executor to avoid blocking the event loop. A
+                # single job calculates both the last and upcoming paydays.
+                window = await _async_calculate_window(schedule, today)
+                shared.put_window(schedule, today, window)
+                _async_save_bank_days(hass)
 
             result = {
-                "payday_next": upcoming[0] if upcoming else None,
-                "paydays_upcoming": upcoming,
-                "payday_last": last_payday,
+                "payday_next": window.next,
+                "paydays_upcoming": window.upcoming,
+                "payday_last": window.last,
+                "valid_until": window.valid_until,
+                # Read by the "Bank days until" sensor, which must not touch
+                # the bank calendar on the event loop.
+                "bank_days_next": list(window.bank_days),
             }
-            last_data = result if upcoming else None
+            last_data = result if window.upcoming else None
             return result
 
         except Exception as err:
+            # Apply the changes again with the next refresh.
+            changed_days.update(changed)
             raise UpdateFailed(f"Error calculating next payday: {err}") from err
 
     coordinator = DataUpdateCoordinator(
@@ -194,21 +405,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER,
         name=f"{instance_name} Coordinator ({entry.entry_id})",
         update_method=async_update_data,
-        update_interval=timedelta(minutes=5),
+        update_interval=_SAFETY_REFRESH_INTERVAL,
     )
 
+    @callback
+    def _async_setup_failed() -> None:
+        """Undo the registration of a setup that raised."""
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        shared.release(info["schedule"])
+
     # A failed initial update raises ConfigEntryNotReady and HA retries
     # setup automatically, instead of loading dead sensors.
-    await coordinator.async_config_entry_first_refresh()
+    shared.acquire(info["schedule"])
+    try:
+        await coordinator.async_config_entry_first_refresh()
+        # Raise a repair issue if the configured country is no longer
+        # supported by the holidays package (e.g. removed in a later
+        # package version).
+        await _async_check_country_supported(hass, entry, data.get(CONF_COUNTRY))
+    except Exception:
+        _async_setup_failed()
+        raise
 
-    # Raise a repair issue if the configured country is no longer supported
-    # by the holidays package (e.g. removed in a later package version).
-    await _async_check_country_supported(hass, entry, data.get(CONF_COUNTRY))
+    @callback
+    def _async_apply_closure_days(new_schedule: PaydaySchedule) -> None:
+        """Switch to a schedule whose closure days changed.
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
-        "coordinator": coordinator,
-        "name": instance_name,
-    }
+        The cached paydays are kept unless a changed date is close enough
+        to one of them to move it, or falls before the next payday and so
+        changes the bank days until it; only those are recalculated.
+        """
+        nonlocal last_data
+        old_schedule = info["schedule"]
+        info["schedule"] = new_schedule
+        # Acquire first, so the region is not dropped in between.
+        shared.acquire(new_schedule)
+        shared.release(old_schedule)
+        changed = (old_schedule.closed_days ^ new_schedule.closed_days) | (
+            old_schedule.open_days ^ new_schedule.open_days
+        )
+        paydays = (
+            [last_data["payday_last"], *last_data["paydays_upcoming"]]
+            if last_data
+            else []
+        )
+        if not paydays:
+            last_data = None
+        elif not closure_days_affect(changed, paydays, dt_util.now().date()):
+            return
+        _LOGGER.debug("Closure days changed for %s; recalculating", instance_name)
+        changed_days.update(changed)
+        hass.async_create_task(coordinator.async_refresh())
+
+    info["coordinator"] = coordinator
+    info["apply_closure_days"] = _async_apply_closure_days
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = info
+
+    # Refresh at the start of each day instead of polling: the cached window
+    # makes the refresh free unless it expired, and the sensors counting
+    # days towards the next payday get their new state on time.
+    @callback
+    def _schedule_midnight_refresh() -> None:
+        unsub = _midnight_refresh_unsubs.pop(entry.entry_id, None)
+        if unsub:
+            unsub()
+        refresh_at = max(
+            dt_util.start_of_local_day(dt_util.now().date() + timedelta(days=1)),
+            dt_util.utcnow() + _MIN_REFRESH_DELAY,
+        )
+        _midnight_refresh_unsubs[entry.entry_id] = async_track_point_in_time(
+            hass, _on_midnight, refresh_at
+        )
+
+    @callback
+    def _on_midnight(_now) -> None:
+        _midnight_refresh_unsubs.pop(entry.entry_id, None)
+        hass.async_create_task(coordinator.async_request_refresh())
+
+    entry.async_on_unload(coordinator.async_add_listener(_schedule_midnight_refresh))
+    _schedule_midnight_refresh()
 
     # Fire an event at the configured local time on each payday so
     # automations can trigger directly on the payday instead of watching
@@ -274,9 +549,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     @callback
     def _cleanup_event() -> None:
-        unsub = _payday_event_unsubs.pop(entry.entry_id, None)
-        if unsub:
-            unsub()
+        for unsubs in (_payday_event_unsubs, _midnight_refresh_unsubs):
+            unsub = unsubs.pop(entry.entry_id, None)
+            if unsub:
+                unsub()
         _payday_last_fired.pop(entry.entry_id, None)
 
     entry.async_on_unload(_cleanup_event)
@@ -284,7 +560,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Reload automatically when the user saves new options.
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
+    except Exception:
+        # Home Assistant runs the unload callbacks registered above.
+        _async_setup_failed()
+        raise
     return True
 
 
@@ -292,6 +573,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        info = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if info:
+            _shared_schedules(hass).release(info["schedule"])
 
     return unload_ok
@@ -0,0 +1,438 @@
+"""Compiled bank-day calendars for the IsItPayday integration.
+
+A `BankCalendar` answers "is this a bank day" and "which is the nearest
+bank day" for one country/subdivision without stepping day by day. Each
+calendar year is compiled once into an immutable `BankYear`: a bitmap with
+one bit per day, a sorted tuple of bank-day ordinals, a month table
+indexing into it and a running count of bank days. Lookups are a bit test,
+a bisect or plain indexing, and because compiled years never change they
+can be read from several executor threads at once.
+"""
+
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from datetime import date
+from itertools import accumulate
+
+_LOGGER = logging.getLogger(__name__)
+
+# Saturday and Sunday, as returned by date.weekday().
+DEFAULT_WEEKEND = frozenset({5, 6})
+
+
+class BankDaysUnavailable(Exception):
+    """Raised by a loader that could not get the closing days of some years.
+
+    `years` are the years that failed and `closed` the closing days found
+    for the other years the loader was asked for.
+    """
+
+    def __init__(self, years: Iterable[int], closed: Iterable[date] = ()) -> None:
+        super().__init__(f"No bank closing days for {sorted(years)}")
+        self.years = frozenset(years)
+        self.closed = list(closed)
+
+
+class BankYear:
+    """Immutable bank-day data for a single calendar year."""
+
+    __slots__ = ("year", "start", "bitmap", "ordinals", "months", "counts")
+
+    def __init__(self, year: int, bitmap: bytes, ordinals: tuple[int, ...]) -> None:
+        object.__setattr__(self, "year", year)
+        object.__setattr__(self, "start", date(year, 1, 1).toordinal())
+        object.__setattr__(self, "bitmap", bitmap)
+        object.__setattr__(self, "ordinals", ordinals)
+        # The bank days of month m are ordinals[months[m - 1]:months[m]].
+        object.__setattr__(
+            self,
+            "months",
+            tuple(
+                bisect_left(ordinals, date(year, month, 1).toordinal())
+                for month in range(1, 13)
+            )
+            + (len(ordinals),),
+        )
+        # counts[i] is the number of bank days before day i of the year, so
+        # counts[-1] is the number of bank days in the whole year.
+        start = self.start
+        length = date(year + 1, 1, 1).toordinal() - start
+        object.__setattr__(
+            self,
+            "counts",
+            tuple(
+                accumulate(
+                    (self.is_bank_day(start + i) for i in range(length)), initial=0
+                )
+            ),
+        )
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def compile(
+        cls,
+        year: int,
+        closed: Iterable[date],
+        weekend: frozenset[int] = DEFAULT_WEEKEND,
+    ) -> "BankYear":
+        """Compile a year from its bank closing days.
+
+        Weekends are implied: `weekend` holds the weekdays (as returned by
+        date.weekday()) on which banks are always closed.
+        """
+        start = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - start
+        closed_ordinals = {d.toordinal() for d in closed if d.year == year}
+
+        bitmap = bytearray((length + 7) // 8)
+        ordinals: list[int] = []
+        for ordinal in range(start, start + length):
+            # date.weekday() is (ordinal + 6) % 7, avoiding a date object here.
+            if (ordinal + 6) % 7 in weekend or ordinal in closed_ordinals:
+                continue
+            index = ordinal - start
+            bitmap[index >> 3] |= 1 << (index & 7)
+            ordinals.append(ordinal)
+        return cls(year, bytes(bitmap), tuple(ordinals))
+
+    @classmethod
+    def from_closed_bitmap(
+        cls,
+        year: int,
+        closed: bytes,
+        weekend: frozenset[int] = DEFAULT_WEEKEND,
+    ) -> "BankYear":
+        """Compile a year from a bitmap of its closing days.
+
+        Bit i of `closed` is set if day i of the year (0 is 1 January) is a
+        bank closing day, as stored in the holiday database. The bank days
+        are the days neither closed nor on the weekend, worked out on whole
+        bitmaps instead of day by day.
+        """
+        start = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - start
+        # The weekend days of the week starting on 1 January, one bit per
+        # day, repeated for every week: multiplying by 0b...0000001_0000001
+        # places a copy every 7 bits.
+        week = sum(1 << i for i in range(7) if (start + i + 6) % 7 in weekend)
+        weeks = (length + 6) // 7
+        weekends = week * (((1 << 7 * weeks) - 1) // ((1 << 7) - 1))
+        bits = ~(int.from_bytes(closed, "little") | weekends) & ((1 << length) - 1)
+
+        bitmap = bits.to_bytes((length + 7) // 8, "little")
+        ordinals = []
+        while bits:
+            low = bits & -bits
+            ordinals.append(start + low.bit_length() - 1)
+            bits ^= low
+        return cls(year, bitmap, tuple(ordinals))
+
+    def is_bank_day(self, ordinal: int) -> bool:
+        """Return True if the ordinal (within this year) is a bank day."""
+        index = ordinal - self.start
+        return bool(self.bitmap[index >> 3] >> (index & 7) & 1)
+
+    def bank_days_before(self, ordinal: int) -> int:
+        """Return the number of bank days in this year before the ordinal."""
+        return self.counts[ordinal - self.start]
+
+    def month_bank_days(self, month: int) -> tuple[int, ...]:
+        """Return the ordinals of the bank days in a month, in order."""
+        return self.ordinals[self.months[month - 1] : self.months[month]]
+
+    def with_changes(
+        self, closed: Iterable[int] = (), opened: Iterable[int] = ()
+    ) -> "BankYear":
+        """Return a copy with some ordinals closed and others opened.
+
+        Ordinals outside this year are ignored. The copy is derived from
+        this year's bank days, so no holiday data is needed.
+        """
+        end = self.start + len(self.counts) - 1
+        ordinals = set(self.ordinals)
+        ordinals.difference_update(closed)
+        ordinals.update(o for o in opened if self.start <= o < end)
+
+        bitmap = bytearray(len(self.bitmap))
+        for ordinal in ordinals:
+            index = ordinal - self.start
+            bitmap[index >> 3] |= 1 << (index & 7)
+        return BankYear(self.year, bytes(bitmap), tuple(sorted(ordinals)))
+
+
+class BankCalendar:
+    """Bank-day calendar for one country and subdivision.
+
+    `loader(years)` must return the bank closing days (holidays) for the
+    given years, and `weekend` the weekdays on which banks are closed; both
+    are compiled into each year, so lookups never check the weekday. Years
+    are compiled on first use, or up front with `ensure_years`, and are
+    kept until `discard_years_before` drops them.
+
+    `year_loader(years, weekend)`, if given, is asked first and returns the
+    years it can provide already compiled, such as those in the holiday
+    database; `loader` is only called for the others. `on_compile()`, if
+    given, is called once compiled years have been stored.
+
+    If the loader raises `BankDaysUnavailable`, the failed years count
+    weekends only. They are left out of `years`, so they are not saved,
+    and `ensure_years` loads them again.
+
+    The year table is replaced rather than changed in place, so readers
+    never need the lock.
+    """
+
+    def __init__(
+        self,
+        country: str,
+        subdiv: str | None,
+        loader: Callable[[list[int]], Iterable[date]],
+        weekend: frozenset[int] = DEFAULT_WEEKEND,
+        year_loader: (
+            Callable[[list[int], frozenset[int]], dict[int, BankYear]] | None
+        ) = None,
+        on_compile: Callable[[], None] | None = None,
+    ) -> None:
+        self.country = country
+        self.subdiv = subdiv
+        self.weekend = frozenset(weekend)
+        self._loader = loader
+        self._year_loader = year_loader
+        self._on_compile = on_compile
+        self._years: dict[int, BankYear] = {}
+        self._failed: frozenset[int] = frozenset()
+        self._lock = threading.Lock()
+
+    @property
+    def years(self) -> list[int]:
+        """Return the years compiled from their closing days, in order."""
+        return sorted(y for y in self._years if y not in self._failed)
+
+    def ensure_years(self, years: Iterable[int]) -> None:
+        """Compile all missing or failed years with a single loader call."""
+        missing = sorted(
+            {y for y in years if y not in self._years or y in self._failed}
+        )
+        if not missing:
+            return
+        with self._lock:
+            missing = [y for y in missing if y not in self._years or y in self._failed]
+            if not missing:
+                return
+            compiled = {y: c for y, c in self._years.items() if y not in missing}
+            if self._year_loader is not None:
+                compiled.update(self._year_loader(missing, self.weekend))
+            failed: frozenset[int] = frozenset()
+            closed: list[date] = []
+            try:
+                load = [year for year in missing if year not in compiled]
+                if load:
+                    closed = list(self._loader(load))
+            except BankDaysUnavailable as e:
+                closed, failed = e.closed, e.years
+                # Failed years are retried on every calculation; warn once.
+                log = _LOGGER.debug if failed <= self._failed else _LOGGER.warning
+                log(
+                    "Counting weekends only as bank closing days for %s (%s) in %s:"
+                    " %s",
+                    self.country,
+                    self.subdiv,
+                    sorted(failed),
+                    e.__cause__ or e,
+                )
+            for year in missing:
+                if year not in compiled:
+                    compiled[year] = BankYear.compile(year, closed, self.weekend)
+            self._years = compiled
+            self._failed = (self._failed - set(missing)) | failed
+        if self._on_compile is not None:
+            self._on_compile()
+        _LOGGER.debug(
+            "Compiled bank days for %s (%s) for years %s",
+            self.country,
+            self.subdiv,
+            missing,
+        )
+
+    def discard_years_before(self, year: int) -> int:
+        """Drop the compiled years before a year; return how many were dropped.
+
+        Dropped years are compiled again if they are needed later.
+        """
+        with self._lock:
+            kept = {y: c for y, c in self._years.items() if y >= year}
+            dropped = len(self._years) - len(kept)
+            if dropped:
+                self._years = kept
+                self._failed = frozenset(y for y in self._failed if y >= year)
+        if dropped:
+            _LOGGER.debug(
+                "Dropped %s compiled years before %s for %s (%s)",
+                dropped,
+                year,
+                self.country,
+                self.subdiv,
+            )
+        return dropped
+
+    def year(self, year: int) -> BankYear:
+        """Return the compiled data for a year, compiling it if needed."""
+        compiled = self._years.get(year)
+        while compiled is None:
+            # Loop in case the year is dropped again right after compiling.
+            self.ensure_years([year])
+            compiled = self._years.get(year)
+        return compiled
+
+    def compiled_closing_days(self) -> dict[int, list[date]]:
+        """Return the closing days that are not weekend days, per compiled year.
+
+        Compiling them with the calendar's weekend gives the same years
+        again, so they can be saved and restored without generating any
+        holidays. Only reads what is compiled, and skips failed years.
+        """
+        years, failed = self._years, self._failed
+        return {
+            year: [
+                date.fromordinal(ordinal)
+                for ordinal in range(
+                    compiled.start, compiled.start + len(compiled.counts) - 1
+                )
+                if (ordinal + 6) % 7 not in self.weekend
+                and not compiled.is_bank_day(ordinal)
+            ]
+            for year, compiled in sorted(years.items())
+            if year not in failed
+        }
+
+    def is_bank_day(self, d: date) -> bool:
+        """Return True if the date is a bank day (not weekend, not holiday)."""
+        return self.year(d.year).is_bank_day(d.toordinal())
+
+    def nth_bank_day(self, year: int, month: int, n: int) -> date | None:
+        """Return the n-th bank day of a month, or None if it has none.
+
+        n=1 is the first bank day and n=-1 the last. An n beyond the number
+        of bank days in the month is clamped to the last (or, counting from
+        the end, the first) bank day.
+        """
+        compiled = self.year(year)
+        lo, hi = compiled.months[month - 1], compiled.months[month]
+        if lo == hi or n == 0:
+            return None
+        index = min(lo + n - 1, hi - 1) if n > 0 else max(hi + n, lo)
+        return date.fromordinal(compiled.ordinals[index])
+
+    def count_bank_days(self, start: date, end: date) -> int:
+        """Return the number of bank days from start up to, not including, end.
+
+        The result is negative if end is before start, like subtracting the
+        dates. Within a year this is two lookups in the running count; each
+        year boundary crossed adds the total of one compiled year.
+        """
+        if end < start:
+            return -self.count_bank_days(end, start)
+        self.ensure_years(range(start.year, end.year + 1))
+        first = self.year(start.year)
+        last = self.year(end.year) if end.year != start.year else first
+        count = last.bank_days_before(end.toordinal()) - first.bank_days_before(
+            start.toordinal()
+        )
+        for year in range(start.year, end.year):
+            count += self.year(year).counts[-1]
+        return count
+
+    def bank_days_between(self, start: date, end: date) -> list[date]:
+        """Return the bank days from start up to, not including, end."""
+        days: list[date] = []
+        for year in range(start.year, end.year + 1):
+            ordinals = self.year(year).ordinals
+            lo = bisect_left(ordinals, start.toordinal())
+            hi = bisect_left(ordinals, end.toordinal())
+            days.extend(date.fromordinal(ordinal) for ordinal in ordinals[lo:hi])
+        return days
+
+    def next_bank_day(self, d: date) -> date:
+        """Return the first bank day on or after the date."""
+        ordinal = d.toordinal()
+        year = d.year
+        while True:
+            ordinals = self.year(year).ordinals
+            index = bisect_left(ordinals, ordinal)
+            if index < len(ordinals):
+                return date.fromordinal(ordinals[index])
+            year += 1
+
+    def previous_bank_day(self, d: date) -> date:
+        """Return the last bank day on or before the date."""
+        ordinal = d.toordinal()
+        year = d.year
+        while True:
+            ordinals = self.year(year).ordinals
+            index = bisect_right(ordinals, ordinal)
+            if index:
+                return date.fromordinal(ordinals[index - 1])
+            year -= 1
+
+
+class OverlayCalendar(BankCalendar):
+    """A bank calendar with extra closed and open days on top of another.
+
+    The overlay is a cheap delta: only the years that contain a changed
+    date are derived again, from the base calendar's compiled years, and
+    all other years are the base calendar's own. The base calendar stays
+    shared and is never changed, so its holiday data is not regenerated.
+    `closed` wins over `opened` for a date listed in both.
+    """
+
+    def __init__(
+        self,
+        base: BankCalendar,
+        closed: Iterable[date] = (),
+        opened: Iterable[date] = (),
+    ) -> None:
+        super().__init__(base.country, base.subdiv, base._loader, base.weekend)
+        self.base = base
+        self.closed = frozenset(closed)
+        self.opened = frozenset(opened) - self.closed
+        self._changes: dict[int, tuple[set[int], set[int]]] = {}
+        for d in self.closed:
+            self._changes.setdefault(d.year, (set(), set()))[0].add(d.toordinal())
+        for d in self.opened:
+            self._changes.setdefault(d.year, (set(), set()))[1].add(d.toordinal())
+        # Patched years, keyed by year, with the base year they came from.
+        self._patched: dict[int, tuple[BankYear, BankYear]] = {}
+
+    @property
+    def years(self) -> list[int]:
+        """Return the compiled years of the base calendar."""
+        return self.base.years
+
+    def ensure_years(self, years: Iterable[int]) -> None:
+        """Compile missing years in the base calendar."""
+        self.base.ensure_years(years)
+
+    def discard_years_before(self, year: int) -> int:
+        """Drop compiled years before a year from the base calendar."""
+        with self._lock:
+            self._patched = {y: p for y, p in self._patched.items() if y >= year}
+        return self.base.discard_years_before(year)
+
+    def year(self, year: int) -> BankYear:
+        """Return the base year, with the overlay applied if it touches it."""
+        base = self.base.year(year)
+        changes = self._changes.get(year)
+        if changes is None:
+            return base
+        patched = self._patched.get(year)
+        if patched is not None and patched[0] is base:
+            return patched[1]
+        # Derive again if the base year was compiled again since.
+        compiled = base.with_changes(*changes)
+        with self._lock:
+            self._patched = {**self._patched, year: (base, compiled)}
+        return compiled
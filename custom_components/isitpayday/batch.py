@@ -0,0 +1,126 @@
+"""Batch payday calculation for many schedules at once.
+
+Reporting tools outside Home Assistant compute the paydays of hundreds of
+schedules in one go. Calling `calculate_upcoming_paydays` in a loop works,
+but interleaves holiday generation with the payday rules and cannot use
+more than one core. `calculate_paydays_batch` groups the schedules by
+region (country and subdivision), compiles each region's bank calendar
+once and then evaluates every schedule of the region against it.
+
+Large batches can be spread over a `ProcessPoolExecutor`, one task per
+region, so each worker compiles only the regions it evaluates. Like the
+rest of the calculator this module is synchronous and must not be called
+from the event loop.
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from .payday_calculator import PaydaySchedule, get_bank_calendar, iter_paydays
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BatchResult(NamedTuple):
+    """The paydays of a batch and the time spent on each stage.
+
+    `paydays[i]` holds the paydays of the i-th schedule passed in.
+    `timings` maps "group", "compile", "evaluate" and "total" to seconds.
+    With a process pool, "compile" and "evaluate" are summed over the
+    workers, so they can add up to more than "total".
+    """
+
+    paydays: list[list[date]]
+    timings: dict[str, float]
+
+
+def calculate_paydays_batch(
+    schedules: Iterable[PaydaySchedule],
+    horizon: timedelta | int,
+    start: date | None = None,
+    max_workers: int | None = None,
+) -> BatchResult:
+    """Calculate the paydays of many schedules from `start` up to the horizon.
+
+    Each schedule gets the paydays on or after `start` (default today) and
+    before `start + horizon`, as `calculate_upcoming_paydays` would return
+    them, without a cap on their number. `horizon` is a timedelta or a
+    number of days.
+
+    With `max_workers` greater than 1 and more than one region in the
+    batch, regions are evaluated in a process pool of that size.
+    """
+    started = time.perf_counter()
+    schedules = list(schedules)
+    if not isinstance(horizon, timedelta):
+        horizon = timedelta(days=horizon)
+    start = start or date.today()
+    end = start + horizon
+
+    regions: dict[tuple[str, str | None], list[int]] = {}
+    for index, schedule in enumerate(schedules):
+        regions.setdefault((schedule.country, schedule.subdiv), []).append(index)
+    timings = {"group": time.perf_counter() - started, "compile": 0.0, "evaluate": 0.0}
+
+    tasks = [
+        (region, [schedules[index] for index in indices])
+        for region, indices in regions.items()
+    ]
+    if max_workers and max_workers > 1 and len(tasks) > 1:
+        # Imported here, as it loads multiprocessing.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+            outcomes = list(
+                pool.map(
+                    _evaluate_region,
+                    [region for region, _ in tasks],
+                    [chunk for _, chunk in tasks],
+                    [start] * len(tasks),
+                    [end] * len(tasks),
+                )
+            )
+    else:
+        outcomes = [
+            _evaluate_region(region, chunk, start, end) for region, chunk in tasks
+        ]
+
+    paydays: list[list[date]] = [[] for _ in schedules]
+    for indices, (results, compile_time, evaluate_time) in zip(
+        regions.values(), outcomes
+    ):
+        for index, result in zip(indices, results):
+            paydays[index] = result
+        timings["compile"] += compile_time
+        timings["evaluate"] += evaluate_time
+
+    timings["total"] = time.perf_counter() - started
+    _LOGGER.debug(
+        "Calculated paydays for %s schedules in %s regions: %s",
+        len(schedules),
+        len(regions),
+        timings,
+    )
+    return BatchResult(paydays, timings)
+
+
+def _evaluate_region(
+    region: tuple[str, str | None],
+    schedules: list[PaydaySchedule],
+    start: date,
+    end: date,
+) -> tuple[list[list[date]], float, float]:
+    """Compile one region's calendar and evaluate its schedules.
+
+    Returns the paydays of each schedule and the seconds spent compiling
+    and evaluating. Runs in a worker process when a pool is used.
+    """
+    started = time.perf_counter()
+    # One year either side covers every date a roll can reach.
+    get_bank_calendar(*region).ensure_years(range(start.year - 1, end.year + 2))
+    compiled = time.perf_counter()
+    results = [list(iter_paydays(schedule, start, end)) for schedule in schedules]
+    return results, compiled - started, time.perf_counter() - compiled
@@ -7,11 +7,34 @@ from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
+from . import get_calculation_executor
 from .const import CONF_CONFIG_URL, CONF_MANUFACTURER, CONF_MODEL, DOMAIN
+from .payday_calculator import PaydaySchedule, iter_paydays
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _paydays_between(
+    schedule: PaydaySchedule, start: date, end: date, today: date
+) -> list[date]:
+    """Return the paydays in [start, end), in ascending order.
+
+    Paydays before today are walked backwards with last-payday rules, the
+    others forwards with upcoming-payday rules, so the result matches the
+    sensors for any window, however far it is from today.
+    """
+    past = []
+    if start < today:
+        newest = min(end, today) - timedelta(days=1)
+        past = list(
+            iter_paydays(schedule, newest, start - timedelta(days=1), reverse=True)
+        )
+    upcoming = []
+    if end > today:
+        upcoming = list(iter_paydays(schedule, max(start, today), end))
+    return past[::-1] + upcoming
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: DataUpdateCoordinator = data["coordinator"]
@@ -35,6 +58,11 @@ class IsItPaydayCalendar(CoordinatorEntity, CalendarEntity):
         self._instance_name = instance_name
         self._entry_id = entry_id
 
+    @property
+    def _schedule(self) -> PaydaySchedule | None:
+        """Return the entry's current schedule (closure days can change)."""
+        return self.hass.data.get(DOMAIN, {}).get(self._entry_id, {}).get("schedule")
+
     def _get_paydays(self) -> list[date]:
         """Return all upcoming paydays from the coordinator as dates."""
         data = self.coordinator.data or {}
@@ -83,13 +111,31 @@ class IsItPaydayCalendar(CoordinatorEntity, CalendarEntity):
         start_date: datetime,
         end_date: datetime,
     ) -> list[CalendarEvent]:
-        """Return all payday events within the requested time window."""
+        """Return all payday events within the requested time window.
+
+        Paydays are streamed for exactly the requested window, so past
+        paydays and paydays beyond the coordinator's list show up too.
+        """
         # Compare on dates since payday events are all-day.
-        return [
-            self._build_event(payday)
-            for payday in self._get_paydays()
-            if start_date.date() <= payday < end_date.date()
-        ]
+        start, end = start_date.date(), end_date.date()
+        paydays = None
+        if self._schedule:
+            try:
+                today = date.today()
+                paydays = await get_calculation_executor(hass).async_run(
+                    ("calendar", self._schedule, start, end, today),
+                    _paydays_between,
+                    self._schedule,
+                    start,
+                    end,
+                    today,
+                )
+            except Exception as e:
+                _LOGGER.warning("Could not calculate paydays for calendar: %s", e)
+
+        if paydays is None:
+            paydays = [p for p in self._get_paydays() if start <= p < end]
+        return [self._build_event(payday) for payday in paydays]
 
     @property
     def device_info(self) -> dict:
@@ -1,27 +1,41 @@
 """Config flow and options flow for IsItPayday integration."""
 
 import logging
+import re
+from datetime import date
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.selector import DateSelector, TimeSelector
+from homeassistant.helpers.selector import (
+    DateSelector,
+    TextSelector,
+    TextSelectorConfig,
+    TimeSelector,
+)
 
+from . import async_get_country_index
 from .const import (
+    CONF_BANK_DAY_NUMBER,
     CONF_BANK_OFFSET,
+    CONF_CLOSED_DAYS,
     CONF_COUNTRY,
     CONF_EVENT_TIME,
     CONF_LAST_PAY_DATE,
     CONF_NAME,
+    CONF_OPEN_DAYS,
     CONF_PAY_DAY,
     CONF_PAY_FREQ,
     CONF_SUBDIV,
     CONF_WEEKDAY,
+    DEFAULT_BANK_DAY_NUMBER,
     DEFAULT_COUNTRY,
     DEFAULT_EVENT_TIME,
     DOMAIN,
+    MAX_BANK_DAY_NUMBER,
+    PAY_DAY_BANK_DAY_COUNTS,
     PAY_DAY_LAST_BANK_DAY,
     PAY_DAY_SPECIFIC_DAY,
     PAY_FREQ_14_DAYS,
@@ -37,7 +51,6 @@ from .const import (
     WEEKDAY_MAP,
     WEEKDAY_OPTIONS,
 )
-from .payday_calculator import get_country_subdivisions, get_supported_countries
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +70,16 @@ def _coerce_int(value, default: int) -> int:
         return default
 
 
+def _parse_dates(value: str | None) -> list[str]:
+    """Parse dates separated by commas, spaces or newlines.
+
+    Returns sorted, de-duplicated ISO date strings. Raises ValueError if
+    any of the dates is not a valid YYYY-MM-DD date.
+    """
+    parts = [part for part in re.split(r"[\s,;]+", value or "") if part]
+    return sorted({date.fromisoformat(part).isoformat() for part in parts})
+
+
 class PaydayFlowMixin:
     """Shared steps for the config flow and the options flow.
 
@@ -70,6 +93,7 @@ class PaydayFlowMixin:
     pay_day = None
     last_pay_date: str | None = None
     bank_offset: int = 0
+    bank_day_number: int = DEFAULT_BANK_DAY_NUMBER
     weekday: int | None = None
     event_time: str | None = None
     subdivision_list: dict[str, str]
@@ -97,8 +121,9 @@ class PaydayFlowMixin:
 
     async def _async_continue_after_country(self) -> FlowResult:
         """Continue to subdivision selection if relevant, else frequency."""
+        index = await async_get_country_index(self.hass)
         self.subdivision_list = await self.hass.async_add_executor_job(
-            get_country_subdivisions, self.country
+            index.subdivisions, self.country
         )
         if self.subdivision_list:
             return await self.async_step_subdivision()
@@ -185,6 +210,8 @@ class PaydayFlowMixin:
             return await self.async_step_bank_offset()
         elif self.pay_day == PAY_DAY_SPECIFIC_DAY:
             return await self.async_step_specific_day()
+        elif self.pay_day in PAY_DAY_BANK_DAY_COUNTS:
+            return await self.async_step_bank_day_number()
 
         return await self._async_continue_to_event_time()
 
@@ -208,6 +235,29 @@ class PaydayFlowMixin:
         self.bank_offset = _coerce_int(user_input[CONF_BANK_OFFSET], 0)
         return await self._async_continue_to_event_time()
 
+    async def async_step_bank_day_number(self, user_input=None) -> FlowResult:
+        """Handle selection of which bank day of the month payday falls on."""
+        choices = range(1, MAX_BANK_DAY_NUMBER + 1)
+        if user_input is None:
+            default = _coerce_int(self.bank_day_number, DEFAULT_BANK_DAY_NUMBER)
+            if default not in choices:
+                default = DEFAULT_BANK_DAY_NUMBER
+            return self.async_show_form(
+                step_id="bank_day_number",
+                data_schema=vol.Schema(
+                    {
+                        vol.Required(CONF_BANK_DAY_NUMBER, default=default): vol.In(
+                            choices
+                        )
+                    }
+                ),
+            )
+
+        self.bank_day_number = _coerce_int(
+            user_input[CONF_BANK_DAY_NUMBER], DEFAULT_BANK_DAY_NUMBER
+        )
+        return await self._async_continue_to_event_time()
+
     async def async_step_specific_day(self, user_input=None) -> FlowResult:
         """Handle selection of a specific day of the month."""
         if user_input is None:
@@ -272,6 +322,7 @@ class PaydayFlowMixin:
             CONF_PAY_DAY: self.pay_day,
             CONF_LAST_PAY_DATE: self.last_pay_date,
             CONF_BANK_OFFSET: self.bank_offset,
+            CONF_BANK_DAY_NUMBER: self.bank_day_number,
             CONF_WEEKDAY: self.weekday,
             CONF_EVENT_TIME: self.event_time or DEFAULT_EVENT_TIME,
         }
@@ -297,9 +348,7 @@ class IsItPaydayConfigFlow(PaydayFlowMixin, config_entries.ConfigFlow, domain=DO
         """Handle the initial user step (name + country)."""
         if user_input is None:
             if not self.country_list:
-                self.country_list = await self.hass.async_add_executor_job(
-                    get_supported_countries
-                )
+                self.country_list = (await async_get_country_index(self.hass)).countries
 
             ha_country = getattr(self.hass.config, "country", None)
             if ha_country and ha_country in self.country_list:
@@ -338,12 +387,15 @@ class IsItPaydayOptionsFlow(PaydayFlowMixin, config_entries.OptionsFlow):
 
     Saved options are stored in entry.options and take precedence over
     entry.data (see __init__.py). An update listener reloads the
-    integration automatically when options change.
+    integration automatically when options change, except for the closure
+    days, which are applied in place. The closure-days step is only offered
+    here, not during the initial setup.
     """
 
     def __init__(self) -> None:
         self.country_list: dict[str, str] = {}
         self.subdivision_list: dict[str, str] = {}
+        self.closure_days: dict[str, list[str]] = {}
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Entry point: select country, prefilled with current settings."""
@@ -356,8 +408,15 @@ class IsItPaydayOptionsFlow(PaydayFlowMixin, config_entries.OptionsFlow):
             self.pay_frequency = config.get(CONF_PAY_FREQ)
             self.last_pay_date = config.get(CONF_LAST_PAY_DATE)
             self.bank_offset = _coerce_int(config.get(CONF_BANK_OFFSET), 0)
+            self.bank_day_number = _coerce_int(
+                config.get(CONF_BANK_DAY_NUMBER), DEFAULT_BANK_DAY_NUMBER
+            )
             self.weekday = config.get(CONF_WEEKDAY)
             self.event_time = config.get(CONF_EVENT_TIME, DEFAULT_EVENT_TIME)
+            self.closure_days = {
+                key: list(config.get(key) or [])
+                for key in (CONF_CLOSED_DAYS, CONF_OPEN_DAYS)
+            }
 
             pay_day = config.get(CONF_PAY_DAY)
             if isinstance(pay_day, str) and pay_day.isdigit():
@@ -365,9 +424,7 @@ class IsItPaydayOptionsFlow(PaydayFlowMixin, config_entries.OptionsFlow):
             self.pay_day = pay_day
 
             if not self.country_list:
-                self.country_list = await self.hass.async_add_executor_job(
-                    get_supported_countries
-                )
+                self.country_list = (await async_get_country_index(self.hass)).countries
 
             default_country = (
                 self.country if self.country in self.country_list else DEFAULT_COUNTRY
@@ -386,6 +443,38 @@ class IsItPaydayOptionsFlow(PaydayFlowMixin, config_entries.OptionsFlow):
         self.country = user_input[CONF_COUNTRY]
         return await self._async_continue_after_country()
 
+    async def _async_continue_to_event_time(self) -> FlowResult:
+        """Show the closure-days step before the event-time step."""
+        return await self.async_step_closure_days()
+
+    async def async_step_closure_days(self, user_input=None) -> FlowResult:
+        """Handle extra bank closing days and days forced open."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            for key in (CONF_CLOSED_DAYS, CONF_OPEN_DAYS):
+                try:
+                    self.closure_days[key] = _parse_dates(user_input.get(key))
+                except ValueError:
+                    errors[key] = "invalid_dates"
+            if not errors:
+                return await self.async_step_event_time()
+
+        text = TextSelector(TextSelectorConfig(multiline=True))
+        return self.async_show_form(
+            step_id="closure_days",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        key, default=", ".join(self.closure_days.get(key, []))
+                    ): text
+                    for key in (CONF_CLOSED_DAYS, CONF_OPEN_DAYS)
+                }
+            ),
+            errors=errors,
+        )
+
     def _finish(self) -> FlowResult:
         """Save the new settings to entry.options."""
-        return self.async_create_entry(title="", data=self._collect_settings())
+        return self.async_create_entry(
+            title="", data={**self._collect_settings(), **self.closure_days}
+        )
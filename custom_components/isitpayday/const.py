@@ -17,6 +17,9 @@ CONF_BANK_OFFSET = "bank_offset"
 CONF_WEEKDAY = "weekday"
 CONF_SUBDIV = "subdivision"
 CONF_EVENT_TIME = "event_time"
+CONF_BANK_DAY_NUMBER = "bank_day_number"
+CONF_CLOSED_DAYS = "closed_days"
+CONF_OPEN_DAYS = "open_days"
 
 # Pay frequency options shown to user
 PAY_FREQ_MONTHLY = "monthly"
@@ -43,13 +46,21 @@ PAY_FREQ_OPTIONS = {
 PAY_DAY_LAST_BANK_DAY = "last_bank_day"
 PAY_DAY_FIRST_BANK_DAY = "first_bank_day"
 PAY_DAY_SPECIFIC_DAY = "specific_day"
+PAY_DAY_NTH_BANK_DAY = "nth_bank_day"
+PAY_DAY_NTH_LAST_BANK_DAY = "nth_last_bank_day"
 
 PAY_MONTHLY_OPTIONS = {
     PAY_DAY_LAST_BANK_DAY: "Last bank day",
     PAY_DAY_FIRST_BANK_DAY: "First bank day",
     PAY_DAY_SPECIFIC_DAY: "Specific day",
+    PAY_DAY_NTH_BANK_DAY: "Nth bank day",
+    PAY_DAY_NTH_LAST_BANK_DAY: "Nth-to-last bank day",
 }
 
+# Pay day options that count bank days from the start or end of the month
+PAY_DAY_BANK_DAY_COUNTS = (PAY_DAY_NTH_BANK_DAY, PAY_DAY_NTH_LAST_BANK_DAY)
+MAX_BANK_DAY_NUMBER = 15
+
 # Weekday options (used for weekly pay frequency)
 WEEKDAY_OPTIONS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
 
@@ -68,6 +79,7 @@ DEFAULT_PAY_FREQ = PAY_FREQ_MONTHLY
 DEFAULT_MONTHLY_DAY = PAY_DAY_LAST_BANK_DAY
 DEFAULT_BANK_OFFSET = 0
 DEFAULT_SPECIFIC_DAY = 31
+DEFAULT_BANK_DAY_NUMBER = 1
 DEFAULT_EVENT_TIME = "06:00:00"
 
 
@@ -76,7 +88,22 @@ ICON_NEXT_PAYDAY = "mdi:calendar-clock"
 ICON_IS_IT_PAYDAY_TRUE = "mdi:cash-fast"
 ICON_IS_IT_PAYDAY_FALSE = "mdi:cash-clock"
 ICON_DAYS_TO = "mdi:calendar-end"
+ICON_BANK_DAYS_TO = "mdi:bank-outline"
 ICON_LAST_PAYDAY = "mdi:calendar-check"
 
 # Event fired on the day a payday occurs
 EVENT_PAYDAY = "isitpayday_payday"
+
+# Compiled bank closing days persisted across restarts (see __init__.py)
+STORAGE_KEY = f"{DOMAIN}.bank_days"
+STORAGE_VERSION = 1
+DATA_BANK_DAYS = "bank_days"
+
+# Shared country/subdivision index, loaded once (see __init__.py)
+DATA_COUNTRY_INDEX = "country_index"
+
+# Regions and payday windows shared by the entries (see shared.py)
+DATA_SHARED = "shared"
+
+# The integration's own thread pool for calculations (see executor.py)
+DATA_EXECUTOR = "executor"
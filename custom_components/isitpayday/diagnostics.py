@@ -6,7 +6,8 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_NAME, DOMAIN
+from .const import CONF_NAME, DATA_EXECUTOR, DATA_SHARED, DOMAIN
+from .payday_calculator import holiday_cache_info
 
 # The instance name may contain personal information (e.g. a person's name).
 TO_REDACT = {CONF_NAME}
@@ -29,6 +30,8 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     info = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
     coordinator = info.get("coordinator")
+    shared = hass.data.get(DOMAIN, {}).get(DATA_SHARED)
+    executor = hass.data.get(DOMAIN, {}).get(DATA_EXECUTOR)
 
     return {
         "entry": {
@@ -45,4 +48,7 @@ async def async_get_config_entry_diagnostics(
                 coordinator.last_update_success if coordinator else None
             ),
         },
+        "holiday_cache": holiday_cache_info(),
+        "shared": shared.info() if shared else None,
+        "executor": executor.info() if executor else None,
     }
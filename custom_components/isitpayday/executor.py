@@ -0,0 +1,117 @@
+"""A small thread pool of the integration's own for payday calculations.
+
+Home Assistant's default executor is shared with the I/O of every other
+integration. At startup and at midnight all entries refresh at once, so
+their calculations run on a bounded pool of their own instead, where they
+cannot crowd out other work. Requests with a key that is already in
+flight await the running job instead of starting another one, so entries
+of the same region compile its bank days once, not once per entry.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 2
+
+
+class _Flight:
+    """A job in flight and the number of callers awaiting it."""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class CalculationExecutor:
+    """A bounded thread pool with single-flight jobs and queue metrics.
+
+    The pool is started on first use. `async_run` must be called from the
+    event loop; the metrics are updated from the worker threads.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._in_flight: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.coalesced = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+
+    async def async_run(self, key: Hashable, func: Callable, *args):
+        """Run func(*args) on the pool and return its result.
+
+        While a job with the same key is queued or running, its result is
+        awaited instead. The key stays in flight until every waiter has
+        resumed, so a caller that stores the result (such as a shared
+        payday window) does so before the next request can start another
+        job. Cancelling one waiter does not cancel the job.
+        """
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = self._in_flight[key] = _Flight(self._submit(func, args))
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+    def _submit(self, func: Callable, args: tuple) -> asyncio.Future:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="isitpayday"
+            )
+        with self._lock:
+            self.jobs += 1
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        return asyncio.get_running_loop().run_in_executor(
+            self._pool, self._run, time.monotonic(), func, args
+        )
+
+    def _run(self, submitted: float, func: Callable, args: tuple):
+        started = time.monotonic()
+        with self._lock:
+            self.queued -= 1
+            self.wait_total += started - submitted
+            self.wait_max = max(self.wait_max, started - submitted)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.run_total += time.monotonic() - started
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting; queued jobs are cancelled."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def info(self) -> dict:
+        """Return the job counts, queue depth and wait and run times."""
+        with self._lock:
+            started = self.jobs - self.queued
+            return {
+                "max_workers": self.max_workers,
+                "jobs": self.jobs,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "wait_mean": self.wait_total / started if started else 0.0,
+                "wait_max": self.wait_max,
+                "run_total": self.run_total,
+            }
@@ -0,0 +1,183 @@
+"""Precomputed bank-holiday database for the IsItPayday integration.
+
+Generating holidays with the `holidays` package is by far the most
+expensive step of a calculation, yet its rules are deterministic for a
+given package version. The database stores the bank closing days of every
+supported region for a fixed range of years in one compact binary file,
+which the calculator reads through `mmap`.
+
+Layout (all integers little-endian):
+
+    header   magic b"IIPBANK1", first year (H), last year (H),
+             number of regions (H), length of the holidays version (H),
+             then the holidays version as ASCII
+    index    per region: key length (B), key as UTF-8 ("DE" or "DE/BY"),
+             weekend mask (B, bit d set for weekday d), data offset (I)
+    data     per region and year, a bitmap of `YEAR_BYTES` bytes with bit
+             i set if day i of the year (0 is 1 January) is a bank closing
+             day. Weekends are not included; they follow from the mask.
+
+Only the index is parsed when the file is opened; bitmaps are read from
+the mapping when a year is first needed, and compiled straight into the
+bank calendar's `BankYear` without turning them into dates.
+"""
+
+import logging
+import mmap
+import struct
+from collections.abc import Iterable
+from datetime import date
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"IIPBANK1"
+# 366 days rounded up to whole bytes.
+YEAR_BYTES = 46
+
+_HEADER = struct.Struct("<8sHHHH")
+_INDEX_TAIL = struct.Struct("<BI")
+
+
+def region_key(country: str, subdiv: str | None) -> str:
+    """Return the index key of a region."""
+    return f"{country}/{subdiv}" if subdiv else country
+
+
+def _weekend_mask(weekend: Iterable[int]) -> int:
+    mask = 0
+    for weekday in weekend:
+        mask |= 1 << weekday
+    return mask
+
+
+def _year_bitmap(year: int, closed: Iterable[date]) -> bytes:
+    bitmap = bytearray(YEAR_BYTES)
+    start = date(year, 1, 1).toordinal()
+    for d in closed:
+        if d.year == year:
+            index = d.toordinal() - start
+            bitmap[index >> 3] |= 1 << (index & 7)
+    return bytes(bitmap)
+
+
+def write_database(
+    path,
+    version: str,
+    first_year: int,
+    last_year: int,
+    regions: Iterable[tuple[str, str | None, Iterable[int], Iterable[date]]],
+) -> int:
+    """Write a database file; return the number of regions written.
+
+    `regions` yields (country, subdiv, weekend, closing days) for each
+    region, with the closing days of all years from first_year to
+    last_year inclusive.
+    """
+    years = range(first_year, last_year + 1)
+    keys: list[bytes] = []
+    masks: list[int] = []
+    blobs: list[bytes] = []
+    for country, subdiv, weekend, closed in regions:
+        closed = list(closed)
+        keys.append(region_key(country, subdiv).encode())
+        masks.append(_weekend_mask(weekend))
+        blobs.append(b"".join(_year_bitmap(year, closed) for year in years))
+
+    version_bytes = version.encode("ascii")
+    offset = (
+        _HEADER.size
+        + len(version_bytes)
+        + sum(1 + len(key) + _INDEX_TAIL.size for key in keys)
+    )
+    index = bytearray()
+    for key, mask, blob in zip(keys, masks, blobs):
+        index += bytes((len(key),)) + key + _INDEX_TAIL.pack(mask, offset)
+        offset += len(blob)
+
+    with open(path, "wb") as file:
+        file.write(
+            _HEADER.pack(MAGIC, first_year, last_year, len(keys), len(version_bytes))
+        )
+        file.write(version_bytes)
+        file.write(index)
+        for blob in blobs:
+            file.write(blob)
+    return len(keys)
+
+
+class HolidayDatabase:
+    """Read-only view of a database file, memory-mapped.
+
+    Raises ValueError if the file is not a database. Lookups are safe from
+    several threads, as nothing is written after opening.
+    """
+
+    def __init__(self, path) -> None:
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        try:
+            self._read_index(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self, path) -> None:
+        view = self._view
+        if len(view) < _HEADER.size:
+            raise ValueError(f"{path} is not a holiday database")
+        magic, first, last, count, version_length = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a holiday database")
+        self.first_year = first
+        self.last_year = last
+        position = _HEADER.size
+        self.version = bytes(view[position : position + version_length]).decode()
+        position += version_length
+
+        self._regions: dict[str, tuple[frozenset[int], int]] = {}
+        for _ in range(count):
+            length = view[position]
+            key = bytes(view[position + 1 : position + 1 + length]).decode()
+            position += 1 + length
+            mask, offset = _INDEX_TAIL.unpack_from(view, position)
+            position += _INDEX_TAIL.size
+            weekend = frozenset(d for d in range(7) if mask >> d & 1)
+            self._regions[key] = (weekend, offset)
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def __contains__(self, region: tuple[str, str | None]) -> bool:
+        return region_key(*region) in self._regions
+
+    def weekend(self, country: str) -> frozenset[int] | None:
+        """Return the weekend stored for a country, or None if it is missing."""
+        entry = self._regions.get(country)
+        return entry[0] if entry else None
+
+    def bitmaps(
+        self, country: str, subdiv: str | None, years: Iterable[int]
+    ) -> tuple[dict[int, bytes], list[int]]:
+        """Return the stored closing-day bitmaps of the years, and the missing years.
+
+        Each bitmap has bit i set if day i of the year is a bank closing day.
+        They are copied out of the mapping, so none outlives `close`. Years
+        outside the file's range, or all years of a region that is not in the
+        file, are returned as missing.
+        """
+        entry = self._regions.get(region_key(country, subdiv))
+        bitmaps: dict[int, bytes] = {}
+        missing: list[int] = []
+        for year in years:
+            if entry is None or not self.first_year <= year <= self.last_year:
+                missing.append(year)
+                continue
+            offset = entry[1] + (year - self.first_year) * YEAR_BYTES
+            bitmaps[year] = bytes(self._view[offset : offset + YEAR_BYTES])
+        return bitmaps, missing
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._view.release()
+        self._map.close()
@@ -4,18 +4,47 @@ All functions in this module are synchronous. Holiday data is generated
 locally by the `holidays` package, so no network access is required.
 Callers inside Home Assistant must run these functions in an executor,
 e.g. via `hass.async_add_executor_job`.
+
+The `holidays` package is large, so it is only imported by the first call
+that generates holidays live (see `_holidays`). Restored bank days and the
+holiday database are used without it.
 """
 
 import logging
 import re
-from datetime import date, timedelta
-
-import holidays as holidays_lib
-from holidays.constants import BANK, OPTIONAL, PUBLIC
-
+import threading
+from calendar import monthrange
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+from functools import cache, partial
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import NamedTuple
+
+from .bank_calendar import (
+    DEFAULT_WEEKEND,
+    BankCalendar,
+    BankDaysUnavailable,
+    BankYear,
+    OverlayCalendar,
+)
 from .const import (
+    CONF_BANK_DAY_NUMBER,
+    CONF_BANK_OFFSET,
+    CONF_CLOSED_DAYS,
+    CONF_COUNTRY,
+    CONF_LAST_PAY_DATE,
+    CONF_OPEN_DAYS,
+    CONF_PAY_DAY,
+    CONF_PAY_FREQ,
+    CONF_SUBDIV,
+    CONF_WEEKDAY,
     PAY_DAY_FIRST_BANK_DAY,
     PAY_DAY_LAST_BANK_DAY,
+    PAY_DAY_NTH_BANK_DAY,
+    PAY_DAY_NTH_LAST_BANK_DAY,
     PAY_FREQ_14_DAYS,
     PAY_FREQ_28_DAYS,
     PAY_FREQ_ANNUAL,
@@ -25,12 +54,82 @@ from .const import (
     PAY_FREQ_SEMIANNUAL,
     PAY_FREQ_WEEKLY,
 )
+from .holiday_db import HolidayDatabase, region_key, write_database
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_supported_countries() -> dict[str, str]:
-    """Return supported countries as {ISO code: display name}, sorted by name."""
+def _holidays():
+    """Return the holidays package, importing it on first use."""
+    import holidays
+
+    return holidays
+
+
+def _category(name: str) -> str:
+    """Return a holiday category constant from `holidays.constants` by name."""
+    from holidays import constants
+
+    return getattr(constants, name)
+
+
+def __getattr__(name: str):
+    # `holidays_lib` used to be imported at module level; keep it available
+    # as an attribute without importing the package up front.
+    if name == "holidays_lib":
+        return _holidays()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class CountryIndex:
+    """Supported countries and their subdivisions for one holidays version.
+
+    Country names are read from the holidays registry once, when the index
+    is built. Subdivision labels need a probe object of the country, so
+    they are looked up the first time a country is asked for and kept.
+    """
+
+    def __init__(self, version: str, countries: dict[str, str]) -> None:
+        self.version = version
+        self.countries = countries
+        self._subdivisions: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, country: str) -> bool:
+        return country in self.countries
+
+    def subdivisions(self, country: str) -> dict[str, str]:
+        """Return the subdivisions of a country as {code: label}."""
+        subdivisions = self._subdivisions.get(country)
+        if subdivisions is None:
+            with self._lock:
+                subdivisions = self._subdivisions.get(country)
+                if subdivisions is None:
+                    subdivisions = _list_subdivisions(country)
+                    self._subdivisions[country] = subdivisions
+        return subdivisions
+
+
+_country_index: CountryIndex | None = None
+_COUNTRY_INDEX_LOCK = threading.Lock()
+
+
+def get_country_index() -> CountryIndex:
+    """Return the process-wide country index, building it on first use.
+
+    Concurrent callers wait for the one build in progress, so the registry
+    is walked once per process.
+    """
+    global _country_index
+    if _country_index is None:
+        with _COUNTRY_INDEX_LOCK:
+            if _country_index is None:
+                _country_index = build_country_index()
+    return _country_index
+
+
+def build_country_index() -> CountryIndex:
+    """Build a country index from the holidays registry."""
     countries: dict[str, str] = {}
     try:
         from holidays.registry import COUNTRIES
@@ -46,10 +145,19 @@ def get_supported_countries() -> dict[str, str]:
             "Could not read country names from holidays registry; "
             "falling back to country codes."
         )
-        for code in holidays_lib.list_supported_countries():
+        for code in _holidays().list_supported_countries():
             countries[code] = code
 
-    return dict(sorted(countries.items(), key=lambda item: item[1]))
+    _LOGGER.debug("Indexed %s countries", len(countries))
+    return CountryIndex(
+        holidays_version(),
+        dict(sorted(countries.items(), key=lambda item: item[1])),
+    )
+
+
+def get_supported_countries() -> dict[str, str]:
+    """Return supported countries as {ISO code: display name}, sorted by name."""
+    return dict(get_country_index().countries)
 
 
 def get_country_subdivisions(country: str) -> dict[str, str]:
@@ -59,41 +167,428 @@ def get_country_subdivisions(country: str) -> dict[str, str]:
     names are used where the holidays package provides aliases,
     e.g. "Bavaria (BY)" instead of just "BY".
     """
-    try:
-        supported = holidays_lib.list_supported_countries()
-        subdivs = supported.get(country, [])
-        if not subdivs:
-            return {}
+    return get_country_index().subdivisions(country)
 
-        code_to_alias: dict[str, str] = {}
-        try:
-            probe = holidays_lib.country_holidays(country)
-            aliases = getattr(probe, "subdivisions_aliases", {}) or {}
-            # aliases maps alias name -> subdivision code; invert it and
-            # keep the first (usually most readable) alias per code.
-            for alias, code in aliases.items():
-                code_to_alias.setdefault(str(code), str(alias))
-        except Exception:  # pragma: no cover - aliases are a nice-to-have
-            code_to_alias = {}
-
-        options: dict[str, str] = {}
-        for code in subdivs:
-            code = str(code)
-            alias = code_to_alias.get(code)
-            options[code] = f"{alias} ({code})" if alias else code
-        return dict(sorted(options.items(), key=lambda item: item[1]))
+
+def _list_subdivisions(country: str) -> dict[str, str]:
+    """Read the subdivisions of a country and their aliases from a probe."""
+    try:
+        probe = _holidays().country_holidays(country)
+    except NotImplementedError:
+        return {}
     except Exception as e:
         _LOGGER.exception("Error listing subdivisions for %s: %s", country, e)
         return {}
 
+    subdivs = getattr(probe, "subdivisions", None)
+    if subdivs is None:  # pragma: no cover - older holidays versions
+        subdivs = _holidays().list_supported_countries().get(country, [])
+    if not subdivs:
+        return {}
+
+    # aliases maps alias name -> subdivision code; invert it and keep the
+    # first (usually most readable) alias per code.
+    code_to_alias: dict[str, str] = {}
+    aliases = getattr(probe, "subdivisions_aliases", {}) or {}
+    for alias, code in aliases.items():
+        code_to_alias.setdefault(str(code), str(alias))
+
+    options: dict[str, str] = {}
+    for code in subdivs:
+        code = str(code)
+        alias = code_to_alias.get(code)
+        options[code] = f"{alias} ({code})" if alias else code
+    return dict(sorted(options.items(), key=lambda item: item[1]))
+
+
+def is_country_supported(country: str) -> bool:
+    """Return True if bank holidays can be calculated for a country.
+
+    Countries whose holidays were generated with the installed holidays
+    version, in this run or (as saved with `export_bank_closing_days`) an
+    earlier one, or that are in the holiday database are known to be
+    supported, so the package is only imported for other countries.
+    """
+    if country in _SUPPORTED_COUNTRIES:
+        return True
+    database = get_holiday_database()
+    if database is not None and database.weekend(country) is not None:
+        return True
+    return country in get_country_index()
+
 
 # Some countries place their de facto bank closing days in categories other
 # than BANK. For Denmark, Constitution Day, Christmas Eve and New Year's Eve
-# are in the OPTIONAL category, but banks are closed on those days.
-_EXTRA_CATEGORIES_PER_COUNTRY: dict[str, tuple] = {
-    "DK": (OPTIONAL,),
+# are in the OPTIONAL category, but banks are closed on those days. Listed by
+# name in `holidays.constants`, which is only imported when needed.
+_EXTRA_CATEGORIES_PER_COUNTRY: dict[str, tuple[str, ...]] = {
+    "DK": ("OPTIONAL",),
 }
 
+# The weekend of each country comes from the `holidays` package (e.g.
+# Friday-Saturday for Saudi Arabia). Countries whose banks keep a different
+# weekend than the one the package reports can be overridden here, as
+# weekday numbers (Monday is 0).
+_WEEKEND_PER_COUNTRY: dict[str, frozenset[int]] = {}
+
+
+class HolidayCache:
+    """Process-wide LRU cache of generated holiday tables.
+
+    Holiday data only changes when the requested year span changes, so every
+    config entry (and both calculations of a coordinator refresh) can share
+    the same objects. Tables are keyed by (country, subdiv, categories,
+    years). The categories and the weekend resolved per country are
+    memoized separately, because resolving them needs a throwaway probe
+    object of its own.
+
+    The cache is used from executor threads, so all access is locked.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._tables: OrderedDict[tuple, object] = OrderedDict()
+        self._categories: dict[str, tuple] = {}
+        self._weekends: dict[str, frozenset[int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.category_hits = 0
+        self.category_misses = 0
+
+    def get_table(self, key: tuple):
+        """Return a cached table (marking it recently used), or None."""
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put_table(self, key: tuple, table) -> None:
+        """Store a table, evicting the least recently used one if full."""
+        with self._lock:
+            self._tables[key] = table
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+
+    def get_categories(self, country: str) -> tuple | None:
+        """Return the memoized categories for a country, or None."""
+        with self._lock:
+            categories = self._categories.get(country)
+            if categories is None:
+                self.category_misses += 1
+            else:
+                self.category_hits += 1
+            return categories
+
+    def put_categories(self, country: str, categories: tuple) -> None:
+        """Memoize the resolved categories for a country."""
+        with self._lock:
+            self._categories[country] = categories
+
+    def get_weekend(self, country: str) -> frozenset[int] | None:
+        """Return the memoized weekend for a country, or None."""
+        with self._lock:
+            return self._weekends.get(country)
+
+    def put_weekend(self, country: str, weekend: frozenset[int]) -> None:
+        """Memoize the weekend reported for a country."""
+        with self._lock:
+            self._weekends[country] = weekend
+
+    def clear(self) -> None:
+        """Drop all cached tables, categories and weekends; reset the counters."""
+        with self._lock:
+            self._tables.clear()
+            self._categories.clear()
+            self._weekends.clear()
+            self.hits = self.misses = 0
+            self.category_hits = self.category_misses = 0
+
+    def evict(self, country: str) -> int:
+        """Drop everything cached for one country; return the tables removed."""
+        with self._lock:
+            keys = [key for key in self._tables if key[0] == country]
+            for key in keys:
+                del self._tables[key]
+            self._categories.pop(country, None)
+            self._weekends.pop(country, None)
+            return len(keys)
+
+    def evict_region(self, country: str, subdiv: str | None) -> int:
+        """Drop the tables of one region; return the tables removed.
+
+        The country's categories and weekend stay memoized, as other
+        subdivisions of the country may still use them.
+        """
+        with self._lock:
+            keys = [key for key in self._tables if key[:2] == (country, subdiv)]
+            for key in keys:
+                del self._tables[key]
+            return len(keys)
+
+    def info(self) -> dict:
+        """Return hit/miss counters and the current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "category_hits": self.category_hits,
+                "category_misses": self.category_misses,
+                "size": len(self._tables),
+                "maxsize": self.maxsize,
+            }
+
+
+_HOLIDAY_CACHE = HolidayCache()
+
+
+def holiday_cache_info() -> dict:
+    """Return statistics for the shared holiday cache."""
+    return _HOLIDAY_CACHE.info()
+
+
+def clear_holiday_cache() -> None:
+    """Drop the cached holiday tables, bank calendars and country index.
+
+    Useful e.g. after a holidays upgrade.
+    """
+    global _bank_days_changes, _country_index
+    _HOLIDAY_CACHE.clear()
+    with _COUNTRY_INDEX_LOCK:
+        _country_index = None
+    with _BANK_CALENDARS_LOCK:
+        _BANK_CALENDARS.clear()
+        _RELEASED_CALENDARS.clear()
+        _RESTORED_CLOSING_DAYS.clear()
+        _SUPPORTED_COUNTRIES.clear()
+        _bank_days_changes += 1
+
+
+def evict_holiday_cache(country: str) -> int:
+    """Drop all cached holiday tables and bank calendars for one country.
+
+    Returns the number of holiday tables removed.
+    """
+    global _bank_days_changes
+    with _BANK_CALENDARS_LOCK:
+        _bank_days_changes += 1
+        for key in [key for key in _BANK_CALENDARS if key[0] == country]:
+            del _BANK_CALENDARS[key]
+        for key in [key for key in _RELEASED_CALENDARS if key[0] == country]:
+            del _RELEASED_CALENDARS[key]
+        for key in [key for key in _RESTORED_CLOSING_DAYS if key[0] == country]:
+            del _RESTORED_CLOSING_DAYS[key]
+        _SUPPORTED_COUNTRIES.discard(country)
+    return _HOLIDAY_CACHE.evict(country)
+
+
+def release_bank_calendars(country: str, subdiv: str | None = None) -> int:
+    """Drop the compiled bank calendars and holiday tables of one region.
+
+    Used once no schedule needs the region anymore. The region's calendar
+    is kept among the last few released ones, so a region used again soon
+    after does not compile its years again; restored closing days are kept
+    too. Both are still saved. Returns the number of calendars removed,
+    overlays included.
+    """
+    global _bank_days_changes
+    region = (country, subdiv)
+    with _BANK_CALENDARS_LOCK:
+        keys = [key for key in _BANK_CALENDARS if key[:2] == region]
+        for key in keys:
+            bank_calendar = _BANK_CALENDARS.pop(key)
+            if key == region:
+                _RELEASED_CALENDARS[region] = bank_calendar
+                _RELEASED_CALENDARS.move_to_end(region)
+        while len(_RELEASED_CALENDARS) > _MAX_RELEASED_CALENDARS:
+            _RELEASED_CALENDARS.popitem(last=False)
+        _bank_days_changes += 1
+    _HOLIDAY_CACHE.evict_region(country, subdiv)
+    return len(keys)
+
+
+def release_overlay_calendar(
+    country: str,
+    subdiv: str | None,
+    closed_days: Iterable[date],
+    open_days: Iterable[date],
+) -> bool:
+    """Drop the overlay calendar of a region and a set of closure days.
+
+    Used once no schedule has these closure days anymore; the region's
+    calendar is kept. Returns True if an overlay was removed.
+    """
+    key = (country, subdiv, frozenset(closed_days), frozenset(open_days))
+    with _BANK_CALENDARS_LOCK:
+        return _BANK_CALENDARS.pop(key, None) is not None
+
+
+def _resolve_categories(country: str) -> tuple:
+    """Return the holiday categories that represent bank closing days.
+
+    Includes the PUBLIC category, the BANK category where the country
+    supports it, and any country-specific extra categories. Raises
+    NotImplementedError for unsupported countries.
+    """
+    categories = _HOLIDAY_CACHE.get_categories(country)
+    if categories is not None:
+        return categories
+
+    probe = _holidays().country_holidays(country)
+    public, bank = _category("PUBLIC"), _category("BANK")
+    supported = getattr(probe, "supported_categories", (public,))
+    # The same probe reports the weekend, see `_resolve_weekend`.
+    weekend = getattr(probe, "weekend", None)
+    _HOLIDAY_CACHE.put_weekend(
+        country,
+        DEFAULT_WEEKEND if weekend is None else frozenset(int(d) for d in weekend),
+    )
+
+    resolved = [public]
+    if bank in supported:
+        resolved.append(bank)
+    for name in _EXTRA_CATEGORIES_PER_COUNTRY.get(country, ()):
+        extra = _category(name)
+        if extra in supported and extra not in resolved:
+            resolved.append(extra)
+
+    categories = tuple(resolved)
+    _LOGGER.debug("Using holiday categories %s for country %s", categories, country)
+    _HOLIDAY_CACHE.put_categories(country, categories)
+    with _BANK_CALENDARS_LOCK:
+        _SUPPORTED_COUNTRIES.add(country)
+    return categories
+
+
+def _resolve_weekend(country: str) -> frozenset[int]:
+    """Return the weekdays on which banks in a country are closed.
+
+    Uses `_WEEKEND_PER_COUNTRY` if the country is listed there, otherwise
+    the weekend reported by the `holidays` package. Falls back to
+    Saturday-Sunday for countries the package does not support.
+    """
+    if country in _WEEKEND_PER_COUNTRY:
+        return _WEEKEND_PER_COUNTRY[country]
+
+    weekend = _HOLIDAY_CACHE.get_weekend(country)
+    if weekend is None:
+        database = get_holiday_database()
+        weekend = database.weekend(country) if database else None
+    if weekend is None:
+        try:
+            _resolve_categories(country)
+        except Exception:  # reported when the holidays are loaded
+            return DEFAULT_WEEKEND
+        weekend = _HOLIDAY_CACHE.get_weekend(country)
+    return DEFAULT_WEEKEND if weekend is None else weekend
+
+
+# Precomputed bank closing days, built with `build_holiday_database` and
+# shipped next to this module. Used only if it was built with the installed
+# version of the holidays package.
+HOLIDAY_DATABASE_PATH = Path(__file__).with_name("bank_holidays.bin")
+
+_NOT_LOADED = object()
+_holiday_database = _NOT_LOADED
+_HOLIDAY_DATABASE_LOCK = threading.Lock()
+
+
+@cache
+def holidays_version() -> str:
+    """Return the installed version of the holidays package, without importing it."""
+    from importlib import metadata
+
+    try:
+        return metadata.version("holidays")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def get_holiday_database() -> HolidayDatabase | None:
+    """Return the precomputed holiday database, or None if it is unusable.
+
+    The file is opened on first use. A missing file, or one built with a
+    different holidays version, means all holidays are generated live.
+    """
+    global _holiday_database
+    if _holiday_database is _NOT_LOADED:
+        with _HOLIDAY_DATABASE_LOCK:
+            if _holiday_database is _NOT_LOADED:
+                _holiday_database = _open_holiday_database(HOLIDAY_DATABASE_PATH)
+    return _holiday_database
+
+
+def set_holiday_database(path) -> None:
+    """Use the database at `path` (None for none) and drop everything cached."""
+    global _holiday_database
+    with _HOLIDAY_DATABASE_LOCK:
+        _holiday_database = _open_holiday_database(path) if path else None
+    clear_holiday_cache()
+
+
+def _open_holiday_database(path) -> HolidayDatabase | None:
+    try:
+        database = HolidayDatabase(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        _LOGGER.warning("Ignoring holiday database %s: %s", path, e)
+        return None
+    version = holidays_version()
+    if database.version != version:
+        _LOGGER.info(
+            "Ignoring holiday database built for holidays %s (installed: %s)",
+            database.version,
+            version,
+        )
+        database.close()
+        return None
+    _LOGGER.debug(
+        "Using holiday database with %s regions for %s-%s",
+        len(database),
+        database.first_year,
+        database.last_year,
+    )
+    return database
+
+
+def build_holiday_database(path, first_year: int, last_year: int) -> int:
+    """Precompute the bank closing days of every supported region into `path`.
+
+    Covers each country and subdivision in `list_supported_countries()`,
+    with the same categories as `get_bank_holidays`, for the years from
+    first_year to last_year inclusive. Countries that fail to generate are
+    skipped and stay live. Returns the number of regions written.
+    """
+    years = list(range(first_year, last_year + 1))
+
+    holidays_lib = _holidays()
+
+    def regions():
+        for country, subdivs in sorted(holidays_lib.list_supported_countries().items()):
+            try:
+                categories = _resolve_categories(country)
+                for subdiv in [None, *subdivs]:
+                    table = holidays_lib.country_holidays(
+                        country, subdiv=subdiv, years=years, categories=categories
+                    )
+                    weekend = getattr(table, "weekend", None)
+                    yield (
+                        country,
+                        subdiv,
+                        DEFAULT_WEEKEND if weekend is None else weekend,
+                        list(table),
+                    )
+            except Exception as e:
+                _LOGGER.warning("Skipping %s in the holiday database: %s", country, e)
+
+    return write_database(path, holidays_version(), first_year, last_year, regions())
+
 
 def get_bank_holidays(country: str, years: list[int], subdiv: str | None = None):
     """Return a holidays object covering all bank closing days for a country.
@@ -106,22 +601,13 @@ def get_bank_holidays(country: str, years: list[int], subdiv: str | None = None)
     The returned object supports `date in obj` membership checks and lazily
     populates additional years on demand, so lookups outside the given
     years also work correctly.
+
+    Results are shared through a process-wide cache, so callers must treat
+    the returned object as read-only. Returns an empty mapping if the
+    holidays cannot be generated.
     """
     try:
-        probe = holidays_lib.country_holidays(country)
-        supported = getattr(probe, "supported_categories", (PUBLIC,))
-
-        categories = [PUBLIC]
-        if BANK in supported:
-            categories.append(BANK)
-        for extra in _EXTRA_CATEGORIES_PER_COUNTRY.get(country, ()):
-            if extra in supported and extra not in categories:
-                categories.append(extra)
-
-        _LOGGER.debug("Using holiday categories %s for country %s", categories, country)
-        return holidays_lib.country_holidays(
-            country, subdiv=subdiv, years=years, categories=tuple(categories)
-        )
+        return _generate_bank_holidays(country, years, subdiv)
     except NotImplementedError:
         _LOGGER.error("Country '%s' is not supported by the holidays package.", country)
         return {}
@@ -130,33 +616,313 @@ def get_bank_holidays(country: str, years: list[int], subdiv: str | None = None)
         return {}
 
 
-def _is_bank_day(d: date, bank_holidays) -> bool:
-    """Return True if the date is a working bank day (not weekend, not holiday)."""
-    return d.weekday() < 5 and d not in bank_holidays
+def _generate_bank_holidays(country: str, years: list[int], subdiv: str | None):
+    """Return the cached holidays object of `get_bank_holidays`; raise on errors."""
+    categories = _resolve_categories(country)
+    span = tuple(sorted(set(years)))
+    key = (country, subdiv, categories, span)
 
+    table = _HOLIDAY_CACHE.get_table(key)
+    if table is None:
+        table = _holidays().country_holidays(
+            country, subdiv=subdiv, years=list(span), categories=categories
+        )
+        _HOLIDAY_CACHE.put_table(key, table)
+    return table
 
-def _adjust_to_previous_bank_day(d: date, bank_holidays) -> date:
-    """Move date backwards until it lands on a valid bank day."""
-    while not _is_bank_day(d, bank_holidays):
-        d -= timedelta(days=1)
-    return d
 
+# Compiled bank calendars, one per (country, subdiv), shared by all entries.
+# Calendars with closure-day overlays are keyed by (country, subdiv, closed,
+# opened) and share the region's calendar as their base.
+_BANK_CALENDARS: dict[tuple, BankCalendar] = {}
+_BANK_CALENDARS_LOCK = threading.Lock()
 
-def _adjust_to_next_bank_day(d: date, bank_holidays) -> date:
-    """Move date forwards until it lands on a valid bank day."""
-    while not _is_bank_day(d, bank_holidays):
-        d += timedelta(days=1)
-    return d
+# Calendars of regions no entry uses anymore, least recently released
+# first. Reloading an entry (e.g. after an options change) releases its
+# region and takes the calendar back, without compiling any year again;
+# until then the calendar is still saved.
+_RELEASED_CALENDARS: OrderedDict[tuple[str, str | None], BankCalendar] = OrderedDict()
+_MAX_RELEASED_CALENDARS = 4
+
+
+# Closing days restored from a previous run with `restore_bank_closing_days`,
+# per region and year. A year is removed once it has been compiled.
+_RESTORED_CLOSING_DAYS: dict[tuple[str, str | None], dict[int, list[date]]] = {}
+
+# Countries the installed holidays version generated holidays for, in this
+# run or a saved one. Restored closing days alone do not make a country
+# supported: they may be weekends only.
+_SUPPORTED_COUNTRIES: set[str] = set()
+
+# Incremented whenever the bank days `export_bank_closing_days` covers may
+# have changed, so callers can skip exporting when nothing did.
+_bank_days_changes = 0
+
+
+def bank_days_changes() -> int:
+    """Return a number that changes whenever the exportable bank days may."""
+    return _bank_days_changes
+
+
+def _bank_days_compiled() -> None:
+    """Note that a region's calendar stored newly compiled years."""
+    global _bank_days_changes
+    with _BANK_CALENDARS_LOCK:
+        _bank_days_changes += 1
+
+
+def _database_bank_years(
+    country: str, subdiv: str | None, years: list[int], weekend: frozenset[int]
+) -> dict[int, BankYear]:
+    """Return the given years compiled straight from the holiday database.
+
+    Years restored from the Store are left to `_bank_closing_days`, so
+    restored data is used before the database.
+    """
+    database = get_holiday_database()
+    if database is None:
+        return {}
+    with _BANK_CALENDARS_LOCK:
+        restored = _RESTORED_CLOSING_DAYS.get((country, subdiv), {})
+        years = [year for year in years if year not in restored]
+    bitmaps, _ = database.bitmaps(country, subdiv, years)
+    return {
+        year: BankYear.from_closed_bitmap(year, closed, weekend)
+        for year, closed in bitmaps.items()
+    }
+
+
+def _bank_closing_days(country: str, subdiv: str | None, years: list[int]):
+    """Return the bank closing days for the given years as dates.
+
+    Restored years are used first; the others are generated with the
+    holidays package. Years in the holiday database never get here, see
+    `_database_bank_years`. Raises
+    `BankDaysUnavailable` if that fails, so the years are not kept as if
+    they had no holidays.
+    """
+    closed: list[date] = []
+    missing = []
+    with _BANK_CALENDARS_LOCK:
+        restored = _RESTORED_CLOSING_DAYS.get((country, subdiv), {})
+        for year in years:
+            days = restored.pop(year, None)
+            if days is None:
+                missing.append(year)
+            else:
+                closed.extend(days)
+    if missing:
+        try:
+            closed.extend(_generate_bank_holidays(country, missing, subdiv))
+        except Exception as e:
+            raise BankDaysUnavailable(missing, closed) from e
+    return closed
+
+
+def export_bank_closing_days(first_year: int) -> dict:
+    """Return the compiled closing days of all regions, for saving.
+
+    Covers the years from `first_year` on that are compiled or restored
+    but not yet used, so a restart can restore them with
+    `restore_bank_closing_days` instead of generating holidays. The days
+    of each year are delta-encoded: the first number is the day of the year
+    (0 is 1 January), each following one the distance to the previous day.
+    The countries known to be supported are saved too.
+    """
+    with _BANK_CALENDARS_LOCK:
+        calendars = [
+            calendar for key, calendar in _BANK_CALENDARS.items() if len(key) == 2
+        ]
+        calendars.extend(_RELEASED_CALENDARS.values())
+        restored = {
+            region: dict(years) for region, years in _RESTORED_CLOSING_DAYS.items()
+        }
+        countries = sorted(_SUPPORTED_COUNTRIES)
+
+    regions: dict[str, dict] = {}
+    for region, years in restored.items():
+        # Restoring memoized the weekend; without it, skip the region.
+        weekend = _HOLIDAY_CACHE.get_weekend(region[0])
+        if weekend is None:
+            continue
+        for year, days in years.items():
+            if year >= first_year:
+                _add_region_year(regions, region, weekend, year, days)
+    for calendar in calendars:
+        for year, days in calendar.compiled_closing_days().items():
+            if year >= first_year:
+                _add_region_year(
+                    regions,
+                    (calendar.country, calendar.subdiv),
+                    calendar.weekend,
+                    year,
+                    days,
+                )
+    return {
+        "holidays": holidays_version(),
+        "countries": countries,
+        "regions": regions,
+    }
+
+
+def _add_region_year(
+    regions: dict, region: tuple, weekend, year: int, days: list[date]
+) -> None:
+    """Add the delta-encoded closing days of one region's year to an export."""
+    entry = regions.setdefault(
+        region_key(*region), {"weekend": sorted(weekend), "years": {}}
+    )
+    offsets = [d.toordinal() - date(year, 1, 1).toordinal() for d in sorted(days)]
+    entry["years"][str(year)] = [
+        offset - previous for offset, previous in zip(offsets, [0, *offsets])
+    ]
+
+
+def restore_bank_closing_days(data: Mapping) -> int:
+    """Restore closing days saved with `export_bank_closing_days`.
+
+    Restored years are compiled from the saved days instead of generated
+    holidays. Data saved with another holidays version is ignored, as its
+    rules may have changed. Returns the number of years restored.
+    """
+    if data.get("holidays") != holidays_version():
+        _LOGGER.debug(
+            "Not restoring bank days saved for holidays %s", data.get("holidays")
+        )
+        return 0
+
+    global _bank_days_changes
+    restored = 0
+    with _BANK_CALENDARS_LOCK:
+        _bank_days_changes += 1
+        _SUPPORTED_COUNTRIES.update(data.get("countries", ()))
+        for key, entry in data.get("regions", {}).items():
+            country, _, subdiv = key.partition("/")
+            if _HOLIDAY_CACHE.get_weekend(country) is None:
+                _HOLIDAY_CACHE.put_weekend(country, frozenset(entry["weekend"]))
+            years = _RESTORED_CLOSING_DAYS.setdefault((country, subdiv or None), {})
+            for year, deltas in entry["years"].items():
+                start = date(int(year), 1, 1).toordinal()
+                years[int(year)] = [
+                    date.fromordinal(start + offset) for offset in accumulate(deltas)
+                ]
+                restored += 1
+    _LOGGER.debug("Restored bank closing days for %s years", restored)
+    return restored
+
+
+def get_bank_calendar(
+    country: str,
+    subdiv: str | None = None,
+    closed_days: Iterable[date] = frozenset(),
+    open_days: Iterable[date] = frozenset(),
+) -> BankCalendar:
+    """Return the shared compiled bank-day calendar for a region.
+
+    Years are compiled from `get_bank_holidays` and the country's weekend
+    on first use. Compiled years are immutable, so the calendar is safe to
+    share between threads.
+
+    With `closed_days` or `open_days`, returns a calendar with those extra
+    closed (or forced open) days applied on top of the region's calendar.
+    """
+    if closed_days or open_days:
+        return _overlay_calendar(country, subdiv, closed_days, open_days)
+
+    key = (country, subdiv)
+    bank_calendar = _BANK_CALENDARS.get(key)
+    if bank_calendar is None:
+        weekend = _resolve_weekend(country)
+        with _BANK_CALENDARS_LOCK:
+            bank_calendar = _BANK_CALENDARS.get(key)
+            if bank_calendar is None:
+                bank_calendar = _RELEASED_CALENDARS.pop(key, None)
+            if bank_calendar is None:
+                bank_calendar = BankCalendar(
+                    country,
+                    subdiv,
+                    partial(_bank_closing_days, country, subdiv),
+                    weekend,
+                    year_loader=partial(_database_bank_years, country, subdiv),
+                    on_compile=_bank_days_compiled,
+                )
+            _BANK_CALENDARS[key] = bank_calendar
+    return bank_calendar
+
+
+def _overlay_calendar(
+    country: str,
+    subdiv: str | None,
+    closed_days: Iterable[date],
+    open_days: Iterable[date],
+) -> BankCalendar:
+    """Return the shared overlay calendar for a region and a set of changes."""
+    key = (country, subdiv, frozenset(closed_days), frozenset(open_days))
+    bank_calendar = _BANK_CALENDARS.get(key)
+    if bank_calendar is None:
+        base = get_bank_calendar(country, subdiv)
+        with _BANK_CALENDARS_LOCK:
+            bank_calendar = _BANK_CALENDARS.get(key)
+            if bank_calendar is None:
+                bank_calendar = OverlayCalendar(base, *key[2:])
+                _BANK_CALENDARS[key] = bank_calendar
+    return bank_calendar
+
+
+def bank_years_compiled(
+    country: str, years: Iterable[int], subdiv: str | None = None
+) -> bool:
+    """Return True if the region's shared calendar has all the years compiled.
+
+    Only looks at what is already compiled, so it never blocks and can be
+    called from the event loop.
+    """
+    key = (country, subdiv)
+    bank_calendar = _BANK_CALENDARS.get(key) or _RELEASED_CALENDARS.get(key)
+    if bank_calendar is None:
+        return False
+    compiled = set(bank_calendar.years)
+    return all(year in compiled for year in years)
+
+
+def compile_bank_years(
+    country: str, years: Iterable[int], subdiv: str | None = None
+) -> None:
+    """Compile years of the region's shared bank calendar ahead of use."""
+    get_bank_calendar(country, subdiv).ensure_years(years)
+
+
+def prefetch_bank_year(country: str, year: int, subdiv: str | None = None) -> None:
+    """Compile a year of the shared bank calendar ahead of time.
+
+    Used in December to compile the year that the first refresh of the new
+    year will need, so that refresh does not have to generate any holidays.
+    """
+    compile_bank_years(country, [year], subdiv)
 
 
-def _adjust_not_before_today(payday: date, today: date, bank_holidays) -> date:
+def count_bank_days(
+    country: str, start: date, end: date, subdiv: str | None = None
+) -> int:
+    """Return the number of bank days from start up to, not including, end.
+
+    Counts come from the running totals of the shared compiled calendar,
+    so after the first call for a year this does not depend on the length
+    of the span. The result is negative if end is before start.
+    """
+    return get_bank_calendar(country, subdiv).count_bank_days(start, end)
+
+
+def _adjust_not_before_today(
+    payday: date, today: date, bank_calendar: BankCalendar
+) -> date:
     """Adjust payday to the previous bank day, but never earlier than today.
 
     If adjusting backwards would land before today, adjust forwards instead.
     """
-    adjusted = _adjust_to_previous_bank_day(payday, bank_holidays)
+    adjusted = bank_calendar.previous_bank_day(payday)
     if adjusted < today:
-        adjusted = _adjust_to_next_bank_day(payday, bank_holidays)
+        adjusted = bank_calendar.next_bank_day(payday)
     return adjusted
 
 
@@ -174,130 +940,389 @@ def _add_months(d: date, months: int) -> date:
     return date(year, month, day)
 
 
-def calculate_next_payday(
-    country: str,
-    pay_frequency: str,
-    pay_day=None,
-    last_pay_date=None,
-    weekday=None,
-    bank_offset: int = 0,
-    subdiv: str | None = None,
-):
-    """Calculate the next payday date (first of the upcoming paydays)."""
-    paydays = calculate_upcoming_paydays(
-        country,
-        pay_frequency,
-        pay_day,
-        last_pay_date,
-        weekday,
-        bank_offset,
-        subdiv,
-        count=1,
+def _bimonthly_step(anchor: date, step: int) -> date:
+    """Return the date `step` 2-month steps after the anchor.
+
+    Equivalent to applying `_add_months(d, 2)` `step` times, where a day
+    clamped in a short month stays clamped. Within 12 steps every month of
+    the cycle has been visited in two consecutive years (so including a
+    non-leap February), after which the day can no longer change and the
+    remaining steps are a single jump.
+    """
+    d = anchor
+    for _ in range(min(step, 12)):
+        d = _add_months(d, 2)
+    if step > 12:
+        d = _add_months(d, 2 * (step - 12))
+    return d
+
+
+def _bimonthly_seek(anchor: date, d: date) -> int:
+    """Return the index of the last 2-month step on or before `d`.
+
+    The result is negative if the anchor itself is after `d`.
+    """
+    step = ((d.year - anchor.year) * 12 + d.month - anchor.month) // 2
+    if step >= 0 and _bimonthly_step(anchor, step) > d:
+        step -= 1
+    return step
+
+
+def _interval_seek(anchor: date, d: date, interval: int) -> int:
+    """Return the index of the last interval step on or before `d`.
+
+    The result is negative if the anchor itself is after `d`.
+    """
+    return (d - anchor).days // interval
+
+
+# A monthly schedule that yields no payday at all (e.g. pay_day 0) stops
+# after this many consecutive months without one.
+_MAX_EMPTY_MONTHS = 24
+
+_MONTHLY_PAY_DAYS = (
+    PAY_DAY_LAST_BANK_DAY,
+    PAY_DAY_FIRST_BANK_DAY,
+    PAY_DAY_NTH_BANK_DAY,
+    PAY_DAY_NTH_LAST_BANK_DAY,
+)
+
+_INTERVAL_DAYS = {
+    PAY_FREQ_14_DAYS: 14,
+    PAY_FREQ_28_DAYS: 28,
+    PAY_FREQ_QUARTERLY: 91,
+    PAY_FREQ_SEMIANNUAL: 182,
+    PAY_FREQ_ANNUAL: 365,
+}
+
+
+class PaydayWindow(NamedTuple):
+    """The last payday and the upcoming paydays, calculated together.
+
+    `valid_until` is the first date on which the result may change; until
+    then it can be reused as is. `bank_days` are the bank days from the day
+    of the calculation up to the next payday, so the bank days left can be
+    counted on any day until then without the bank calendar.
+    """
+
+    last: date | None
+    upcoming: list[date]
+    valid_until: date
+    bank_days: tuple[date, ...] = ()
+
+    @property
+    def next(self) -> date | None:
+        """Return the next payday (first of the upcoming paydays)."""
+        return self.upcoming[0] if self.upcoming else None
+
+
+def _to_int(value, default: int) -> int:
+    """Convert a numeric setting that may have been stored as a string."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_dates(values: Iterable) -> frozenset[date]:
+    """Convert dates or ISO date strings to a frozenset of dates."""
+    return frozenset(
+        date.fromisoformat(value) if isinstance(value, str) else value
+        for value in values
     )
+
+
+class _Rules(NamedTuple):
+    """The payday generators for one pay frequency."""
+
+    forward: Callable[["PaydaySchedule", date, BankCalendar], Iterator[date]]
+    backward: Callable[["PaydaySchedule", date, BankCalendar], Iterator[date]]
+
+
+@dataclass(frozen=True, slots=True)
+class PaydaySchedule:
+    """The validated settings of one payday schedule.
+
+    Built once per config entry with `from_config` and passed to the
+    calculation functions in place of the raw settings. Numeric settings
+    stored as strings by older versions are normalized, `last_pay_date` is
+    parsed to a date and the rules for the pay frequency are looked up
+    once. Schedules are immutable and hashable, so they can serve as cache
+    keys.
+
+    `closed_days` and `open_days` are extra bank closing days (or days
+    forced open) on top of the region's holidays, as ISO strings or dates.
+    """
+
+    country: str
+    pay_frequency: str
+    pay_day: int | str | None = None
+    last_pay_date: date | None = None
+    weekday: int | None = None
+    bank_offset: int = 0
+    subdiv: str | None = None
+    bank_day_number: int = 1
+    closed_days: frozenset[date] = frozenset()
+    open_days: frozenset[date] = frozenset()
+    _rules: _Rules = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.pay_day, str) and self.pay_day.isdigit():
+            object.__setattr__(self, "pay_day", int(self.pay_day))
+        if isinstance(self.last_pay_date, str):
+            object.__setattr__(
+                self,
+                "last_pay_date",
+                date.fromisoformat(self.last_pay_date) if self.last_pay_date else None,
+            )
+        object.__setattr__(self, "bank_offset", _to_int(self.bank_offset, 0))
+        object.__setattr__(
+            self, "bank_day_number", max(1, _to_int(self.bank_day_number, 1))
+        )
+        object.__setattr__(self, "closed_days", _to_dates(self.closed_days))
+        object.__setattr__(self, "open_days", _to_dates(self.open_days))
+        object.__setattr__(
+            self, "_rules", _RULES.get(self.pay_frequency, _INVALID_FREQUENCY)
+        )
+
+    @classmethod
+    def from_config(cls, config: Mapping) -> "PaydaySchedule":
+        """Build a schedule from the settings of a config entry."""
+        return cls(
+            config[CONF_COUNTRY],
+            config[CONF_PAY_FREQ],
+            config.get(CONF_PAY_DAY),
+            config.get(CONF_LAST_PAY_DATE),
+            config.get(CONF_WEEKDAY),
+            config.get(CONF_BANK_OFFSET, 0),
+            config.get(CONF_SUBDIV),
+            config.get(CONF_BANK_DAY_NUMBER, 1),
+            config.get(CONF_CLOSED_DAYS) or (),
+            config.get(CONF_OPEN_DAYS) or (),
+        )
+
+    @property
+    def bank_calendar(self) -> BankCalendar:
+        """Return the shared bank calendar of the schedule's region.
+
+        Schedules with the same region and closure days share a calendar.
+        """
+        return get_bank_calendar(
+            self.country, self.subdiv, self.closed_days, self.open_days
+        )
+
+    def forward(self, start: date, bank_calendar: BankCalendar) -> Iterator[date]:
+        """Yield the adjusted paydays on or after `start` in ascending order.
+
+        Paydays are adjusted as seen from `start`: one that would move
+        before `start` moves forwards instead. Two scheduled dates can
+        adjust to the same payday, so the same date may be yielded twice in
+        a row.
+        """
+        return self._rules.forward(self, start, bank_calendar)
+
+    def backward(self, start: date, bank_calendar: BankCalendar) -> Iterator[date]:
+        """Yield the adjusted paydays on or before `start` in descending order.
+
+        Interval schedules stop at their anchor date (the last payday the
+        user entered). The same date may be yielded twice in a row.
+        """
+        return self._rules.backward(self, start, bank_calendar)
+
+
+def calculate_next_payday(schedule: PaydaySchedule) -> date | None:
+    """Calculate the next payday date (first of the upcoming paydays)."""
+    paydays = calculate_upcoming_paydays(schedule, count=1)
     return paydays[0] if paydays else None
 
 
-def calculate_last_payday(
-    country: str,
-    pay_frequency: str,
-    pay_day=None,
-    last_pay_date=None,
-    weekday=None,
-    bank_offset: int = 0,
-    subdiv: str | None = None,
-) -> date | None:
+def calculate_payday_window(
+    schedule: PaydaySchedule, count: int = 12, today: date | None = None
+) -> PaydayWindow:
+    """Calculate the last payday and the next `count` paydays in one pass.
+
+    A single bank calendar covering the previous year up to two years
+    ahead serves both directions, so a coordinator refresh needs only one
+    executor job.
+
+    The calendar grows one year at a time: after New Year only the new
+    last year is compiled, and years before the previous one are dropped.
+    `today` defaults to the system date; the integration passes the date
+    in Home Assistant's time zone.
+    """
+    count = max(1, min(count, 24))
+
+    today = today or date.today()
+    bank_calendar = schedule.bank_calendar
+    bank_calendar.ensure_years(window_years(today))
+    bank_calendar.discard_years_before(today.year - 1)
+
+    upcoming = _upcoming_paydays(schedule, count, today, bank_calendar)
+    last = _last_payday(schedule, today, bank_calendar)
+    valid_until = _valid_until(schedule, upcoming, today)
+    _LOGGER.debug(
+        "Payday window calculated: last %s, upcoming %s, valid until %s",
+        last,
+        upcoming,
+        valid_until,
+    )
+    return PaydayWindow(
+        last, upcoming, valid_until, _bank_days_until(upcoming, today, bank_calendar)
+    )
+
+
+def _bank_days_until(
+    upcoming: list[date], today: date, bank_calendar: BankCalendar
+) -> tuple[date, ...]:
+    """Return the bank days from today up to the next payday."""
+    if not upcoming:
+        return ()
+    return tuple(bank_calendar.bank_days_between(today, upcoming[0]))
+
+
+def window_years(today: date) -> range:
+    """Return the years of bank days `calculate_payday_window` needs today."""
+    return range(today.year - 1, today.year + 3)
+
+
+# How far a payday can move from its scheduled date because of closed days.
+_ROLL_MARGIN = timedelta(days=31)
+
+
+def closure_days_affect(
+    changed: Iterable[date],
+    paydays: Iterable[date | None],
+    today: date | None = None,
+) -> bool:
+    """Return True if changing these closure days may change the window.
+
+    A payday only depends on the bank days between its scheduled date and
+    the day it is moved to, so a changed date more than `_ROLL_MARGIN` away
+    from every payday cannot move any of them. A changed date from today up
+    to the next payday still changes the bank days counted until it.
+    """
+    today = today or date.today()
+    changed = list(changed)
+    paydays = [payday for payday in paydays if payday is not None]
+    if not paydays:
+        return True
+    upcoming = [payday for payday in paydays if payday >= today]
+    if upcoming and any(today <= d <= min(upcoming) for d in changed):
+        return True
+    return any(_near(payday, changed) for payday in paydays)
+
+
+def _near(payday: date, changed: Iterable[date]) -> bool:
+    """Return True if a changed date is within `_ROLL_MARGIN` of the payday."""
+    return any(abs(d - payday) <= _ROLL_MARGIN for d in changed)
+
+
+def update_payday_window(
+    schedule: PaydaySchedule,
+    window: PaydayWindow,
+    changed: Iterable[date],
+    count: int = 12,
+    today: date | None = None,
+) -> PaydayWindow:
+    """Return a window still valid today with the closure days changed.
+
+    `window` was calculated before `changed` (dates closed or opened) were
+    applied to `schedule`. Only the paydays within `_ROLL_MARGIN` of a
+    changed date are calculated again, from a stream started shortly
+    before the changed date; the others are kept. If the last upcoming
+    payday is affected, or the number of paydays changes, the whole
+    window is calculated again instead.
+    """
+    today = today or date.today()
+    changed = sorted(changed)
+    upcoming = window.upcoming
+    if not upcoming or _near(upcoming[-1], changed):
+        return calculate_payday_window(schedule, count, today)
+
+    bank_calendar = schedule.bank_calendar
+    bank_calendar.ensure_years(window_years(today))
+    paydays = {payday for payday in upcoming if not _near(payday, changed)}
+    for d in changed:
+        if not today - _ROLL_MARGIN <= d <= upcoming[-1] + _ROLL_MARGIN:
+            continue
+        # Paydays more than a margin after the start are adjusted as they
+        # would be from today.
+        start = max(today, d - 2 * _ROLL_MARGIN)
+        for payday in _unique(schedule.forward(start, bank_calendar)):
+            if payday > min(d + _ROLL_MARGIN, upcoming[-1]):
+                break
+            if abs(d - payday) <= _ROLL_MARGIN:
+                paydays.add(payday)
+    if len(paydays) != len(upcoming):
+        return calculate_payday_window(schedule, count, today)
+
+    upcoming = sorted(paydays)
+    last = window.last
+    # A payday moved before today becomes the last payday.
+    if last is not None and _near(last, changed) or _near(upcoming[0], changed):
+        last = _last_payday(schedule, today, bank_calendar)
+    return PaydayWindow(
+        last,
+        upcoming,
+        _valid_until(schedule, upcoming, today),
+        _bank_days_until(upcoming, today, bank_calendar),
+    )
+
+
+def _valid_until(schedule: PaydaySchedule, upcoming: list[date], today: date) -> date:
+    """Return the first date on which a window calculated today may change.
+
+    The upcoming paydays change the day after the next payday. For monthly
+    schedules the last payday changes on the next payday. For the other
+    frequencies both depend on the unadjusted scheduled date instead: the
+    last payday changes when it is reached, and a payday moved forward past
+    it is dropped the day after.
+    """
+    if not upcoming:
+        return today + timedelta(days=1)
+    valid_until = upcoming[0] + timedelta(days=1)
+
+    if schedule.pay_frequency == PAY_FREQ_MONTHLY:
+        later = [d for d in upcoming if d > today]
+        return min(valid_until, later[0]) if later else valid_until
+
+    yesterday = today - timedelta(days=1)
+    anchor = schedule.last_pay_date
+    if schedule.pay_frequency == PAY_FREQ_BIMONTHLY:
+        step = max(0, _bimonthly_seek(anchor, yesterday) + 1)
+        scheduled = _bimonthly_step(anchor, step)
+    elif schedule.pay_frequency in _INTERVAL_DAYS:
+        interval = _INTERVAL_DAYS[schedule.pay_frequency]
+        step = max(0, _interval_seek(anchor, yesterday, interval) + 1)
+        scheduled = anchor + timedelta(days=step * interval)
+    else:
+        weekday = schedule.weekday
+        scheduled = today + timedelta(days=(weekday - today.weekday()) % 7)
+
+    return min(valid_until, max(scheduled, today + timedelta(days=1)))
+
+
+def calculate_last_payday(schedule: PaydaySchedule) -> date | None:
     """Calculate the most recent payday on or before today.
 
     Returns None if no past payday can be determined (for example when an
     interval-based frequency has a last_pay_date in the future).
     """
-    # Defensive normalization (mirrors calculate_upcoming_paydays).
-    if isinstance(pay_day, str) and pay_day.isdigit():
-        pay_day = int(pay_day)
-    try:
-        bank_offset = int(bank_offset)
-    except (TypeError, ValueError):
-        bank_offset = 0
-
     today = date.today()
-    bank_holidays = get_bank_holidays(
-        country, [today.year - 1, today.year, today.year + 1], subdiv
-    )
+    bank_calendar = schedule.bank_calendar
+    bank_calendar.ensure_years([today.year - 1, today.year, today.year + 1])
 
-    if pay_frequency == PAY_FREQ_MONTHLY:
-        year, month = today.year, today.month
-        for _ in range(24):
-            payday = _payday_for_month(year, month, pay_day, bank_offset, bank_holidays)
-            if payday is not None and payday <= today:
-                return payday
-            month -= 1
-            if month == 0:
-                month = 12
-                year -= 1
-        return None
+    return _last_payday(schedule, today, bank_calendar)
 
-    if pay_frequency == PAY_FREQ_BIMONTHLY:
-        if not last_pay_date:
-            return None
-        anchor = date.fromisoformat(last_pay_date)
-        prev = None
-        cursor = anchor
-        # Walk forward in 2-month steps, tracking the last value <= today.
-        guard = 0
-        while cursor <= today and guard < 600:
-            prev = cursor
-            cursor = _add_months(cursor, 2)
-            guard += 1
-        if prev is None:
-            return None
-        return _adjust_to_previous_bank_day(prev, bank_holidays)
-
-    if pay_frequency in (
-        PAY_FREQ_28_DAYS,
-        PAY_FREQ_14_DAYS,
-        PAY_FREQ_QUARTERLY,
-        PAY_FREQ_SEMIANNUAL,
-        PAY_FREQ_ANNUAL,
-    ):
-        interval = {
-            PAY_FREQ_14_DAYS: 14,
-            PAY_FREQ_28_DAYS: 28,
-            PAY_FREQ_QUARTERLY: 91,
-            PAY_FREQ_SEMIANNUAL: 182,
-            PAY_FREQ_ANNUAL: 365,
-        }[pay_frequency]
-        if not last_pay_date:
-            return None
-        cursor = date.fromisoformat(last_pay_date)
-        if cursor > today:
-            return None
-        prev = cursor
-        while cursor <= today:
-            prev = cursor
-            cursor += timedelta(days=interval)
-        return _adjust_to_previous_bank_day(prev, bank_holidays)
-
-    if pay_frequency == PAY_FREQ_WEEKLY:
-        if weekday is None:
-            return None
-        days_behind = (today.weekday() - weekday) % 7
-        candidate = today - timedelta(days=days_behind)
-        return _adjust_to_previous_bank_day(candidate, bank_holidays)
-
-    _LOGGER.error("Invalid payday frequency: %s", pay_frequency)
-    return None
 
+def _last_payday(
+    schedule: PaydaySchedule, today: date, bank_calendar: BankCalendar
+) -> date | None:
+    """Return the most recent payday on or before today."""
+    return next(schedule.backward(today, bank_calendar), None)
 
-def calculate_upcoming_paydays(
-    country: str,
-    pay_frequency: str,
-    pay_day=None,
-    last_pay_date=None,
-    weekday=None,
-    bank_offset: int = 0,
-    subdiv: str | None = None,
-    count: int = 12,
-) -> list[date]:
+
+def calculate_upcoming_paydays(schedule: PaydaySchedule, count: int = 12) -> list[date]:
     """Calculate the upcoming paydays, adjusted for weekends and holidays.
 
     Returns a sorted, de-duplicated list of at most `count` dates, all of
@@ -305,164 +1330,274 @@ def calculate_upcoming_paydays(
     """
     count = max(1, min(count, 24))
 
-    # Defensive normalization: older config entries may provide numeric
-    # settings as strings (e.g. pay_day='31', bank_offset='2').
-    if isinstance(pay_day, str) and pay_day.isdigit():
-        pay_day = int(pay_day)
-    try:
-        bank_offset = int(bank_offset)
-    except (TypeError, ValueError):
-        bank_offset = 0
-
     _LOGGER.debug(
         "Calculating %s upcoming paydays for %s with frequency: %s",
         count,
-        country,
-        pay_frequency,
+        schedule.country,
+        schedule.pay_frequency,
     )
 
     today = date.today()
-    bank_holidays = get_bank_holidays(
-        country, [today.year, today.year + 1, today.year + 2], subdiv
-    )
-
-    raw: list[date] = []
-
-    if pay_frequency == PAY_FREQ_MONTHLY:
-        year, month = today.year, today.month
-        for _ in range(count + 12):
-            payday = _payday_for_month(year, month, pay_day, bank_offset, bank_holidays)
-            if (
-                payday is None
-                and not isinstance(pay_day, int)
-                and pay_day
-                not in (
-                    PAY_DAY_LAST_BANK_DAY,
-                    PAY_DAY_FIRST_BANK_DAY,
-                )
-            ):
-                _LOGGER.error("Invalid payday value: %s", pay_day)
-                return []
-            if payday is not None and payday >= today:
-                raw.append(payday)
-            if len(raw) >= count:
-                break
-            month += 1
-            year += (month - 1) // 12
-            month = (month - 1) % 12 + 1
-
-    elif pay_frequency == PAY_FREQ_BIMONTHLY:
-        if not last_pay_date:
-            _LOGGER.error("Missing last payday date for month-interval payout.")
-            return []
-        nxt = _add_months(date.fromisoformat(last_pay_date), 2)
-        while nxt < today:
-            nxt = _add_months(nxt, 2)
-        for _ in range(count):
-            raw.append(_adjust_not_before_today(nxt, today, bank_holidays))
-            nxt = _add_months(nxt, 2)
-
-    elif pay_frequency in (
-        PAY_FREQ_28_DAYS,
-        PAY_FREQ_14_DAYS,
-        PAY_FREQ_QUARTERLY,
-        PAY_FREQ_SEMIANNUAL,
-        PAY_FREQ_ANNUAL,
-    ):
-        interval = {
-            PAY_FREQ_14_DAYS: 14,
-            PAY_FREQ_28_DAYS: 28,
-            PAY_FREQ_QUARTERLY: 91,
-            PAY_FREQ_SEMIANNUAL: 182,
-            PAY_FREQ_ANNUAL: 365,
-        }[pay_frequency]
-        if not last_pay_date:
-            _LOGGER.error("Missing last payday date for recurring payout.")
-            return []
-        nxt = date.fromisoformat(last_pay_date) + timedelta(days=interval)
-        while nxt < today:
-            nxt += timedelta(days=interval)
-        for _ in range(count):
-            raw.append(_adjust_not_before_today(nxt, today, bank_holidays))
-            nxt += timedelta(days=interval)
-
-    elif pay_frequency == PAY_FREQ_WEEKLY:
-        if weekday is None:
-            raise ValueError("Weekday missing for weekly payday.")
-        days_ahead = (weekday - today.weekday()) % 7
-        nxt = today + timedelta(days=days_ahead)
-        for _ in range(count):
-            raw.append(_adjust_to_next_bank_day(nxt, bank_holidays))
-            nxt += timedelta(days=7)
-
-    else:
-        _LOGGER.error("Invalid payday frequency: %s", pay_frequency)
-        return []
+    bank_calendar = schedule.bank_calendar
+    bank_calendar.ensure_years([today.year, today.year + 1, today.year + 2])
 
-    paydays = sorted(set(d for d in raw if d >= today))[:count]
+    paydays = _upcoming_paydays(schedule, count, today, bank_calendar)
     _LOGGER.debug("Upcoming paydays calculated: %s", paydays)
     return paydays
 
 
+def _upcoming_paydays(
+    schedule: PaydaySchedule, count: int, today: date, bank_calendar: BankCalendar
+) -> list[date]:
+    """Return up to `count` paydays on or after today."""
+    return list(islice(_unique(schedule.forward(today, bank_calendar)), count))
+
+
+def iter_paydays(
+    schedule: PaydaySchedule,
+    start: date,
+    end: date | None = None,
+    reverse: bool = False,
+) -> Iterator[date]:
+    """Yield the paydays of a schedule one at a time, starting at `start`.
+
+    Going forwards, the paydays on or after `start` are yielded as
+    `calculate_upcoming_paydays` would return them if `start` were today.
+    With `reverse=True`, the paydays on or before `start` are yielded
+    newest first, as `calculate_last_payday` would return them.
+
+    Iteration stops before reaching `end`, or runs until the schedule or
+    the supported date range is exhausted. Bank holidays are compiled one
+    year at a time as the iteration reaches them.
+    """
+    bank_calendar = schedule.bank_calendar
+
+    if reverse:
+        end = end or date(MINYEAR + 1, 1, 1)
+        for payday in _unique(schedule.backward(start, bank_calendar)):
+            if payday <= end:
+                return
+            yield payday
+    else:
+        end = end or date(MAXYEAR - 1, 1, 1)
+        for payday in _unique(schedule.forward(start, bank_calendar)):
+            if payday >= end:
+                return
+            yield payday
+
+
+def _unique(paydays: Iterable[date]) -> Iterator[date]:
+    """Skip repeated paydays in an ordered stream."""
+    previous = None
+    for payday in paydays:
+        if payday != previous:
+            previous = payday
+            yield payday
+
+
+def _forward_monthly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Monthly paydays on or after start."""
+    pay_day = schedule.pay_day
+    if not isinstance(pay_day, int) and pay_day not in _MONTHLY_PAY_DAYS:
+        _LOGGER.error("Invalid payday value: %s", pay_day)
+        return
+    year, month = start.year, start.month
+    empty = 0
+    while empty < _MAX_EMPTY_MONTHS:
+        payday = _payday_for_month(
+            year,
+            month,
+            pay_day,
+            schedule.bank_offset,
+            bank_calendar,
+            schedule.bank_day_number,
+        )
+        if payday is not None and payday >= start:
+            empty = 0
+            yield payday
+        else:
+            empty += 1
+        month += 1
+        year += (month - 1) // 12
+        month = (month - 1) % 12 + 1
+
+
+def _backward_monthly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Monthly paydays on or before start."""
+    year, month = start.year, start.month
+    empty = 0
+    while empty < _MAX_EMPTY_MONTHS:
+        payday = _payday_for_month(
+            year,
+            month,
+            schedule.pay_day,
+            schedule.bank_offset,
+            bank_calendar,
+            schedule.bank_day_number,
+        )
+        if payday is not None and payday <= start:
+            empty = 0
+            yield payday
+        else:
+            empty += 1
+        month -= 1
+        if month == 0:
+            month = 12
+            year -= 1
+
+
+def _forward_bimonthly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Paydays every two months from the anchor, on or after start."""
+    anchor = schedule.last_pay_date
+    if not anchor:
+        _LOGGER.error("Missing last payday date for month-interval payout.")
+        return
+    # Jump straight to the first step on or after start (at least one step
+    # after the anchor), however old the anchor is.
+    first = max(1, _bimonthly_seek(anchor, start - timedelta(days=1)) + 1)
+    nxt = _bimonthly_step(anchor, first)
+    while True:
+        yield _adjust_not_before_today(nxt, start, bank_calendar)
+        nxt = _add_months(nxt, 2)
+
+
+def _backward_bimonthly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Paydays every two months back to the anchor, on or before start."""
+    anchor = schedule.last_pay_date
+    if not anchor:
+        return
+    for step in range(_bimonthly_seek(anchor, start), -1, -1):
+        yield bank_calendar.previous_bank_day(_bimonthly_step(anchor, step))
+
+
+def _forward_interval(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Paydays every fixed number of days from the anchor, on or after start."""
+    anchor = schedule.last_pay_date
+    if not anchor:
+        _LOGGER.error("Missing last payday date for recurring payout.")
+        return
+    interval = _INTERVAL_DAYS[schedule.pay_frequency]
+    first = max(1, _interval_seek(anchor, start - timedelta(days=1), interval) + 1)
+    nxt = anchor + timedelta(days=first * interval)
+    while True:
+        yield _adjust_not_before_today(nxt, start, bank_calendar)
+        nxt += timedelta(days=interval)
+
+
+def _backward_interval(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Paydays every fixed number of days back to the anchor, on or before start."""
+    anchor = schedule.last_pay_date
+    if not anchor:
+        return
+    interval = _INTERVAL_DAYS[schedule.pay_frequency]
+    for step in range(_interval_seek(anchor, start, interval), -1, -1):
+        yield bank_calendar.previous_bank_day(anchor + timedelta(days=step * interval))
+
+
+def _forward_weekly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Weekly paydays on or after start."""
+    weekday = schedule.weekday
+    if weekday is None:
+        raise ValueError("Weekday missing for weekly payday.")
+    nxt = start + timedelta(days=(weekday - start.weekday()) % 7)
+    while True:
+        yield bank_calendar.next_bank_day(nxt)
+        nxt += timedelta(days=7)
+
+
+def _backward_weekly(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Weekly paydays on or before start."""
+    weekday = schedule.weekday
+    if weekday is None:
+        return
+    candidate = start - timedelta(days=(start.weekday() - weekday) % 7)
+    while True:
+        yield bank_calendar.previous_bank_day(candidate)
+        candidate -= timedelta(days=7)
+
+
+def _invalid_frequency(
+    schedule: PaydaySchedule, start: date, bank_calendar: BankCalendar
+) -> Iterator[date]:
+    """Log an unknown pay frequency and yield nothing."""
+    _LOGGER.error("Invalid payday frequency: %s", schedule.pay_frequency)
+    return iter(())
+
+
+_RULES = {
+    PAY_FREQ_MONTHLY: _Rules(_forward_monthly, _backward_monthly),
+    PAY_FREQ_BIMONTHLY: _Rules(_forward_bimonthly, _backward_bimonthly),
+    PAY_FREQ_WEEKLY: _Rules(_forward_weekly, _backward_weekly),
+    **{
+        frequency: _Rules(_forward_interval, _backward_interval)
+        for frequency in _INTERVAL_DAYS
+    },
+}
+_INVALID_FREQUENCY = _Rules(_invalid_frequency, _invalid_frequency)
+
+
 def _payday_for_month(
     year: int,
     month: int,
     pay_day,
     bank_offset: int,
-    bank_holidays,
+    bank_calendar: BankCalendar,
+    bank_day_number: int = 1,
 ) -> date | None:
     """Return the payday for a specific month, fully adjusted, or None."""
     if pay_day == PAY_DAY_LAST_BANK_DAY:
-        return _find_last_bank_day(year, month, bank_holidays, bank_offset)
+        return _find_last_bank_day(year, month, bank_calendar, bank_offset)
     if pay_day == PAY_DAY_FIRST_BANK_DAY:
-        return _find_first_bank_day(year, month, bank_holidays)
+        return bank_calendar.nth_bank_day(year, month, 1)
+    if pay_day == PAY_DAY_NTH_BANK_DAY:
+        return bank_calendar.nth_bank_day(year, month, max(1, bank_day_number))
+    if pay_day == PAY_DAY_NTH_LAST_BANK_DAY:
+        return bank_calendar.nth_bank_day(year, month, -max(1, bank_day_number))
     if isinstance(pay_day, int):
-        return _find_specific_day(year, month, pay_day, bank_holidays)
+        return _find_specific_day(year, month, pay_day, bank_calendar)
     return None
 
 
 def _find_last_bank_day(
-    year: int, month: int, bank_holidays, bank_offset: int
+    year: int, month: int, bank_calendar: BankCalendar, bank_offset: int
 ) -> date | None:
     """Find the last bank day of the month, then apply bank_offset.
 
     After applying bank_offset, the result is re-validated as a bank day.
     """
-    day = 31
-    while day > 0:
-        try:
-            candidate = date(year, month, day)
-            if _is_bank_day(candidate, bank_holidays):
-                result = candidate - timedelta(days=bank_offset)
-                return _adjust_to_previous_bank_day(result, bank_holidays)
-            day -= 1
-        except ValueError:
-            day -= 1
-    return None
-
+    last = bank_calendar.nth_bank_day(year, month, -1)
+    if last is None:
+        return None
+    return bank_calendar.previous_bank_day(last - timedelta(days=bank_offset))
 
-def _find_first_bank_day(year: int, month: int, bank_holidays) -> date | None:
-    """Find the first bank day of the month."""
-    day = 1
-    while day <= 31:
-        try:
-            candidate = date(year, month, day)
-            if _is_bank_day(candidate, bank_holidays):
-                return candidate
-            day += 1
-        except ValueError:
-            break
-    return None
 
+def _find_specific_day(
+    year: int, month: int, day: int, bank_calendar: BankCalendar
+) -> date | None:
+    """Find a specific day of the month, adjusting backwards if not a bank day.
 
-def _find_specific_day(year: int, month: int, day: int, bank_holidays) -> date | None:
-    """Find a specific day of the month, adjusting backwards if not a bank day."""
-    while day > 0:
-        try:
-            candidate = date(year, month, day)
-            if _is_bank_day(candidate, bank_holidays):
-                return candidate
-            day -= 1
-        except ValueError:
-            day -= 1
-    return None
+    Days past the end of the month are clamped to the last day of the month.
+    """
+    if day < 1:
+        return None
+    day = min(day, monthrange(year, month)[1])
+    candidate = bank_calendar.previous_bank_day(date(year, month, day))
+    if candidate.month != month:
+        return None
+    return candidate
@@ -1,4 +1,5 @@
 import logging
+from bisect import bisect_left
 from datetime import date
 
 from homeassistant.components.sensor import (
@@ -10,12 +11,14 @@ from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_CONFIG_URL,
     CONF_MANUFACTURER,
     CONF_MODEL,
     DOMAIN,
+    ICON_BANK_DAYS_TO,
     ICON_DAYS_TO,
     ICON_LAST_PAYDAY,
     ICON_NEXT_PAYDAY,
@@ -33,6 +36,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         [
             IsItPaydayNextSensor(coordinator, entry.entry_id, instance_name),
             IsItPaydayDaysToSensor(coordinator, entry.entry_id, instance_name),
+            IsItPaydayBankDaysToSensor(coordinator, entry.entry_id, instance_name),
             IsItPaydayLastSensor(coordinator, entry.entry_id, instance_name),
         ]
     )
@@ -62,7 +66,7 @@ class IsItPaydayNextSensor(CoordinatorEntity, SensorEntity):
         if not payday:
             return "Unknown"
 
-        today = date.today()
+        today = dt_util.now().date()
 
         if not isinstance(payday, date):
             try:
@@ -83,7 +87,7 @@ class IsItPaydayNextSensor(CoordinatorEntity, SensorEntity):
         months with e.g. three biweekly payouts.
         """
         upcoming = self.coordinator.data.get("paydays_upcoming") or []
-        today = date.today()
+        today = dt_util.now().date()
 
         upcoming_dates = [d for d in upcoming if isinstance(d, date)]
         this_month = [
@@ -137,7 +141,7 @@ class IsItPaydayDaysToSensor(CoordinatorEntity, SensorEntity):
             if isinstance(payday, str):
                 payday = date.fromisoformat(payday)
 
-            today = date.today()
+            today = dt_util.now().date()
             if payday <= today:
                 return 0
 
@@ -157,6 +161,62 @@ class IsItPaydayDaysToSensor(CoordinatorEntity, SensorEntity):
         }
 
 
+class IsItPaydayBankDaysToSensor(CoordinatorEntity, SensorEntity):
+    """Sensor showing the number of bank days until the next payday.
+
+    Counts the bank days from today up to, but not including, the payday,
+    so it is 0 on payday and, like "Days until", 1 on the bank day before.
+    """
+
+    _attr_native_unit_of_measurement = "bank days"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        entry_id: str,
+        instance_name: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_bank_days_to"
+        self._attr_name = f"{instance_name}: Bank days until"
+        self._attr_icon = ICON_BANK_DAYS_TO
+        self._instance_name = instance_name
+        self._entry_id = entry_id
+
+    @property
+    def native_value(self) -> int | None:
+        payday = self.coordinator.data.get("payday_next")
+        bank_days = self.coordinator.data.get("bank_days_next")
+        if not payday or bank_days is None:
+            return None
+
+        try:
+            if isinstance(payday, str):
+                payday = date.fromisoformat(payday)
+
+            today = dt_util.now().date()
+            if payday <= today:
+                return 0
+
+            # The refresh listed the bank days up to the payday, starting on
+            # the day it calculated them; count those left from today.
+            return len(bank_days) - bisect_left(bank_days, today)
+        except Exception as e:
+            _LOGGER.exception("Error calculating bank days to payday: %s", e)
+            return None
+
+    @property
+    def device_info(self) -> dict:
+        return {
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": self._instance_name,
+            "manufacturer": CONF_MANUFACTURER,
+            "model": CONF_MODEL,
+            "configuration_url": CONF_CONFIG_URL,
+        }
+
+
 class IsItPaydayLastSensor(CoordinatorEntity, SensorEntity):
     """Sensor showing the most recent payday on or before today."""
 
@@ -0,0 +1,115 @@
+"""Regions and payday windows shared by the config entries.
+
+Households often add one entry per person or income stream, mostly in the
+same region and often with the same schedule. The compiled bank calendars
+are already shared through the calculator's process-wide cache; this
+module tracks which entries use them, so a region's holiday tables and
+overlay calendars are dropped once its last entry is unloaded (its compiled
+calendar is kept a while for a reload), and lets entries with
+identical schedules share one calculated payday window and the December
+prefetch of their region's next year.
+"""
+
+from collections import Counter
+from datetime import date
+
+from .payday_calculator import (
+    PaydaySchedule,
+    PaydayWindow,
+    release_bank_calendars,
+    release_overlay_calendar,
+)
+
+
+class SharedSchedules:
+    """Reference-counted regions and schedules of the loaded entries.
+
+    Entries acquire their schedule when they are set up and release it
+    when they are unloaded. Payday windows are kept per schedule: the first
+    entry to refresh calculates the window, the others reuse it until it
+    expires. Only used from the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._regions: Counter[tuple[str, str | None]] = Counter()
+        self._overlays: Counter[tuple] = Counter()
+        self._schedules: Counter[PaydaySchedule] = Counter()
+        self._windows: dict[PaydaySchedule, tuple[date, PaydayWindow]] = {}
+        self._prefetched: set[tuple[str, str | None, int]] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, schedule: PaydaySchedule) -> None:
+        """Register an entry using the schedule."""
+        self._regions[(schedule.country, schedule.subdiv)] += 1
+        self._schedules[schedule] += 1
+        if schedule.closed_days or schedule.open_days:
+            self._overlays[_overlay_key(schedule)] += 1
+
+    def release(self, schedule: PaydaySchedule) -> None:
+        """Unregister an entry; drop what no entry uses anymore."""
+        self._schedules[schedule] -= 1
+        if self._schedules[schedule] <= 0:
+            del self._schedules[schedule]
+            self._windows.pop(schedule, None)
+
+        if schedule.closed_days or schedule.open_days:
+            # Changing an entry's closure days replaces its schedule without
+            # releasing the region, so drop the old overlay here.
+            overlay = _overlay_key(schedule)
+            self._overlays[overlay] -= 1
+            if self._overlays[overlay] <= 0:
+                del self._overlays[overlay]
+                release_overlay_calendar(*overlay)
+
+        region = (schedule.country, schedule.subdiv)
+        self._regions[region] -= 1
+        if self._regions[region] <= 0:
+            del self._regions[region]
+            self._prefetched = {key for key in self._prefetched if key[:2] != region}
+            release_bank_calendars(*region)
+
+    def get_window(self, schedule: PaydaySchedule, today: date) -> PaydayWindow | None:
+        """Return the schedule's window if one is still valid today."""
+        cached = self._windows.get(schedule)
+        if cached is not None:
+            calculated_on, window = cached
+            if calculated_on <= today < window.valid_until:
+                self.hits += 1
+                return window
+        self.misses += 1
+        return None
+
+    def put_window(
+        self, schedule: PaydaySchedule, today: date, window: PaydayWindow
+    ) -> None:
+        """Share a window calculated today, if any entry uses the schedule."""
+        if window.upcoming and schedule in self._schedules:
+            self._windows[schedule] = (today, window)
+
+    def claim_prefetch(self, schedule: PaydaySchedule, year: int) -> bool:
+        """Return True if the schedule's region has not prefetched the year.
+
+        The first caller prefetches; later callers for the region get False.
+        """
+        key = (schedule.country, schedule.subdiv, year)
+        if key in self._prefetched:
+            return False
+        self._prefetched.add(key)
+        return True
+
+    def info(self) -> dict:
+        """Return the number of shared regions and schedules, and hit counts."""
+        return {
+            "entries": sum(self._schedules.values()),
+            "regions": len(self._regions),
+            "schedules": len(self._schedules),
+            "windows": len(self._windows),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _overlay_key(schedule: PaydaySchedule) -> tuple:
+    """Return the region and closure days that select the schedule's overlay."""
+    return (schedule.country, schedule.subdiv, schedule.closed_days, schedule.open_days)
@@ -0,0 +1,6 @@
+"""Helpers shared by the tests and the benchmarks.
+
+`home_assistant` is the virtual-clock Home Assistant stand-in and `git`
+records which commit a benchmark ran on. Neither is part of the
+integration; both import it from the source tree.
+"""
@@ -0,0 +1,483 @@
+"""A minimal Home Assistant stand-in driven by a virtual clock.
+
+Provides just enough of the `homeassistant` package for `__init__.py` to
+set up a config entry: an event bus, `async_track_point_in_time`, a
+`DataUpdateCoordinator` that refreshes on its interval, `Store` and the
+repair issue registry. Nothing waits for real time. `Simulation` pops
+timers in order, moves the clock to each one and runs it, so years of
+coordinator refreshes and payday events take seconds.
+
+`date.today()` in the integration and the calculator follow the clock,
+in the clock's time zone. The calculator calls and executor jobs spent
+are counted, so the cost per simulated day can be reported.
+"""
+
+import asyncio
+import heapq
+import itertools
+import sys
+import types
+from datetime import date, datetime, timedelta, timezone
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from typing import NamedTuple
+
+INTEGRATION = Path(__file__).resolve().parents[1] / "custom_components" / "isitpayday"
+
+
+class VirtualClock:
+    """The current time of the simulation, as an aware UTC datetime."""
+
+    def __init__(self, start: datetime, tz) -> None:
+        self.now = start.astimezone(timezone.utc)
+        self.tz = tz
+
+    def today(self) -> date:
+        return self.now.astimezone(self.tz).date()
+
+    def local(self) -> datetime:
+        return self.now.astimezone(self.tz)
+
+
+class _Timer:
+    __slots__ = ("action", "cancelled")
+
+    def __init__(self, action) -> None:
+        self.action = action
+        self.cancelled = False
+
+
+class FiredEvent(NamedTuple):
+    time: datetime
+    event_type: str
+    data: dict
+
+
+class FakeBus:
+    def __init__(self, clock: VirtualClock) -> None:
+        self._clock = clock
+        self.events: list[FiredEvent] = []
+        self._listeners: dict[str, list] = {}
+
+    def async_fire(self, event_type: str, event_data: dict | None = None) -> None:
+        event = FiredEvent(self._clock.now, event_type, event_data or {})
+        self.events.append(event)
+        for listener in self._listeners.pop(event_type, []):
+            listener(event)
+
+    def async_listen_once(self, event_type: str, listener):
+        listeners = self._listeners.setdefault(event_type, [])
+        listeners.append(listener)
+        return lambda: listener in listeners and listeners.remove(listener)
+
+
+class FakeConfigEntries:
+    def __init__(self) -> None:
+        self.reloads: list[str] = []
+
+    async def async_forward_entry_setups(self, entry, platforms) -> None:
+        return None
+
+    async def async_unload_platforms(self, entry, platforms) -> bool:
+        return True
+
+    async def async_reload(self, entry_id: str) -> None:
+        self.reloads.append(entry_id)
+
+
+class FakeHass:
+    """The parts of `HomeAssistant` the integration uses, on virtual time."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.data: dict = {}
+        self.bus = FakeBus(clock)
+        self.config_entries = FakeConfigEntries()
+        self.storage: dict = {}
+        self.issues: dict = {}
+        self.executor_jobs = 0
+        self._timers: list = []
+        self._cancelled = 0
+        self._sequence = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+    async def async_add_executor_job(self, target, *args):
+        # Jobs run inline: the simulation is about scheduling, not threads.
+        self.executor_jobs += 1
+        return target(*args)
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        task = asyncio.get_running_loop().create_task(target, name=name)
+        self._tasks.append(task)
+        return task
+
+    def async_create_background_task(self, target, name, eager_start=True):
+        return self.async_create_task(target, name)
+
+    def track_point_in_time(self, action, point_in_time: datetime):
+        """Run action(now) once the clock reaches point_in_time."""
+        timer = _Timer(action)
+        heapq.heappush(self._timers, (point_in_time, next(self._sequence), timer))
+
+        def cancel() -> None:
+            if not timer.cancelled:
+                timer.cancelled = True
+                self._cancelled += 1
+                # The integration reschedules its payday timer on every
+                # refresh; drop cancelled timers before they pile up.
+                if self._cancelled > 64 and self._cancelled * 2 > len(self._timers):
+                    self._timers = [t for t in self._timers if not t[2].cancelled]
+                    heapq.heapify(self._timers)
+                    self._cancelled = 0
+
+        return cancel
+
+    async def async_block_till_done(self) -> None:
+        while self._tasks:
+            tasks, self._tasks = self._tasks, []
+            await asyncio.gather(*tasks)
+
+    async def async_run_until(self, end: datetime) -> None:
+        """Run every timer due up to `end`, in order; leave the clock at end."""
+        await self.async_block_till_done()
+        while self._timers and self._timers[0][0] <= end:
+            when, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled:
+                self._cancelled -= 1
+                continue
+            self.clock.now = max(self.clock.now, when)
+            result = timer.action(self.clock.now)
+            if asyncio.iscoroutine(result):
+                await result
+            if self._tasks:
+                await self.async_block_till_done()
+        self.clock.now = max(self.clock.now, end)
+
+
+class FakeConfigEntry:
+    def __init__(self, entry_id: str, data: dict, options: dict | None = None):
+        self.entry_id = entry_id
+        self.data = data
+        self.options = options or {}
+        self._on_unload: list = []
+
+    def async_on_unload(self, func) -> None:
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        return hass.async_create_background_task(target, name)
+
+    def unload(self) -> None:
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def homeassistant_modules(
+    clock: VirtualClock,
+    update_interval: timedelta | None = None,
+    time_zone=None,
+) -> dict[str, types.ModuleType]:
+    """Return the stand-in `homeassistant` modules, keyed by module name.
+
+    `update_interval` replaces the refresh interval of every coordinator,
+    so long simulations can refresh less often than the integration asks.
+    `time_zone` is Home Assistant's time zone; by default the clock's, in
+    which `date.today()` is evaluated.
+    """
+    tz = time_zone or clock.tz
+
+    class ConfigEntryNotReady(Exception):
+        pass
+
+    class UpdateFailed(Exception):
+        pass
+
+    interval_override = update_interval
+
+    class DataUpdateCoordinator:
+        def __init__(
+            self, hass, logger, *, name, update_method, update_interval, **kwargs
+        ):
+            self.hass = hass
+            self.name = name
+            self.update_method = update_method
+            self.update_interval = interval_override or update_interval
+            self.data = None
+            self.last_update_success = True
+            self.refreshes = 0
+            self._listeners: dict = {}
+            self._unsub_refresh = None
+
+        def async_add_listener(self, update_callback, context=None):
+            key = object()
+            self._listeners[key] = update_callback
+            return lambda: self._listeners.pop(key, None)
+
+        def async_update_listeners(self) -> None:
+            for update_callback in list(self._listeners.values()):
+                update_callback()
+
+        async def async_config_entry_first_refresh(self) -> None:
+            await self._async_refresh()
+            if not self.last_update_success:
+                raise ConfigEntryNotReady(self.name)
+
+        async def async_refresh(self) -> None:
+            await self._async_refresh()
+
+        async def async_request_refresh(self) -> None:
+            # Home Assistant debounces requests; the first one runs at once.
+            await self._async_refresh()
+
+        async def _handle_refresh_interval(self, _now=None) -> None:
+            self._unsub_refresh = None
+            await self._async_refresh()
+
+        async def _async_refresh(self) -> None:
+            if self._unsub_refresh:
+                self._unsub_refresh()
+                self._unsub_refresh = None
+            self.refreshes += 1
+            try:
+                self.data = await self.update_method()
+                self.last_update_success = True
+            except UpdateFailed:
+                self.last_update_success = False
+            self._unsub_refresh = self.hass.track_point_in_time(
+                self._handle_refresh_interval, clock.now + self.update_interval
+            )
+            self.async_update_listeners()
+
+    class IssueSeverity:
+        ERROR = "error"
+        WARNING = "warning"
+
+    def async_create_issue(hass, domain, issue_id, **kwargs) -> None:
+        hass.issues[(domain, issue_id)] = kwargs
+
+    def async_delete_issue(hass, domain, issue_id) -> None:
+        hass.issues.pop((domain, issue_id), None)
+
+    class Store:
+        def __init__(self, hass, version, key, **kwargs) -> None:
+            self.hass = hass
+            self.key = key
+            self.saves = 0
+            self._unsub = None
+
+        async def async_load(self):
+            return self.hass.storage.get(self.key)
+
+        def async_delay_save(self, data_func, delay: float = 0) -> None:
+            if self._unsub:
+                self._unsub()
+
+            def save(_now) -> None:
+                self._unsub = None
+                self.saves += 1
+                self.hass.storage[self.key] = data_func()
+
+            self._unsub = self.hass.track_point_in_time(
+                save, clock.now + timedelta(seconds=delay)
+            )
+
+    def async_track_point_in_time(hass, action, point_in_time):
+        return hass.track_point_in_time(action, point_in_time)
+
+    def callback(func):
+        return func
+
+    def as_utc(value: datetime) -> datetime:
+        return value.astimezone(timezone.utc)
+
+    def start_of_local_day(value: date | datetime | None = None) -> datetime:
+        if value is None:
+            value = clock.now
+        if isinstance(value, datetime):
+            value = value.astimezone(tz).date()
+        return datetime.combine(value, datetime.min.time(), tzinfo=tz)
+
+    modules = {
+        "homeassistant": _module("homeassistant"),
+        "homeassistant.config_entries": _module(
+            "homeassistant.config_entries", ConfigEntry=FakeConfigEntry
+        ),
+        "homeassistant.const": _module(
+            "homeassistant.const", EVENT_HOMEASSISTANT_STOP="homeassistant_stop"
+        ),
+        "homeassistant.core": _module(
+            "homeassistant.core", HomeAssistant=FakeHass, callback=callback
+        ),
+        "homeassistant.exceptions": _module(
+            "homeassistant.exceptions", ConfigEntryNotReady=ConfigEntryNotReady
+        ),
+        "homeassistant.helpers": _module("homeassistant.helpers"),
+        "homeassistant.helpers.event": _module(
+            "homeassistant.helpers.event",
+            async_track_point_in_time=async_track_point_in_time,
+        ),
+        "homeassistant.helpers.issue_registry": _module(
+            "homeassistant.helpers.issue_registry",
+            IssueSeverity=IssueSeverity,
+            async_create_issue=async_create_issue,
+            async_delete_issue=async_delete_issue,
+        ),
+        "homeassistant.helpers.storage": _module(
+            "homeassistant.helpers.storage", Store=Store
+        ),
+        "homeassistant.helpers.typing": _module(
+            "homeassistant.helpers.typing", ConfigType=dict
+        ),
+        "homeassistant.helpers.update_coordinator": _module(
+            "homeassistant.helpers.update_coordinator",
+            DataUpdateCoordinator=DataUpdateCoordinator,
+            UpdateFailed=UpdateFailed,
+        ),
+        "homeassistant.util": _module("homeassistant.util"),
+        "homeassistant.util.dt": _module(
+            "homeassistant.util.dt",
+            DEFAULT_TIME_ZONE=tz,
+            now=lambda: clock.now.astimezone(tz),
+            utcnow=lambda: clock.now,
+            as_utc=as_utc,
+            start_of_local_day=start_of_local_day,
+        ),
+    }
+    modules["homeassistant.helpers"].issue_registry = modules[
+        "homeassistant.helpers.issue_registry"
+    ]
+    return modules
+
+
+def load_integration():
+    """Import the integration package from `__init__.py`.
+
+    The `homeassistant` stand-in must be installed in `sys.modules` first.
+    Submodules already imported (such as the calculator) are shared.
+    """
+    name = "custom_components.isitpayday"
+    spec = spec_from_file_location(
+        name, INTEGRATION / "__init__.py", submodule_search_locations=[str(INTEGRATION)]
+    )
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class SimulationReport(NamedTuple):
+    days: float
+    events: list[FiredEvent]
+    calculator_calls: int
+    executor_jobs: int
+    refreshes: int
+
+    @property
+    def calculator_calls_per_day(self) -> float:
+        return self.calculator_calls / self.days
+
+    @property
+    def executor_jobs_per_day(self) -> float:
+        return self.executor_jobs / self.days
+
+    @property
+    def refreshes_per_day(self) -> float:
+        return self.refreshes / self.days
+
+
+class Simulation:
+    """Config entries of the integration running on a virtual clock.
+
+    `integration` and `calculator` are the loaded modules; their
+    `date.today()` is pinned to the clock, and calls of the calculator
+    made by the integration are counted.
+    """
+
+    def __init__(self, integration, calculator, clock: VirtualClock) -> None:
+        self.integration = integration
+        self.clock = clock
+        self.hass = FakeHass(clock)
+        self.entries: list[FakeConfigEntry] = []
+        self.calculator_calls = 0
+        self._started = clock.now
+
+        class _DateType(type):
+            # Plain dates pass the integration's isinstance(value, date).
+            def __instancecheck__(cls, instance):
+                return isinstance(instance, date)
+
+        class _VirtualDate(date, metaclass=_DateType):
+            @classmethod
+            def today(cls):
+                return clock.today()
+
+        integration.date = _VirtualDate
+        calculator.date = _VirtualDate
+
+        for name in (
+            "calculate_payday_window",
+            "compile_bank_years",
+            "prefetch_bank_year",
+            "update_payday_window",
+        ):
+            setattr(integration, name, self._counted(getattr(integration, name)))
+
+    def _counted(self, func):
+        def counted(*args, **kwargs):
+            self.calculator_calls += 1
+            return func(*args, **kwargs)
+
+        return counted
+
+    async def async_setup(self) -> None:
+        await self.integration.async_setup(self.hass, {})
+
+    async def async_add_entry(self, data: dict, options: dict | None = None):
+        entry = FakeConfigEntry(f"entry{len(self.entries) + 1}", data, options)
+        self.entries.append(entry)
+        await self.integration.async_setup_entry(self.hass, entry)
+        return entry
+
+    async def async_unload_entry(self, entry: FakeConfigEntry) -> None:
+        await self.integration.async_unload_entry(self.hass, entry)
+        entry.unload()
+        self.entries.remove(entry)
+
+    async def async_run(self, duration: timedelta) -> None:
+        await self.hass.async_run_until(self.clock.now + duration)
+
+    def stop(self) -> None:
+        """Fire Home Assistant's stop event, which shuts down the pool."""
+        self.hass.bus.async_fire("homeassistant_stop")
+
+    @property
+    def executor_jobs(self) -> int:
+        """Jobs on Home Assistant's executor and on the integration's pool."""
+        executor = self.hass.data.get(self.integration.DOMAIN, {}).get("executor")
+        jobs = executor.info()["jobs"] if executor else 0
+        return self.hass.executor_jobs + jobs
+
+    def report(self) -> SimulationReport:
+        days = (self.clock.now - self._started) / timedelta(days=1)
+        refreshes = sum(
+            self.hass.data[self.integration.DOMAIN][entry.entry_id][
+                "coordinator"
+            ].refreshes
+            for entry in self.entries
+        )
+        return SimulationReport(
+            days or 1,
+            self.hass.bus.events,
+            self.calculator_calls,
+            self.executor_jobs,
+            refreshes,
+        )
@@ -3,15 +3,22 @@
 The real `holidays` package is mocked so the calculation logic can be
 tested in isolation without installing it. A small set of Danish and
 German holidays is provided to exercise weekend/holiday adjustment,
-the OPTIONAL category and regional (subdivision) holidays.
+the OPTIONAL category and regional (subdivision) holidays. Saudi Arabia
+("SA") has a Friday-Saturday weekend and no holidays. Like the real
+package, membership checks populate years that were not requested.
 """
 
+import os
 import sys
 import types
 from datetime import date
 
 import pytest
 
+# The helpers in `harness/`, shared with the benchmarks, are imported from
+# the top of the source tree.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
 # Fixed "today" so date-based tests are deterministic.
 FIXED_TODAY = date(2026, 6, 15)  # a Monday
 
@@ -23,28 +30,52 @@ def _build_holidays_mock():
     constants.BANK = "bank"
     constants.OPTIONAL = "optional"
 
+    subdivisions = {"DK": [], "DE": ["BY", "BE"], "US": ["CA", "NY"], "SA": []}
+
     class FakeHolidays(dict):
         supported_categories = ("public", "optional")
         subdivisions_aliases = {"Bavaria": "BY", "Berlin": "BE"}
+        weekend = {5, 6}
+
+        def __init__(self, country, subdiv, categories):
+            super().__init__()
+            self.country = country
+            self.subdiv = subdiv
+            self.categories = categories or ()
+            self.subdivisions = tuple(subdivisions.get(country, ()))
+            self.years = set()
+
+        def populate(self, y):
+            self.years.add(y)
+            if self.country == "SA":
+                return
+            self[date(y, 1, 1)] = "New Year"
+            self[date(y, 12, 25)] = "Christmas Day"
+            if "optional" in self.categories and self.country == "DK":
+                self[date(y, 12, 24)] = "Christmas Eve"
+                self[date(y, 12, 31)] = "New Year's Eve"
+                self[date(y, 6, 5)] = "Constitution Day"
+            if self.country == "DE" and self.subdiv == "BY":
+                self[date(y, 8, 15)] = "Assumption Day"
+
+        def __contains__(self, key):
+            # Like the real package, membership checks populate other years.
+            if isinstance(key, date) and key.year not in self.years:
+                self.populate(key.year)
+            return super().__contains__(key)
 
     def country_holidays(country, subdiv=None, years=None, categories=None):
         if country == "XX":
             raise NotImplementedError
-        h = FakeHolidays()
-        years = years or []
-        for y in years:
-            h[date(y, 1, 1)] = "New Year"
-            h[date(y, 12, 25)] = "Christmas Day"
-            if categories and "optional" in categories and country == "DK":
-                h[date(y, 12, 24)] = "Christmas Eve"
-                h[date(y, 12, 31)] = "New Year's Eve"
-                h[date(y, 6, 5)] = "Constitution Day"
-            if country == "DE" and subdiv == "BY":
-                h[date(y, 8, 15)] = "Assumption Day"
+        h = FakeHolidays(country, subdiv, categories)
+        if country == "SA":
+            h.weekend = {4, 5}
+        for y in years or []:
+            h.populate(y)
         return h
 
-    def list_supported_countries():
-        return {"DK": [], "DE": ["BY", "BE"], "US": ["CA", "NY"]}
+    def list_supported_countries(include_aliases=True):
+        return {country: list(codes) for country, codes in subdivisions.items()}
 
     mock.country_holidays = country_holidays
     mock.list_supported_countries = list_supported_countries
@@ -55,6 +86,7 @@ def _build_holidays_mock():
         "denmark": ("Denmark", "DK", "DNK"),
         "germany": ("Germany", "DE", "DEU"),
         "unitedstates": ("UnitedStates", "US", "USA"),
+        "saudiarabia": ("SaudiArabia", "SA", "SAU"),
     }
     mock.registry = registry
     return mock, constants, registry
@@ -83,6 +115,11 @@ def calc(mock_holidays, monkeypatch):
         "isitpayday",
     )
 
+    # Drop submodules cached by earlier tests so module-level state (such
+    # as caches) never leaks between tests.
+    for name in [n for n in sys.modules if n.startswith("custom_components.")]:
+        monkeypatch.delitem(sys.modules, name)
+
     pkg = types.ModuleType("custom_components")
     sys.modules.setdefault("custom_components", pkg)
     sub = types.ModuleType("custom_components.isitpayday")
@@ -101,6 +138,8 @@ def calc(mock_holidays, monkeypatch):
         os.path.join(base, "payday_calculator.py"),
     )
     module = importlib.util.module_from_spec(spec)
+    # Register before executing so sibling modules share this instance.
+    sys.modules["custom_components.isitpayday.payday_calculator"] = module
     spec.loader.exec_module(module)
 
     # Pin today for deterministic results.
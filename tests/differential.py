@@ -0,0 +1,224 @@
+"""Differential fuzz harness: optimized payday engines versus the reference.
+
+Random schedules (every frequency, pay days 1-31 and the bank-day rules,
+bank offsets 0-10, anchors far in the past and in the future) are
+evaluated on random simulated "today" dates by `reference_calculator` and
+by each optimized engine. Any difference in the upcoming paydays or the
+last payday is a mismatch. The time each engine spends is recorded per
+frequency, so the speedup over the reference can be reported.
+
+`test_differential.py` runs the harness against the mocked holidays
+package. Run this file directly to use the real package instead:
+
+    python tests/differential.py --cases 5000 --seed 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import types
+from collections import defaultdict
+from datetime import date, timedelta
+from importlib import import_module
+from typing import NamedTuple
+
+FREQUENCIES = (
+    "monthly",
+    "bimonthly",
+    "14_days",
+    "28_days",
+    "quarterly",
+    "semiannual",
+    "annual",
+    "weekly",
+)
+
+# Regions whose banks close on Saturday and Sunday, the only weekend the
+# reference knows.
+MOCK_REGIONS = (("DK", None), ("DE", "BY"), ("DE", None), ("US", "CA"))
+REAL_REGIONS = (("DK", None), ("DE", "BY"), ("US", "CA"), ("GB", None), ("SE", None))
+
+
+class Case(NamedTuple):
+    """One schedule evaluated on one simulated day."""
+
+    today: date
+    args: tuple
+    count: int
+
+    @property
+    def frequency(self) -> str:
+        return self.args[1]
+
+
+class Mismatch(NamedTuple):
+    engine: str
+    case: Case
+    expected: tuple
+    actual: tuple
+
+
+class Report(NamedTuple):
+    """Mismatches and seconds spent per frequency and engine."""
+
+    mismatches: list[Mismatch]
+    timings: dict[str, dict[str, float]]
+
+    def speedups(self) -> dict[str, dict[str, float]]:
+        """Return the speedup of each engine over the reference, per frequency."""
+        return {
+            frequency: {
+                engine: seconds["reference"] / elapsed
+                for engine, elapsed in seconds.items()
+                if engine != "reference" and elapsed
+            }
+            for frequency, seconds in self.timings.items()
+        }
+
+
+def generate_cases(rng: random.Random, count: int, regions) -> list[Case]:
+    """Return `count` random cases between 2024 and 2029."""
+    cases = []
+    for _ in range(count):
+        today = date(2024, 1, 1) + timedelta(days=rng.randrange(365 * 5))
+        country, subdiv = rng.choice(regions)
+        pay_day = rng.choice(
+            ["last_bank_day", "first_bank_day", rng.randint(1, 31), rng.randint(1, 31)]
+        )
+        # Anchors from a year ahead to 60 years back.
+        anchor = today - timedelta(days=rng.randrange(-400, 365 * 60))
+        args = (
+            country,
+            rng.choice(FREQUENCIES),
+            pay_day,
+            anchor.isoformat(),
+            rng.randint(0, 6),
+            rng.randint(0, 10),
+            subdiv,
+        )
+        cases.append(Case(today, args, rng.randint(1, 24)))
+    return cases
+
+
+def reference_engine(reference):
+    """Return an engine evaluating a case with the reference module."""
+
+    def run(case: Case) -> tuple:
+        return (
+            reference.calculate_upcoming_paydays(*case.args, count=case.count),
+            reference.calculate_last_payday(*case.args),
+        )
+
+    return run
+
+
+def calculator_engines(calculator, numpy_backend=None) -> dict:
+    """Return the optimized engines to compare, by name.
+
+    "calendar" is the pure-Python path. "numpy" computes the upcoming
+    paydays with the NumPy backend and the last payday with the calendar.
+    """
+
+    def calendar(case: Case) -> tuple:
+        schedule = calculator.PaydaySchedule(*case.args)
+        return (
+            calculator.calculate_upcoming_paydays(schedule, count=case.count),
+            calculator.calculate_last_payday(schedule),
+        )
+
+    engines = {"calendar": calendar}
+    if numpy_backend is not None and numpy_backend.HAS_NUMPY:
+
+        def numpy(case: Case) -> tuple:
+            schedule = calculator.PaydaySchedule(*case.args)
+            return (
+                numpy_backend.calculate_upcoming_paydays(
+                    schedule, case.count, case.today
+                ),
+                calculator.calculate_last_payday(schedule),
+            )
+
+        engines["numpy"] = numpy
+    return engines
+
+
+def run_cases(reference, engines: dict, cases, set_today) -> Report:
+    """Evaluate every case with the reference and each engine."""
+    mismatches: list[Mismatch] = []
+    timings: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for case in cases:
+        set_today(case.today)
+        started = time.perf_counter()
+        expected = reference(case)
+        timings[case.frequency]["reference"] += time.perf_counter() - started
+        for name, engine in engines.items():
+            started = time.perf_counter()
+            actual = engine(case)
+            timings[case.frequency][name] += time.perf_counter() - started
+            if actual != expected:
+                mismatches.append(Mismatch(name, case, expected, actual))
+    return Report(mismatches, {f: dict(t) for f, t in timings.items()})
+
+
+def pin_today(*modules):
+    """Return a function that sets the `date.today()` seen by the modules."""
+    today = [date.today()]
+
+    class _PinnedDate(date):
+        @classmethod
+        def today(cls):
+            return today[0]
+
+    for module in modules:
+        module.date = _PinnedDate
+
+    def set_today(d: date) -> None:
+        today[0] = d
+
+    return set_today
+
+
+def _load_real_modules():
+    """Import the calculator and the reference with the real holidays package."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    package = types.ModuleType("custom_components.isitpayday")
+    package.__path__ = [os.path.join(root, "custom_components", "isitpayday")]
+    sys.modules["custom_components.isitpayday"] = package
+    calculator = import_module("custom_components.isitpayday.payday_calculator")
+    try:
+        numpy_backend = import_module("custom_components.isitpayday.numpy_backend")
+    except ImportError:
+        numpy_backend = None
+    return import_module("reference_calculator"), calculator, numpy_backend
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    reference, calculator, numpy_backend = _load_real_modules()
+    set_today = pin_today(reference, calculator)
+    cases = generate_cases(random.Random(args.seed), args.cases, REAL_REGIONS)
+    report = run_cases(
+        reference_engine(reference),
+        calculator_engines(calculator, numpy_backend),
+        cases,
+        set_today,
+    )
+
+    for frequency, speedups in sorted(report.speedups().items()):
+        line = ", ".join(f"{name} {ratio:.1f}x" for name, ratio in speedups.items())
+        print(f"{frequency:>11}: {line}")
+    for mismatch in report.mismatches[:10]:
+        print("MISMATCH", mismatch)
+    print(f"{len(cases)} cases, {len(report.mismatches)} mismatches")
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
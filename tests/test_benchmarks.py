@@ -0,0 +1,104 @@
+"""Smoke tests for the benchmark suite, run against the holidays mock."""
+
+import importlib.util
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(BENCHMARKS, f"{name}.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def bench():
+    return _load("bench_calculator")
+
+
+def test_benchmarks_cover_every_case(calc, bench):
+    results = bench.run_benchmarks(calc, [("DK", None), ("DE", "BY")], repeat=1)
+
+    # 6 anchored frequencies with 2 anchor ages, monthly and weekly without.
+    payday_cases = (6 * 2 + 2) * (1 + len(bench.COUNTS))
+    assert len(results) == 2 * (2 + payday_cases)
+    assert "calculate_upcoming_paydays/annual/anchor=50y/count=24/cold" in results
+    assert "get_supported_countries/warm" in results
+    assert all(r["min"] <= r["median"] for r in results.values())
+
+
+def test_compare_flags_regressions():
+    compare = _load("compare")
+    old = {"results": {"a": {"min": 1.0}, "b": {"min": 1.0}, "gone": {"min": 1.0}}}
+    new = {"results": {"a": {"min": 1.1}, "b": {"min": 2.0}, "added": {"min": 1.0}}}
+
+    rows = {row["name"]: row for row in compare.compare(old, new, threshold=1.2)}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"] and rows["b"]["ratio"] == 2.0
+    assert rows["gone"]["new"] is None and rows["added"]["old"] is None
+
+
+def test_profile_ranks_every_region(calc, monkeypatch):
+    monkeypatch.syspath_prepend(BENCHMARKS)
+    profile = _load("profile_regions")
+
+    regions = profile.supported_regions(calc)
+    assert ("DE", None) in regions and ("DE", "BY") in regions
+    assert profile.supported_regions(calc, ["DK"]) == [("DK", None)]
+
+    results = profile.profile_regions(calc, regions, repeat=1)
+    assert len(results) == len(regions)
+    assert [r["min"] for r in results] == sorted(
+        (r["min"] for r in results), reverse=True
+    )
+    by_region = {r["region"]: r for r in results}
+    assert by_region["DK"]["categories"] == {"public": 2 * 3, "optional": 5 * 3}
+    assert by_region["DE/BY"]["holidays"] == 3 * 3
+    assert by_region["DK"]["bytes"] > 0
+    assert profile.summarize(results)["optional"] == 5 * 3
+
+
+def test_load_scenario(calc, monkeypatch):
+    monkeypatch.syspath_prepend(BENCHMARKS)
+    load = _load("load_entries")
+    # The scenario installs the Home Assistant stand-in; remove it afterwards.
+    clock = load.VirtualClock(datetime.now(timezone.utc), timezone.utc)
+    for name in [*load.homeassistant_modules(clock), "custom_components.isitpayday"]:
+        monkeypatch.setitem(sys.modules, name, None)
+
+    regions = [("DK", None), ("DE", "BY"), ("US", "CA")]
+    configs = load.entry_configs(24, regions)
+    assert {c["pay_frequency"] for c in configs} == set(load.FREQUENCIES)
+    assert {c["country"] for c in configs} == {"DK", "DE", "US"}
+
+    result = load.run_scenario(calc, configs, timedelta(days=1), trace_memory=True)
+    assert result["entries"] == 24
+    # Every setup calculates once and checks the country once; each region's
+    # bank days are compiled once. Calculations that compiled bank days are
+    # followed by an export of them for saving.
+    jobs = 2 * 24 + len(regions)
+    assert jobs < result["setup_executor_jobs"] <= jobs + 24
+    assert result["executor"]["jobs"] == result["setup_executor_jobs"] + (
+        result["run_executor_jobs"]
+    )
+    # The safety net at 6, 12 and 18 o'clock, then midnight; entries paid
+    # today refresh once more after the payday event.
+    assert 24 * 4 <= result["refreshes"] <= 24 * 5
+    assert result["run_executor_jobs"] < result["refreshes"]
+    assert result["peak_memory"] > 0
+
+
+def test_import_time_covers_the_integration():
+    result = _load("import_time").run(repeat=1)
+    assert not result["holidays"]
+    assert "custom_components.isitpayday.payday_calculator" in result["modules"]
+    assert "custom_components.isitpayday.executor" in result["modules"]
+    assert result["median"] > 0
@@ -0,0 +1,64 @@
+"""Differential tests of the optimized engines against the reference."""
+
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+from differential import (
+    MOCK_REGIONS,
+    calculator_engines,
+    generate_cases,
+    pin_today,
+    reference_engine,
+    run_cases,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def reference(mock_holidays):
+    """Import the reference module fresh, on top of the holidays mock."""
+    spec = importlib.util.spec_from_file_location(
+        "reference_calculator", os.path.join(HERE, "reference_calculator.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _engines(calc):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return calculator_engines(calc)
+    numpy_backend = importlib.import_module(
+        "custom_components.isitpayday.numpy_backend"
+    )
+    return calculator_engines(calc, numpy_backend)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_engines_match_reference(calc, reference, seed):
+    set_today = pin_today(reference, calc)
+    cases = generate_cases(random.Random(seed), 1000, MOCK_REGIONS)
+    report = run_cases(reference_engine(reference), _engines(calc), cases, set_today)
+
+    assert report.mismatches == []
+    assert set(report.timings) == {case.frequency for case in cases}
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("holidays") is None,
+    reason="the holidays package is not installed",
+)
+def test_engines_match_reference_with_real_holidays():
+    result = subprocess.run(
+        [sys.executable, os.path.join(HERE, "differential.py"), "--cases", "300"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,67 @@
+"""The integration loads without the `holidays` package.
+
+Home Assistant imports the integration package (and `config_flow`, which
+imports it) when it loads, so neither may pull in the `holidays` package
+(over 100 ms on its own) until a calculation actually needs it. The checks
+look at which modules are imported, not at how long that takes; the
+import time itself is measured by `benchmarks/import_time.py`.
+"""
+
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+INTEGRATION = ROOT / "custom_components" / "isitpayday"
+
+_SCRIPT = f"""
+import json, sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, {str(ROOT)!r})
+from harness.home_assistant import VirtualClock, homeassistant_modules, load_integration
+
+clock = VirtualClock(datetime.now(timezone.utc), timezone.utc)
+sys.modules.update(homeassistant_modules(clock))
+load_integration()
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _module_level_imports(path: Path) -> set[str]:
+    """Return the modules a file imports when it is imported itself."""
+    imported = set()
+    pending = list(ast.parse(path.read_text(encoding="UTF-8")).body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            imported.add(node.module)
+        elif not isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            pending.extend(ast.iter_child_nodes(node))
+    return imported
+
+
+def test_integration_does_not_import_holidays():
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT], capture_output=True, text=True, check=True
+    )
+    modules = set(json.loads(result.stdout))
+    assert "custom_components.isitpayday.payday_calculator" in modules
+    assert not {name for name in modules if name.split(".")[0] == "holidays"}
+    assert "numpy" not in modules
+
+
+def test_no_module_imports_holidays_up_front():
+    # Covers config_flow and the platforms, which need the real Home
+    # Assistant to be imported.
+    for path in INTEGRATION.glob("*.py"):
+        imported = _module_level_imports(path)
+        assert not {
+            name for name in imported if name.split(".")[0] == "holidays"
+        }, path.name
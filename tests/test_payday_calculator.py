@@ -1,6 +1,8 @@
 """Unit tests for the payday calculation logic."""
 
-from datetime import date
+import asyncio
+import threading
+from datetime import date, timedelta
 
 import pytest
 
@@ -33,6 +35,34 @@ def test_subdivisions_empty_for_country_without_regions(calc):
     assert calc.get_country_subdivisions("DK") == {}
 
 
+def test_country_index_is_built_once(calc, monkeypatch, constructions):
+    import threading
+
+    builds = []
+    build = calc.build_country_index
+
+    def counting():
+        builds.append(1)
+        return build()
+
+    monkeypatch.setattr(calc, "build_country_index", counting)
+
+    def use_index():
+        calc.get_supported_countries()
+        calc.get_country_subdivisions("DE")
+        calc.is_country_supported("US")
+
+    threads = [threading.Thread(target=use_index) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    # One probe for the subdivisions of DE, shared by all threads.
+    assert constructions == [("DE", None)]
+
+
 # --------------------------------------------------------------------------- #
 # Bank holidays / categories                                                  #
 # --------------------------------------------------------------------------- #
@@ -55,6 +85,744 @@ def test_regional_holiday_only_with_subdivision(calc):
     assert date(2026, 8, 15) not in without_region
 
 
+# --------------------------------------------------------------------------- #
+# Holiday cache                                                               #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def constructions(calc, monkeypatch):
+    """Count the holidays objects built by the calculator."""
+    calls = []
+    original = calc.holidays_lib.country_holidays
+
+    def counting(country, **kwargs):
+        calls.append((country, kwargs.get("years")))
+        return original(country, **kwargs)
+
+    monkeypatch.setattr(calc.holidays_lib, "country_holidays", counting)
+    return calls
+
+
+def test_holiday_cache_reuses_tables(calc, constructions):
+    first = calc.get_bank_holidays("DK", [2026, 2027])
+    second = calc.get_bank_holidays("DK", [2027, 2026])
+    assert first is second
+    # One category probe plus one real table.
+    assert len(constructions) == 2
+    info = calc.holiday_cache_info()
+    assert info["hits"] == 1 and info["misses"] == 1
+    assert info["category_hits"] == 1 and info["category_misses"] == 1
+
+
+def test_holiday_cache_keys_on_subdivision(calc, constructions):
+    calc.get_bank_holidays("DE", [2026], "BY")
+    calc.get_bank_holidays("DE", [2026], None)
+    assert calc.holiday_cache_info()["size"] == 2
+
+
+def test_holiday_cache_evict_country(calc, constructions):
+    calc.get_bank_holidays("DK", [2026])
+    calc.get_bank_holidays("DE", [2026])
+    assert calc.evict_holiday_cache("DK") == 1
+    calc.get_bank_holidays("DK", [2026])
+    # DK needs a new probe and table; DE is untouched.
+    assert [c for c, _ in constructions].count("DK") == 4
+    assert calc.holiday_cache_info()["size"] == 2
+
+
+def test_holiday_cache_clear(calc, constructions):
+    calc.get_bank_holidays("DK", [2026])
+    index = calc.get_country_index()
+    calc.clear_holiday_cache()
+    assert calc.holiday_cache_info()["size"] == 0
+    assert calc.get_country_index() is not index
+    calc.get_bank_holidays("DK", [2026])
+    assert len(constructions) == 4
+
+
+def test_holiday_cache_is_bounded(calc):
+    cache = calc.HolidayCache(maxsize=2)
+    for year in (2025, 2026, 2027):
+        cache.put_table(("DK", None, (), (year,)), {})
+    assert cache.get_table(("DK", None, (), (2025,))) is None
+    assert cache.info()["size"] == 2
+
+
+def test_holiday_cache_skips_unsupported_country(calc):
+    calc.get_bank_holidays("XX", [2026])
+    assert calc.holiday_cache_info()["size"] == 0
+
+
+def test_refresh_builds_holidays_once_per_span(calc, constructions):
+    calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    )
+    calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    )
+    calc.calculate_last_payday(calc.PaydaySchedule("DK", "monthly", "last_bank_day"))
+    calc.calculate_last_payday(calc.PaydaySchedule("DK", "monthly", "last_bank_day"))
+    # One probe plus one table for each of the two year spans.
+    assert len(constructions) == 3
+
+
+# --------------------------------------------------------------------------- #
+# Compiled bank calendar                                                      #
+# --------------------------------------------------------------------------- #
+
+
+def test_bank_calendar_membership(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    assert bank_calendar.is_bank_day(date(2026, 6, 15))  # Monday
+    assert not bank_calendar.is_bank_day(date(2026, 6, 13))  # Saturday
+    assert not bank_calendar.is_bank_day(date(2026, 12, 24))  # Christmas Eve
+
+
+def test_bank_calendar_next_and_previous(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    # 24-27 Dec 2026 are closed (holidays and weekend).
+    assert bank_calendar.next_bank_day(date(2026, 12, 24)) == date(2026, 12, 28)
+    assert bank_calendar.previous_bank_day(date(2026, 12, 27)) == date(2026, 12, 23)
+    assert bank_calendar.next_bank_day(date(2026, 6, 15)) == date(2026, 6, 15)
+
+
+def test_bank_calendar_crosses_year_boundary(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    # 31 Dec 2026 and 1 Jan 2027 are closed, 2-3 Jan 2027 is a weekend.
+    assert bank_calendar.next_bank_day(date(2026, 12, 31)) == date(2027, 1, 4)
+    assert bank_calendar.previous_bank_day(date(2027, 1, 3)) == date(2026, 12, 30)
+
+
+def test_bank_calendar_is_shared_and_compiled_once(calc, constructions):
+    first = calc.get_bank_calendar("DK")
+    first.ensure_years([2026, 2027])
+    assert calc.get_bank_calendar("DK") is first
+    first.is_bank_day(date(2027, 3, 1))
+    # One category probe plus one table for both years.
+    assert len(constructions) == 2
+    assert first.years == [2026, 2027]
+
+
+def test_bank_calendar_years_are_immutable(calc):
+    compiled = calc.get_bank_calendar("DK").year(2026)
+    with pytest.raises(AttributeError):
+        compiled.ordinals = ()
+
+
+def test_bank_calendar_uses_country_weekend(calc):
+    bank_calendar = calc.get_bank_calendar("SA")
+    assert bank_calendar.weekend == frozenset({4, 5})
+    assert not bank_calendar.is_bank_day(date(2026, 6, 19))  # Friday
+    assert bank_calendar.is_bank_day(date(2026, 6, 21))  # Sunday
+    assert bank_calendar.next_bank_day(date(2026, 6, 19)) == date(2026, 6, 21)
+    # July 2026 ends on a Friday.
+    assert bank_calendar.nth_bank_day(2026, 7, -1) == date(2026, 7, 30)
+    assert calc.count_bank_days("SA", date(2026, 6, 14), date(2026, 6, 21)) == 5
+
+
+def test_weekend_override(calc, monkeypatch):
+    monkeypatch.setitem(calc._WEEKEND_PER_COUNTRY, "DK", frozenset({6}))
+    assert calc.get_bank_calendar("DK").is_bank_day(date(2026, 6, 13))  # Saturday
+
+
+def test_weekly_payday_moves_past_country_weekend(calc):
+    paydays = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("SA", "weekly", weekday=4), count=2
+    )
+    assert paydays == [date(2026, 6, 21), date(2026, 6, 28)]
+
+
+def test_bank_calendar_nth_bank_day(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    # December 2026 opens on Tuesday the 1st; 24-27 and 31 Dec are closed.
+    assert bank_calendar.nth_bank_day(2026, 12, 1) == date(2026, 12, 1)
+    assert bank_calendar.nth_bank_day(2026, 12, 5) == date(2026, 12, 7)
+    assert bank_calendar.nth_bank_day(2026, 12, -1) == date(2026, 12, 30)
+    assert bank_calendar.nth_bank_day(2026, 12, -4) == date(2026, 12, 23)
+    assert bank_calendar.nth_bank_day(2026, 12, 0) is None
+
+
+def test_bank_calendar_nth_bank_day_is_clamped(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    assert bank_calendar.nth_bank_day(2026, 12, 40) == date(2026, 12, 30)
+    assert bank_calendar.nth_bank_day(2026, 12, -40) == date(2026, 12, 1)
+
+
+def test_bank_calendar_discard_years_before(calc, constructions):
+    bank_calendar = calc.get_bank_calendar("DK")
+    bank_calendar.ensure_years([2025, 2026, 2027])
+    assert bank_calendar.discard_years_before(2026) == 1
+    assert bank_calendar.years == [2026, 2027]
+    assert bank_calendar.discard_years_before(2026) == 0
+    # A dropped year is compiled again on demand.
+    assert not bank_calendar.is_bank_day(date(2025, 12, 25))
+    assert bank_calendar.years == [2025, 2026, 2027]
+
+
+def test_window_rolls_over_one_year_at_a_time(calc, constructions, monkeypatch):
+    calc.calculate_payday_window(calc.PaydaySchedule("DK", "monthly", "last_bank_day"))
+    assert calc.get_bank_calendar("DK").years == [2025, 2026, 2027, 2028]
+
+    class _NewYear(date):
+        @classmethod
+        def today(cls):
+            return date(2027, 1, 4)
+
+    monkeypatch.setattr(calc, "date", _NewYear)
+    constructions.clear()
+    calc.calculate_payday_window(calc.PaydaySchedule("DK", "monthly", "last_bank_day"))
+    assert constructions == [("DK", [2029])]
+    assert calc.get_bank_calendar("DK").years == [2026, 2027, 2028, 2029]
+
+
+def test_prefetch_bank_year(calc, constructions):
+    calc.prefetch_bank_year("DK", 2029)
+    assert calc.get_bank_calendar("DK").years == [2029]
+    calc.prefetch_bank_year("DK", 2029)
+    assert len(constructions) == 2  # category probe plus 2029
+
+
+def test_overlay_calendar_closes_and_opens_days(calc):
+    overlay = calc.get_bank_calendar(
+        "DK", closed_days=frozenset({date(2026, 6, 30)}), open_days={date(2026, 12, 24)}
+    )
+    assert not overlay.is_bank_day(date(2026, 6, 30))
+    assert overlay.is_bank_day(date(2026, 12, 24))
+    assert overlay.nth_bank_day(2026, 6, -1) == date(2026, 6, 29)
+    # The region's own calendar is unchanged.
+    base = calc.get_bank_calendar("DK")
+    assert base.is_bank_day(date(2026, 6, 30))
+    assert not base.is_bank_day(date(2026, 12, 24))
+
+
+def test_overlay_calendar_is_a_cheap_delta(calc, constructions):
+    base = calc.get_bank_calendar("DK")
+    base.ensure_years([2026, 2027])
+    overlay = calc.get_bank_calendar("DK", closed_days=frozenset({date(2026, 6, 30)}))
+    assert overlay.base is base
+    # Years without changes are the base calendar's own; no new holidays.
+    assert overlay.year(2027) is base.year(2027)
+    assert overlay.year(2026) is not base.year(2026)
+    assert len(constructions) == 2
+    assert calc.count_bank_days("DK", date(2026, 6, 1), date(2026, 7, 1)) == (
+        overlay.count_bank_days(date(2026, 6, 1), date(2026, 7, 1)) + 1
+    )
+
+
+def test_schedule_with_closure_days(calc):
+    schedule = calc.PaydaySchedule.from_config(
+        {
+            "country": "DK",
+            "pay_frequency": "monthly",
+            "pay_day": "last_bank_day",
+            "closed_days": ["2026-06-30", "2026-06-29"],
+        }
+    )
+    assert schedule.closed_days == {date(2026, 6, 29), date(2026, 6, 30)}
+    assert calc.calculate_next_payday(schedule) == date(2026, 6, 26)
+    assert schedule.bank_calendar is calc.get_bank_calendar(
+        "DK", closed_days=schedule.closed_days
+    )
+
+
+def test_closure_days_affect_nearby_paydays_only(calc):
+    paydays = [date(2026, 5, 29), date(2026, 6, 30), date(2026, 7, 31)]
+    assert calc.closure_days_affect([date(2026, 8, 20)], paydays)
+    assert not calc.closure_days_affect([date(2027, 3, 1)], paydays)
+    assert calc.closure_days_affect([date(2027, 3, 1)], [None])
+
+
+def test_closure_days_affect_each_payday_separately(calc):
+    schedule = calc.PaydaySchedule("DK", "monthly", 31)
+    paydays = calc.calculate_payday_window(schedule).upcoming
+    # Between two later paydays, but more than a month away from both.
+    far = [date(2026, 6, 1), date(2026, 6, 30), date(2027, 3, 1)]
+    assert not calc.closure_days_affect([date(2026, 10, 14)], far)
+    assert calc.closure_days_affect([date(2026, 10, 14)], paydays)
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"pay_frequency": "quarterly", "last_pay_date": "2025-12-01"},
+        {"pay_frequency": "semiannual", "last_pay_date": "2026-03-20"},
+        {"pay_frequency": "annual", "last_pay_date": "2025-12-24"},
+        {"pay_frequency": "monthly", "pay_day": 1},
+    ],
+)
+def test_closure_days_unaffected_window_stays_the_same(calc, settings):
+    # Far from every payday, a closure can still change the bank days
+    # counted until the next one.
+    old = calc.PaydaySchedule.from_config({"country": "DK", **settings})
+    window = calc.calculate_payday_window(old)
+    paydays = [window.last, *window.upcoming]
+    for offset in range(0, 400, 4):
+        changed = {TODAY + timedelta(days=offset)}
+        new = calc.PaydaySchedule.from_config(
+            {"country": "DK", **settings, "closed_days": sorted(changed)}
+        )
+        if not calc.closure_days_affect(changed, paydays):
+            assert calc.calculate_payday_window(new) == window
+
+
+CLOSURE_SCHEDULES = [
+    {"pay_frequency": "monthly", "pay_day": "last_bank_day"},
+    {"pay_frequency": "monthly", "pay_day": 15, "bank_offset": 2},
+    {"pay_frequency": "14_days", "last_pay_date": "2026-06-05"},
+    {"pay_frequency": "bimonthly", "last_pay_date": "2026-05-15"},
+    {"pay_frequency": "quarterly", "last_pay_date": "2025-12-01"},
+    {"pay_frequency": "weekly", "weekday": 4},
+]
+
+
+@pytest.mark.parametrize("settings", CLOSURE_SCHEDULES)
+def test_update_payday_window_matches_full_calculation(calc, settings):
+    old = calc.PaydaySchedule.from_config({"country": "DK", **settings})
+    window = calc.calculate_payday_window(old)
+    for offset in range(-10, 400, 3):
+        first = TODAY + timedelta(days=offset)
+        # Single days, and two adjacent days closing a whole span; closed,
+        # and forced open (which opens weekends).
+        for changed in ({first}, {first, first + timedelta(days=1)}):
+            for key in ("closed_days", "open_days"):
+                new = calc.PaydaySchedule.from_config(
+                    {"country": "DK", **settings, key: sorted(changed)}
+                )
+                expected = calc.calculate_payday_window(new)
+                assert calc.update_payday_window(new, window, changed) == expected
+
+
+def test_update_payday_window_keeps_unaffected_paydays(calc, monkeypatch):
+    old = calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    window = calc.calculate_payday_window(old)
+    new = calc.PaydaySchedule(
+        "DK", "monthly", "last_bank_day", closed_days=frozenset({date(2026, 9, 30)})
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("whole window calculated")
+
+    monkeypatch.setattr(calc, "calculate_payday_window", fail)
+    updated = calc.update_payday_window(new, window, {date(2026, 9, 30)})
+    assert updated.upcoming[3] == date(2026, 9, 29)
+    assert updated.upcoming[:3] == window.upcoming[:3]
+    assert updated.upcoming[4:] == window.upcoming[4:]
+
+
+def test_count_bank_days(calc):
+    assert calc.count_bank_days("DK", date(2026, 6, 15), date(2026, 6, 22)) == 5
+    assert calc.count_bank_days("DK", date(2026, 6, 15), date(2026, 6, 15)) == 0
+    # 31 Dec 2026 and 1 Jan 2027 are closed.
+    assert calc.count_bank_days("DK", date(2026, 12, 28), date(2027, 1, 5)) == 4
+    assert calc.count_bank_days("DK", date(2027, 1, 5), date(2026, 12, 28)) == -4
+
+
+def test_payday_window_lists_bank_days_to_next_payday(calc):
+    schedule = calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    window = calc.calculate_payday_window(schedule)
+    assert window.next == date(2026, 6, 30)
+    assert window.bank_days[0] == TODAY
+    assert len(window.bank_days) == calc.count_bank_days("DK", TODAY, window.next)
+    assert window.bank_days[-1] == date(2026, 6, 29)
+
+
+def test_count_bank_days_matches_stepping(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    start = date(2025, 11, 3)
+    for end in (date(2025, 11, 3), date(2026, 1, 1), date(2027, 12, 31)):
+        expected = sum(
+            bank_calendar.is_bank_day(start + timedelta(days=i))
+            for i in range((end - start).days)
+        )
+        assert calc.count_bank_days("DK", start, end) == expected
+
+
+def test_bank_calendar_regional_holiday(calc):
+    assumption_day = date(2025, 8, 15)  # a Friday
+    assert not calc.get_bank_calendar("DE", "BY").is_bank_day(assumption_day)
+    assert calc.get_bank_calendar("DE").is_bank_day(assumption_day)
+
+
+# --------------------------------------------------------------------------- #
+# Precomputed holiday database                                                #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def holiday_db(calc, tmp_path):
+    """Build a database for 2025-2027 from the mocked holidays and use it."""
+    path = tmp_path / "bank_holidays.bin"
+    assert calc.build_holiday_database(path, 2025, 2027) == 8
+    calc.set_holiday_database(path)
+    yield calc.get_holiday_database()
+    calc.set_holiday_database(None)
+
+
+def test_holiday_db_matches_live_holidays(calc, holiday_db):
+    from custom_components.isitpayday.bank_calendar import BankYear
+
+    for country, subdiv in [("DK", None), ("DE", "BY"), ("DE", None), ("US", "NY")]:
+        bitmaps, missing = holiday_db.bitmaps(country, subdiv, [2025, 2026])
+        live = calc.get_bank_holidays(country, [2025, 2026], subdiv)
+        weekend = calc.get_bank_calendar(country, subdiv).weekend
+        assert missing == [] and sorted(bitmaps) == [2025, 2026]
+        for year, closed in bitmaps.items():
+            stored = BankYear.from_closed_bitmap(year, closed, weekend)
+            compiled = BankYear.compile(year, live, weekend)
+            assert stored.bitmap == compiled.bitmap
+            assert stored.ordinals == compiled.ordinals
+
+
+def test_holiday_db_compiles_without_holidays_package(calc, holiday_db, constructions):
+    bank_calendar = calc.get_bank_calendar("DE", "BY")
+    bank_calendar.ensure_years([2025, 2026, 2027])
+    assert not bank_calendar.is_bank_day(date(2025, 8, 15))  # Assumption Day
+    assert calc.get_bank_calendar("SA").weekend == frozenset({4, 5})
+    assert constructions == []
+
+
+def test_holiday_db_falls_back_for_missing_years_and_regions(
+    calc, holiday_db, constructions
+):
+    calc.get_bank_calendar("DK").ensure_years([2026, 2027, 2028])
+    assert [years for _, years in constructions if years] == [[2028]]
+
+    assert holiday_db.bitmaps("DK", "XX", [2026]) == ({}, [2026])
+
+
+def test_holiday_db_built_for_other_version_is_ignored(calc, tmp_path, monkeypatch):
+    path = tmp_path / "bank_holidays.bin"
+    calc.build_holiday_database(path, 2026, 2026)
+    monkeypatch.setattr(calc, "holidays_version", lambda: "0.0")
+    calc.set_holiday_database(path)
+    assert calc.get_holiday_database() is None
+
+
+def test_holiday_db_rejects_other_files(calc, tmp_path):
+    path = tmp_path / "bank_holidays.bin"
+    path.write_bytes(b"not a database")
+    calc.set_holiday_database(path)
+    assert calc.get_holiday_database() is None
+
+
+def test_holiday_db_closes_rejected_files(calc, tmp_path, monkeypatch):
+    path = tmp_path / "bank_holidays.bin"
+    path.write_bytes(b"not a database")
+    closed = []
+    close = calc.HolidayDatabase.close
+    monkeypatch.setattr(
+        calc.HolidayDatabase, "close", lambda self: closed.append(close(self))
+    )
+    with pytest.raises(ValueError):
+        calc.HolidayDatabase(path)
+    assert closed == [None]
+
+
+def test_holiday_db_is_optional(calc):
+    # No database is shipped in the source tree.
+    assert calc.get_holiday_database() is None
+
+
+# --------------------------------------------------------------------------- #
+# Saved bank days                                                              #
+# --------------------------------------------------------------------------- #
+
+
+def test_export_bank_closing_days_is_delta_encoded(calc):
+    calc.get_bank_calendar("DK").ensure_years([2025, 2026])
+    data = calc.export_bank_closing_days(2026)
+    assert data["holidays"] == calc.holidays_version()
+    # 1 Jan, 5 Jun, 24, 25 and 31 Dec 2026; none falls on a weekend.
+    assert data["regions"] == {
+        "DK": {"weekend": [5, 6], "years": {"2026": [0, 155, 202, 1, 6]}}
+    }
+
+
+def test_export_bank_closing_days_compiles_nothing(calc, constructions):
+    bank_calendar = calc.get_bank_calendar("DK")
+    bank_calendar.ensure_years([2026, 2027])
+    bank_calendar.discard_years_before(2027)
+    constructions.clear()
+    assert list(calc.export_bank_closing_days(2026)["regions"]["DK"]["years"]) == [
+        "2027"
+    ]
+    assert constructions == []
+
+
+def test_bank_days_change_once_compiled_years_are_stored(calc, monkeypatch):
+    # An export made while a year compiles misses it; the change must come
+    # after the year is stored, or the next export is skipped.
+    during = []
+    generate = calc._generate_bank_holidays
+
+    def generate_and_export(*args):
+        during.append(calc.bank_days_changes())
+        return generate(*args)
+
+    monkeypatch.setattr(calc, "_generate_bank_holidays", generate_and_export)
+    calc.get_bank_calendar("DK").ensure_years([2026])
+    assert during and calc.bank_days_changes() != during[-1]
+
+
+def test_restored_bank_days_need_no_holidays(calc, monkeypatch):
+    schedule = calc.PaydaySchedule("DE", "monthly", 15, subdiv="BY")
+    window = calc.calculate_payday_window(schedule)
+    data = calc.export_bank_closing_days(TODAY.year - 1)
+
+    calc.clear_holiday_cache()
+    assert calc.restore_bank_closing_days(data) == 4
+
+    def fail(*args, **kwargs):
+        raise AssertionError("holidays generated")
+
+    monkeypatch.setattr(calc.holidays_lib, "country_holidays", fail)
+    assert calc.calculate_payday_window(schedule) == window
+    # Years not used yet are still saved.
+    assert calc.export_bank_closing_days(TODAY.year - 1) == data
+
+
+def test_failed_holidays_are_not_saved(calc):
+    bank_calendar = calc.get_bank_calendar("XX")
+    # Banks are still closed on weekends, so paydays can be calculated.
+    assert not bank_calendar.is_bank_day(date(2026, 6, 13))
+    assert bank_calendar.is_bank_day(date(2026, 12, 25))
+    assert bank_calendar.years == []
+    assert not calc.bank_years_compiled("XX", [2026])
+    assert calc.export_bank_closing_days(2026)["regions"] == {}
+
+
+def test_failed_holidays_are_generated_again(calc, monkeypatch):
+    country_holidays = calc.holidays_lib.country_holidays
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("temporary")
+
+    monkeypatch.setattr(calc.holidays_lib, "country_holidays", fail)
+    bank_calendar = calc.get_bank_calendar("DK")
+    assert bank_calendar.is_bank_day(date(2026, 12, 25))
+    assert calc.export_bank_closing_days(2026)["regions"] == {}
+
+    monkeypatch.setattr(calc.holidays_lib, "country_holidays", country_holidays)
+    bank_calendar.ensure_years([2026])
+    assert not bank_calendar.is_bank_day(date(2026, 12, 25))
+    assert "2026" in calc.export_bank_closing_days(2026)["regions"]["DK"]["years"]
+
+
+def test_bank_days_changes_only_when_compiling(calc):
+    schedule = calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    calc.calculate_payday_window(schedule)
+    changes = calc.bank_days_changes()
+
+    calc.calculate_payday_window(schedule)
+    assert calc.bank_days_changes() == changes
+
+    calc.get_bank_calendar("DK").ensure_years([TODAY.year + 5])
+    assert calc.bank_days_changes() > changes
+    changes = calc.bank_days_changes()
+    calc.evict_holiday_cache("DK")
+    assert calc.bank_days_changes() > changes
+
+
+def test_country_support_known_from_saved_countries(calc, monkeypatch):
+    version = calc.holidays_version()
+    calc.restore_bank_closing_days(
+        {
+            "holidays": version,
+            "countries": ["ZZ"],
+            "regions": {
+                "ZZ": {"weekend": [5, 6], "years": {}},
+                "XX": {"weekend": [5, 6], "years": {}},
+            },
+        }
+    )
+    assert calc.is_country_supported("ZZ")
+    assert calc.is_country_supported("DK")
+    # Restored days alone do not make a country supported.
+    assert not calc.is_country_supported("XX")
+
+
+def test_unsupported_country_stays_unsupported_after_restore(calc):
+    calc.get_bank_calendar("XX").ensure_years([2026])
+    calc.get_bank_calendar("DK").ensure_years([2026])
+    data = calc.export_bank_closing_days(2026)
+    assert data["countries"] == ["DK"]
+
+    calc.clear_holiday_cache()
+    calc.restore_bank_closing_days(data)
+    assert not calc.is_country_supported("XX")
+
+
+def test_restore_ignores_other_holidays_version(calc, constructions):
+    calc.get_bank_calendar("DK").ensure_years([2026])
+    data = {**calc.export_bank_closing_days(2026), "holidays": "0.0"}
+    calc.clear_holiday_cache()
+    constructions.clear()
+
+    assert calc.restore_bank_closing_days(data) == 0
+    calc.get_bank_calendar("DK").ensure_years([2026])
+    assert [years for _, years in constructions if years] == [[2026]]
+
+
+# --------------------------------------------------------------------------- #
+# NumPy backend                                                               #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def numpy_backend(calc):
+    """Import the optional NumPy backend, skipping if NumPy is missing."""
+    pytest.importorskip("numpy")
+    import importlib
+
+    return importlib.import_module("custom_components.isitpayday.numpy_backend")
+
+
+@pytest.mark.parametrize(
+    ("freq", "pay_day", "last_pay_date", "weekday", "bank_offset"),
+    [
+        ("monthly", "last_bank_day", None, None, 0),
+        ("monthly", "last_bank_day", None, None, 3),
+        ("monthly", "first_bank_day", None, None, 0),
+        ("monthly", 25, None, None, 0),
+        ("monthly", 31, None, None, 0),
+        ("bimonthly", None, "2015-12-31", None, 0),
+        ("14_days", None, "2026-06-12", None, 0),
+        ("28_days", None, "2001-01-01", None, 0),
+        ("quarterly", None, "2025-12-27", None, 0),
+        ("annual", None, "1999-12-25", None, 0),
+        ("weekly", None, None, 4, 0),
+    ],
+)
+def test_numpy_backend_matches_pure_path(
+    calc, numpy_backend, freq, pay_day, last_pay_date, weekday, bank_offset
+):
+    args = ("DK", freq, pay_day, last_pay_date, weekday, bank_offset, None)
+    expected = calc.calculate_upcoming_paydays(calc.PaydaySchedule(*args), count=24)
+    assert (
+        numpy_backend.calculate_upcoming_paydays(
+            calc.PaydaySchedule(*args), count=24, today=TODAY
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("pay_day", ["nth_bank_day", "nth_last_bank_day"])
+@pytest.mark.parametrize("bank_day_number", [1, 3, 15])
+def test_numpy_backend_matches_pure_path_for_nth_bank_day(
+    calc, numpy_backend, pay_day, bank_day_number
+):
+    expected = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", pay_day, bank_day_number=bank_day_number),
+        count=24,
+    )
+    assert (
+        numpy_backend.calculate_upcoming_paydays(
+            calc.PaydaySchedule(
+                "DK", "monthly", pay_day, bank_day_number=bank_day_number
+            ),
+            count=24,
+            today=TODAY,
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    ("freq", "pay_day", "last_pay_date", "weekday"),
+    [
+        ("monthly", "last_bank_day", None, None),
+        ("monthly", 31, None, None),
+        ("14_days", None, "2026-06-12", None),
+        ("weekly", None, None, 4),
+    ],
+)
+def test_numpy_backend_uses_country_weekend(
+    calc, numpy_backend, freq, pay_day, last_pay_date, weekday
+):
+    schedule = calc.PaydaySchedule("SA", freq, pay_day, last_pay_date, weekday)
+    assert numpy_backend.calculate_upcoming_paydays(
+        schedule, count=24, today=TODAY
+    ) == calc.calculate_upcoming_paydays(schedule, count=24)
+
+
+@pytest.mark.parametrize("settings", CLOSURE_SCHEDULES)
+def test_numpy_backend_matches_pure_path_with_closure_days(
+    calc, numpy_backend, settings
+):
+    # Runs of adjacent closure days roll several candidates onto the same
+    # bank day; both paths must still return `count` dates.
+    for offset in range(0, 120, 5):
+        for length in (8, 15, 40):
+            first = TODAY + timedelta(days=offset)
+            closed = [first + timedelta(days=i) for i in range(length)]
+            schedule = calc.PaydaySchedule.from_config(
+                {"country": "DK", **settings, "closed_days": closed}
+            )
+            expected = calc.calculate_upcoming_paydays(schedule, count=24)
+            assert len(expected) == 24
+            assert (
+                numpy_backend.calculate_upcoming_paydays(
+                    schedule, count=24, today=TODAY
+                )
+                == expected
+            )
+
+
+def test_numpy_backend_is_not_capped(calc, numpy_backend):
+    paydays = numpy_backend.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day"), count=120, today=TODAY
+    )
+    assert len(paydays) == 120
+    assert paydays == sorted(set(paydays))
+
+
+# --------------------------------------------------------------------------- #
+# Payday schedule                                                              #
+# --------------------------------------------------------------------------- #
+
+
+def test_schedule_normalizes_stored_strings(calc):
+    schedule = calc.PaydaySchedule(
+        "DK", "14_days", "31", "2026-06-12", bank_offset="2", bank_day_number="x"
+    )
+    assert schedule.pay_day == 31
+    assert schedule.last_pay_date == date(2026, 6, 12)
+    assert schedule.bank_offset == 2
+    assert schedule.bank_day_number == 1
+
+
+def test_schedule_from_config(calc):
+    schedule = calc.PaydaySchedule.from_config(
+        {
+            "country": "DE",
+            "subdivision": "BY",
+            "pay_frequency": "monthly",
+            "pay_day": "nth_bank_day",
+            "bank_day_number": 3,
+            "last_pay_date": None,
+            "event_time": "06:00:00",
+        }
+    )
+    assert schedule == calc.PaydaySchedule(
+        "DE", "monthly", "nth_bank_day", subdiv="BY", bank_day_number=3
+    )
+
+
+def test_schedule_is_hashable_and_immutable(calc):
+    first = calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    second = calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    assert first == second and hash(first) == hash(second)
+    assert len({first, second}) == 1
+    with pytest.raises(AttributeError):
+        first.pay_day = 25
+
+
+def test_schedule_rejects_invalid_last_pay_date(calc):
+    with pytest.raises(ValueError):
+        calc.PaydaySchedule("DK", "14_days", None, "not-a-date")
+
+
 # --------------------------------------------------------------------------- #
 # Upcoming paydays - monthly                                                   #
 # --------------------------------------------------------------------------- #
@@ -62,14 +830,14 @@ def test_regional_holiday_only_with_subdivision(calc):
 
 def test_monthly_last_bank_day_returns_requested_count(calc):
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "monthly", "last_bank_day", count=12
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day"), count=12
     )
     assert len(paydays) == 12
 
 
 def test_upcoming_paydays_sorted_unique_and_future(calc):
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "monthly", "last_bank_day", count=12
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day"), count=12
     )
     assert paydays == sorted(set(paydays))
     assert all(p >= TODAY for p in paydays)
@@ -78,31 +846,58 @@ def test_upcoming_paydays_sorted_unique_and_future(calc):
 def test_monthly_specific_day_adjusts_off_holiday(calc):
     # 25 Dec is a holiday and 24 Dec is an OPTIONAL bank closing day in DK,
     # so a "25th" payday in December lands on the 23rd.
-    holidays = calc.get_bank_holidays("DK", [2026])
-    assert calc._payday_for_month(2026, 12, 25, 0, holidays) == date(2026, 12, 23)
+    bank_calendar = calc.get_bank_calendar("DK")
+    assert calc._payday_for_month(2026, 12, 25, 0, bank_calendar) == date(2026, 12, 23)
+
+
+def test_monthly_nth_bank_day(calc):
+    bank_calendar = calc.get_bank_calendar("DK")
+    assert calc._payday_for_month(
+        2026, 12, "nth_bank_day", 0, bank_calendar, 5
+    ) == date(2026, 12, 7)
+    assert calc._payday_for_month(
+        2026, 12, "nth_last_bank_day", 0, bank_calendar, 2
+    ) == date(2026, 12, 29)
+
+
+def test_monthly_nth_bank_day_upcoming(calc):
+    paydays = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "nth_last_bank_day", bank_day_number=4),
+        count=7,
+    )
+    assert len(paydays) == 7
+    assert paydays[-1] == date(2026, 12, 23)
 
 
 def test_monthly_string_pay_day_is_normalized(calc):
-    paydays = calc.calculate_upcoming_paydays("DK", "monthly", "31", count=3)
+    paydays = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "31"), count=3
+    )
     assert len(paydays) == 3
 
 
 def test_monthly_string_bank_offset_is_normalized(calc):
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "monthly", "last_bank_day", bank_offset="2", count=3
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day", bank_offset="2"), count=3
     )
     assert len(paydays) == 3
 
 
 def test_invalid_bank_offset_falls_back_to_zero(calc):
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "monthly", "last_bank_day", bank_offset="abc", count=2
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day", bank_offset="abc"),
+        count=2,
     )
     assert len(paydays) == 2
 
 
 def test_monthly_invalid_pay_day_returns_empty(calc):
-    assert calc.calculate_upcoming_paydays("DK", "monthly", None, count=3) == []
+    assert (
+        calc.calculate_upcoming_paydays(
+            calc.PaydaySchedule("DK", "monthly", None), count=3
+        )
+        == []
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -112,7 +907,7 @@ def test_monthly_invalid_pay_day_returns_empty(calc):
 
 def test_14_day_interval_is_stable(calc):
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "14_days", None, "2026-06-12", count=6
+        calc.PaydaySchedule("DK", "14_days", None, "2026-06-12"), count=6
     )
     diffs = [(paydays[i + 1] - paydays[i]).days for i in range(5)]
     assert all(10 <= d <= 18 for d in diffs)
@@ -121,23 +916,66 @@ def test_14_day_interval_is_stable(calc):
 def test_bimonthly_with_very_old_anchor(calc):
     # Anchor 10 years ago must still yield future paydays (no guard limit bug).
     paydays = calc.calculate_upcoming_paydays(
-        "DK", "bimonthly", None, "2016-06-15", count=6
+        calc.PaydaySchedule("DK", "bimonthly", None, "2016-06-15"), count=6
     )
     assert len(paydays) == 6
     assert all(p >= TODAY for p in paydays)
 
 
+@pytest.mark.parametrize("anchor", ["2016-01-31", "2015-12-31", "2024-02-29"])
+def test_bimonthly_seek_matches_stepping(calc, anchor):
+    start = date.fromisoformat(anchor)
+    stepped = start
+    for step in range(40):
+        assert calc._bimonthly_step(start, step) == stepped
+        assert calc._bimonthly_seek(start, stepped) == step
+        stepped = calc._add_months(stepped, 2)
+
+
+def test_bimonthly_anchor_older_than_a_century(calc):
+    # The old forward walk gave up after 600 steps (100 years).
+    anchor = "1900-06-15"
+    upcoming = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "bimonthly", None, anchor)
+    )
+    last = calc.calculate_last_payday(
+        calc.PaydaySchedule("DK", "bimonthly", None, anchor)
+    )
+    assert last == date(2026, 6, 15)
+    assert upcoming[0] == date(2026, 6, 15)
+    assert upcoming[1] == date(2026, 8, 14)  # 15 Aug 2026 is a Saturday
+
+
+@pytest.mark.parametrize("freq", ["14_days", "bimonthly", "annual"])
+def test_old_anchor_only_builds_current_years(calc, constructions, freq):
+    calc.calculate_payday_window(calc.PaydaySchedule("DK", freq, None, "1926-06-15"))
+    built = {year for _, years in constructions if years for year in years}
+    assert min(built) >= 2025
+
+
 def test_bimonthly_requires_last_pay_date(calc):
-    assert calc.calculate_upcoming_paydays("DK", "bimonthly", None, None, count=3) == []
+    assert (
+        calc.calculate_upcoming_paydays(
+            calc.PaydaySchedule("DK", "bimonthly", None, None), count=3
+        )
+        == []
+    )
 
 
 def test_interval_requires_last_pay_date(calc):
-    assert calc.calculate_upcoming_paydays("DK", "14_days", None, None, count=3) == []
+    assert (
+        calc.calculate_upcoming_paydays(
+            calc.PaydaySchedule("DK", "14_days", None, None), count=3
+        )
+        == []
+    )
 
 
 @pytest.mark.parametrize("freq", ["28_days", "quarterly", "semiannual", "annual"])
 def test_other_intervals_return_requested_count(calc, freq):
-    paydays = calc.calculate_upcoming_paydays("DK", freq, None, "2026-06-12", count=4)
+    paydays = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", freq, None, "2026-06-12"), count=4
+    )
     assert len(paydays) == 4
 
 
@@ -147,13 +985,15 @@ def test_other_intervals_return_requested_count(calc, freq):
 
 
 def test_weekly_returns_requested_count(calc):
-    paydays = calc.calculate_upcoming_paydays("DK", "weekly", weekday=4, count=12)
+    paydays = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "weekly", weekday=4), count=12
+    )
     assert len(paydays) == 12
 
 
 def test_weekly_without_weekday_raises(calc):
     with pytest.raises(ValueError):
-        calc.calculate_upcoming_paydays("DK", "weekly", count=3)
+        calc.calculate_upcoming_paydays(calc.PaydaySchedule("DK", "weekly"), count=3)
 
 
 # --------------------------------------------------------------------------- #
@@ -163,16 +1003,33 @@ def test_weekly_without_weekday_raises(calc):
 
 def test_count_capped_at_24(calc):
     assert (
-        len(calc.calculate_upcoming_paydays("DK", "weekly", weekday=0, count=99)) == 24
+        len(
+            calc.calculate_upcoming_paydays(
+                calc.PaydaySchedule("DK", "weekly", weekday=0), count=99
+            )
+        )
+        == 24
     )
 
 
 def test_count_minimum_one(calc):
-    assert len(calc.calculate_upcoming_paydays("DK", "weekly", weekday=0, count=0)) == 1
+    assert (
+        len(
+            calc.calculate_upcoming_paydays(
+                calc.PaydaySchedule("DK", "weekly", weekday=0), count=0
+            )
+        )
+        == 1
+    )
 
 
 def test_invalid_frequency_returns_empty(calc):
-    assert calc.calculate_upcoming_paydays("DK", "fortnightly", count=3) == []
+    assert (
+        calc.calculate_upcoming_paydays(
+            calc.PaydaySchedule("DK", "fortnightly"), count=3
+        )
+        == []
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -181,33 +1038,526 @@ def test_invalid_frequency_returns_empty(calc):
 
 
 def test_next_payday_equals_first_upcoming(calc):
-    nxt = calc.calculate_next_payday("DK", "monthly", "last_bank_day")
-    first = calc.calculate_upcoming_paydays("DK", "monthly", "last_bank_day", count=1)[
-        0
-    ]
+    nxt = calc.calculate_next_payday(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    )
+    first = calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day"), count=1
+    )[0]
     assert nxt == first
 
 
+# --------------------------------------------------------------------------- #
+# Payday window                                                                #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.mark.parametrize(
+    ("freq", "pay_day", "last_pay_date", "weekday"),
+    [
+        ("monthly", "last_bank_day", None, None),
+        ("monthly", 25, None, None),
+        ("bimonthly", None, "2026-04-15", None),
+        ("14_days", None, "2026-06-12", None),
+        ("weekly", None, None, 4),
+    ],
+)
+def test_window_matches_separate_calculations(
+    calc, freq, pay_day, last_pay_date, weekday
+):
+    args = ("DK", freq, pay_day, last_pay_date, weekday, 0, None)
+    window = calc.calculate_payday_window(calc.PaydaySchedule(*args), count=6)
+    assert window.upcoming == calc.calculate_upcoming_paydays(
+        calc.PaydaySchedule(*args), count=6
+    )
+    assert window.last == calc.calculate_last_payday(calc.PaydaySchedule(*args))
+    assert window.next == window.upcoming[0]
+
+
+def test_window_builds_one_holiday_table(calc, constructions):
+    calc.calculate_payday_window(calc.PaydaySchedule("DK", "monthly", "last_bank_day"))
+    # One category probe plus one table spanning the previous year up to
+    # two years ahead.
+    assert constructions[1] == ("DK", [2025, 2026, 2027, 2028])
+    assert len(constructions) == 2
+
+
+def test_window_valid_until_next_payday(calc):
+    window = calc.calculate_payday_window(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    )
+    # The last payday becomes the next one on 30 June.
+    assert window.next == date(2026, 6, 30)
+    assert window.valid_until == date(2026, 6, 30)
+
+
+def test_window_valid_all_day_on_payday(calc):
+    window = calc.calculate_payday_window(
+        calc.PaydaySchedule("DK", "weekly", weekday=0)
+    )
+    assert window.next == TODAY
+    assert window.valid_until == date(2026, 6, 16)
+
+
+def test_window_valid_until_scheduled_date(calc):
+    # Scheduled for Saturday 27 June, paid on Friday 26 June. The last
+    # payday only moves to 26 June once 27 June is reached.
+    window = calc.calculate_payday_window(
+        calc.PaydaySchedule("DK", "14_days", None, "2026-06-13")
+    )
+    assert window.next == date(2026, 6, 26)
+    assert window.valid_until == date(2026, 6, 27)
+
+
+def test_window_without_paydays_is_valid_for_one_day(calc):
+    window = calc.calculate_payday_window(
+        calc.PaydaySchedule("DK", "14_days", None, None)
+    )
+    assert window.upcoming == [] and window.next is None
+    assert window.valid_until == date(2026, 6, 16)
+
+
+# --------------------------------------------------------------------------- #
+# Streaming paydays                                                            #
+# --------------------------------------------------------------------------- #
+
+
+def _schedule(calc, freq, pay_day=None, last_pay_date=None, weekday=None, **extra):
+    """Build a schedule from config entry settings, as the integration does."""
+    config = {
+        "country": "DK",
+        "pay_frequency": freq,
+        "pay_day": pay_day,
+        "last_pay_date": last_pay_date,
+        "weekday": weekday,
+        **extra,
+    }
+    return calc.PaydaySchedule.from_config(config)
+
+
+@pytest.mark.parametrize(
+    ("freq", "pay_day", "last_pay_date", "weekday"),
+    [
+        ("monthly", "last_bank_day", None, None),
+        ("monthly", "first_bank_day", None, None),
+        ("bimonthly", None, "2026-04-15", None),
+        ("28_days", None, "2026-06-12", None),
+        ("weekly", None, None, 4),
+    ],
+)
+def test_iter_paydays_matches_calculations(calc, freq, pay_day, last_pay_date, weekday):
+    from itertools import islice
+
+    schedule = _schedule(calc, freq, pay_day, last_pay_date, weekday)
+    forward = list(islice(calc.iter_paydays(schedule, TODAY), 24))
+    assert forward == calc.calculate_upcoming_paydays(schedule, count=24)
+    backward = calc.iter_paydays(schedule, TODAY, reverse=True)
+    assert next(backward) == calc.calculate_last_payday(schedule)
+
+
+def test_iter_paydays_is_not_capped(calc):
+    schedule = _schedule(calc, "weekly", weekday=2)
+    paydays = list(calc.iter_paydays(schedule, TODAY, date(2028, 6, 15)))
+    assert len(paydays) > 100
+    assert paydays == sorted(set(paydays))
+    assert paydays[-1] < date(2028, 6, 15)
+
+
+def test_iter_paydays_backwards_stops_at_end(calc):
+    schedule = _schedule(calc, "monthly", "last_bank_day")
+    paydays = list(calc.iter_paydays(schedule, TODAY, date(2025, 12, 31), reverse=True))
+    assert paydays[0] == date(2026, 5, 29)
+    assert paydays[-1] == date(2026, 1, 30)
+    assert paydays == sorted(paydays, reverse=True)
+
+
+def test_iter_paydays_backwards_stops_at_anchor(calc):
+    schedule = _schedule(calc, "14_days", last_pay_date="2026-05-01")
+    paydays = list(calc.iter_paydays(schedule, TODAY, reverse=True))
+    assert paydays == [
+        date(2026, 6, 12),
+        date(2026, 5, 29),
+        date(2026, 5, 15),
+        date(2026, 5, 1),
+    ]
+
+
+def test_iter_paydays_extends_holidays_a_year_at_a_time(calc, constructions):
+    schedule = _schedule(calc, "monthly", "last_bank_day")
+    paydays = calc.iter_paydays(schedule, TODAY)
+    next(paydays)
+    assert [years for _, years in constructions[1:]] == [[2026]]
+    for payday in paydays:
+        if payday.year == 2028:
+            break
+    assert [years for _, years in constructions[1:]] == [[2026], [2027], [2028]]
+
+
+def test_iter_paydays_invalid_pay_day_is_empty(calc):
+    assert list(calc.iter_paydays(_schedule(calc, "monthly", 0), TODAY)) == []
+    assert list(calc.iter_paydays(_schedule(calc, "monthly", None), TODAY)) == []
+
+
+# --------------------------------------------------------------------------- #
+# Batch calculation                                                            #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def batch(calc):
+    """Import the batch module on top of the freshly imported calculator."""
+    import importlib
+
+    return importlib.import_module("custom_components.isitpayday.batch")
+
+
+def _batch_schedules(calc):
+    # Dates rather than ISO strings: the calculator parses strings with its
+    # pinned `date`, which cannot be sent to a worker process.
+    return [
+        _schedule(calc, "monthly", "last_bank_day"),
+        calc.PaydaySchedule("DE", "monthly", 15, subdiv="BY"),
+        _schedule(calc, "14_days", None, date(2026, 6, 12)),
+        calc.PaydaySchedule("SA", "weekly", weekday=4),
+        _schedule(calc, "monthly", 25, closed_days=[date(2026, 6, 25)]),
+        calc.PaydaySchedule("DE", "bimonthly", None, date(2026, 4, 15)),
+    ]
+
+
+def test_batch_matches_single_schedule_results(calc, batch):
+    schedules = _batch_schedules(calc)
+    result = batch.calculate_paydays_batch(schedules, 365, start=TODAY)
+
+    end = TODAY + timedelta(days=365)
+    assert result.paydays == [
+        list(calc.iter_paydays(schedule, TODAY, end)) for schedule in schedules
+    ]
+    assert result.paydays[0][:12] == calc.calculate_upcoming_paydays(schedules[0])
+
+
+def test_batch_compiles_each_region_once(calc, batch, constructions):
+    schedules = _batch_schedules(calc) * 10
+    batch.calculate_paydays_batch(schedules, timedelta(days=400), start=TODAY)
+
+    # One holiday table per region (DK, DE-BY, SA, DE), not per schedule.
+    tables = sorted(country for country, years in constructions if years)
+    assert tables == ["DE", "DE", "DK", "SA"]
+
+
+def test_batch_reports_stage_timings(calc, batch):
+    result = batch.calculate_paydays_batch(_batch_schedules(calc), 90, start=TODAY)
+    assert set(result.timings) == {"group", "compile", "evaluate", "total"}
+    assert all(seconds >= 0 for seconds in result.timings.values())
+
+
+def test_batch_empty(calc, batch):
+    assert batch.calculate_paydays_batch([], 365).paydays == []
+
+
+def test_batch_process_pool_keeps_input_order(calc, batch):
+    schedules = _batch_schedules(calc)
+    serial = batch.calculate_paydays_batch(schedules, 365, start=TODAY)
+    pooled = batch.calculate_paydays_batch(schedules, 365, start=TODAY, max_workers=2)
+    assert pooled.paydays == serial.paydays
+
+
+# --------------------------------------------------------------------------- #
+# Shared schedules                                                             #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def shared(calc):
+    """Import the shared module on top of the freshly imported calculator."""
+    import importlib
+
+    return importlib.import_module("custom_components.isitpayday.shared")
+
+
+def test_shared_region_released_with_last_entry(calc, shared):
+    schedules = shared.SharedSchedules()
+    monthly = calc.PaydaySchedule("DE", "monthly", 15, subdiv="BY")
+    weekly = calc.PaydaySchedule("DE", "weekly", weekday=4, subdiv="BY")
+    other = calc.PaydaySchedule("DE", "monthly", 15)
+    for schedule in (monthly, weekly, other):
+        schedules.acquire(schedule)
+        calc.calculate_payday_window(schedule)
+    assert ("DE", "BY") in calc._BANK_CALENDARS
+
+    schedules.release(monthly)
+    assert ("DE", "BY") in calc._BANK_CALENDARS
+    schedules.release(weekly)
+    assert ("DE", "BY") not in calc._BANK_CALENDARS
+    assert not any(key[:2] == ("DE", "BY") for key in calc._HOLIDAY_CACHE._tables)
+    # Other subdivisions of the country are untouched.
+    assert ("DE", None) in calc._BANK_CALENDARS
+    assert schedules.info()["regions"] == 1
+
+
+def test_released_region_reused_without_compiling(calc, shared, constructions):
+    schedules = shared.SharedSchedules()
+    schedule = calc.PaydaySchedule("DE", "monthly", 15, subdiv="BY")
+    schedules.acquire(schedule)
+    window = calc.calculate_payday_window(schedule)
+    generated = len(constructions)
+    schedules.release(schedule)
+
+    # Still saved, and compiled, until the region is used again.
+    saved = calc.export_bank_closing_days(TODAY.year)["regions"]
+    assert "DE/BY" in saved
+    assert calc.bank_years_compiled("DE", calc.window_years(TODAY), "BY")
+
+    schedules.acquire(schedule)
+    assert calc.calculate_payday_window(schedule) == window
+    assert len(constructions) == generated
+    assert ("DE", "BY") in calc._BANK_CALENDARS
+
+
+def test_released_calendars_are_bounded(calc, shared):
+    schedules = shared.SharedSchedules()
+    regions = [("DE", "BY"), ("DE", None), ("DK", None), ("US", "NY"), ("US", "CA")]
+    for country, subdiv in regions:
+        schedule = calc.PaydaySchedule(country, "monthly", 15, subdiv=subdiv)
+        schedules.acquire(schedule)
+        calc.calculate_payday_window(schedule)
+        schedules.release(schedule)
+    assert list(calc._RELEASED_CALENDARS) == regions[1:]
+    assert not calc._BANK_CALENDARS
+
+
+def test_shared_region_release_drops_overlays(calc, shared):
+    schedules = shared.SharedSchedules()
+    schedule = _schedule(calc, "monthly", 25, closed_days=[date(2026, 6, 25)])
+    schedules.acquire(schedule)
+    calc.calculate_payday_window(schedule)
+    schedules.release(schedule)
+    assert not any(key[0] == "DK" for key in calc._BANK_CALENDARS)
+
+
+def test_changed_closure_days_drop_the_old_overlay(calc, shared):
+    schedules = shared.SharedSchedules()
+    old = _schedule(calc, "monthly", 25, closed_days=[date(2026, 6, 25)])
+    same = _schedule(calc, "weekly", weekday=4, closed_days=[date(2026, 6, 25)])
+    new = _schedule(calc, "monthly", 25, closed_days=[date(2026, 6, 24)])
+    for schedule in (old, same, new):
+        calc.calculate_payday_window(schedule)
+    schedules.acquire(old)
+    schedules.acquire(same)
+    overlays = {key for key in calc._BANK_CALENDARS if len(key) == 4}
+    assert len(overlays) == 2
+
+    # As when an entry's closure days change: acquire the new, release the
+    # old. The old overlay stays while another schedule still uses it.
+    schedules.acquire(new)
+    schedules.release(old)
+    assert {key for key in calc._BANK_CALENDARS if len(key) == 4} == overlays
+    schedules.release(same)
+    assert [key[2] for key in calc._BANK_CALENDARS if len(key) == 4] == [
+        frozenset({date(2026, 6, 24)})
+    ]
+    assert ("DK", None) in calc._BANK_CALENDARS
+
+
+def test_identical_schedules_share_a_window(calc, shared):
+    schedules = shared.SharedSchedules()
+    schedule = _schedule(calc, "monthly", "last_bank_day")
+    same = _schedule(calc, "monthly", "last_bank_day")
+    schedules.acquire(schedule)
+    schedules.acquire(same)
+
+    assert schedules.get_window(same, TODAY) is None
+    window = calc.calculate_payday_window(schedule)
+    schedules.put_window(schedule, TODAY, window)
+    assert schedules.get_window(same, TODAY) is window
+    assert schedules.get_window(same, window.valid_until - timedelta(days=1))
+    # Expired, or asked for a day before it was calculated.
+    assert schedules.get_window(same, window.valid_until) is None
+    assert schedules.get_window(same, TODAY - timedelta(days=1)) is None
+    assert schedules.info()["schedules"] == 1
+
+    schedules.release(schedule)
+    assert schedules.get_window(same, TODAY) is window
+    schedules.release(same)
+    assert schedules.get_window(same, TODAY) is None
+
+
+def test_unused_schedule_window_not_shared(calc, shared):
+    schedules = shared.SharedSchedules()
+    schedule = _schedule(calc, "monthly", "last_bank_day")
+    schedules.put_window(schedule, TODAY, calc.calculate_payday_window(schedule))
+    assert schedules.get_window(schedule, TODAY) is None
+
+
+# --------------------------------------------------------------------------- #
+# Calculation executor                                                         #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def executor(calc):
+    """Import the executor module; shut down the pools a test starts."""
+    import importlib
+
+    module = importlib.import_module("custom_components.isitpayday.executor")
+    pools = []
+
+    def create(max_workers=module.DEFAULT_MAX_WORKERS):
+        pools.append(module.CalculationExecutor(max_workers))
+        return pools[-1]
+
+    yield create
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_executor_coalesces_jobs_with_same_key(executor):
+    pool = executor()
+    release = threading.Event()
+    calls = []
+
+    def calculate(value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+
+    async def run():
+        waiters = [
+            asyncio.ensure_future(pool.async_run("key", calculate, 21))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert pool.info()["in_flight"] == 1
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == [42] * 5
+    assert calls == [21]
+    info = pool.info()
+    assert (info["jobs"], info["coalesced"], info["in_flight"]) == (1, 4, 0)
+
+
+def test_executor_runs_again_once_job_is_done(executor):
+    pool = executor()
+
+    async def run():
+        first = await pool.async_run("key", lambda: object())
+        second = await pool.async_run("key", lambda: object())
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+    assert pool.info()["jobs"] == 2
+
+
+def test_executor_queue_metrics(executor):
+    pool = executor(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    async def run():
+        blocking = asyncio.ensure_future(pool.async_run("block", block))
+        await asyncio.to_thread(started.wait, 5)
+        queued = [
+            asyncio.ensure_future(pool.async_run(key, lambda: None)) for key in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        info = pool.info()
+        release.set()
+        await asyncio.gather(blocking, *queued)
+        return info
+
+    during = asyncio.run(run())
+    assert during["queued"] == 3
+    after = pool.info()
+    assert (after["jobs"], after["queued"], after["max_queued"]) == (4, 0, 3)
+    # The queued jobs waited for the blocking one.
+    assert after["wait_max"] >= 0.04
+    assert 0 < after["wait_mean"] <= after["wait_max"]
+    assert after["run_total"] >= 0.04
+
+
+def test_executor_errors_reach_every_waiter(executor):
+    pool = executor()
+
+    def fail():
+        raise ValueError("no payday")
+
+    async def run():
+        return await asyncio.gather(
+            pool.async_run("key", fail),
+            pool.async_run("key", fail),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run())
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+    assert pool.info()["in_flight"] == 0
+
+
+def test_executor_cancelled_waiter_keeps_job(executor):
+    pool = executor()
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(pool.async_run("key", release.wait, 5))
+        second = asyncio.ensure_future(pool.async_run("key", release.wait, 5))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        return await second
+
+    assert asyncio.run(run()) is True
+
+
+def test_executor_restarts_after_shutdown(executor):
+    pool = executor()
+    assert asyncio.run(pool.async_run("key", sum, [1, 2])) == 3
+    pool.shutdown()
+    assert asyncio.run(pool.async_run("key", sum, [3, 4])) == 7
+
+
+def test_compile_bank_years(calc):
+    years = calc.window_years(TODAY)
+    assert list(years) == [2025, 2026, 2027, 2028]
+    assert not calc.bank_years_compiled("DK", years)
+    calc.compile_bank_years("DK", years)
+    assert calc.bank_years_compiled("DK", years)
+    assert not calc.bank_years_compiled("DK", [2029])
+    assert not calc.bank_years_compiled("DE", years, "BY")
+
+
 # --------------------------------------------------------------------------- #
 # Last payday                                                                  #
 # --------------------------------------------------------------------------- #
 
 
 def test_last_payday_monthly_is_on_or_before_today(calc):
-    last = calc.calculate_last_payday("DK", "monthly", "last_bank_day")
+    last = calc.calculate_last_payday(
+        calc.PaydaySchedule("DK", "monthly", "last_bank_day")
+    )
     assert last is not None and last <= TODAY
 
 
 def test_last_payday_weekly(calc):
     # Today is Monday (weekday 0); last Friday payday should be 12 June 2026.
-    last = calc.calculate_last_payday("DK", "weekly", weekday=4)
+    last = calc.calculate_last_payday(calc.PaydaySchedule("DK", "weekly", weekday=4))
     assert last == date(2026, 6, 12)
 
 
 def test_last_payday_interval_future_anchor_returns_none(calc):
-    assert calc.calculate_last_payday("DK", "14_days", None, "2026-12-01") is None
+    assert (
+        calc.calculate_last_payday(
+            calc.PaydaySchedule("DK", "14_days", None, "2026-12-01")
+        )
+        is None
+    )
 
 
 def test_last_payday_bimonthly(calc):
-    last = calc.calculate_last_payday("DK", "bimonthly", None, "2026-04-15")
+    last = calc.calculate_last_payday(
+        calc.PaydaySchedule("DK", "bimonthly", None, "2026-04-15")
+    )
     assert last is not None and last <= TODAY
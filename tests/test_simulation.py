@@ -0,0 +1,367 @@
+"""Years of coordinator refreshes and payday events on a virtual clock."""
+
+import asyncio
+import sys
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from harness.home_assistant import (
+    Simulation,
+    VirtualClock,
+    homeassistant_modules,
+    load_integration,
+)
+
+TZ = ZoneInfo("Europe/Copenhagen")
+START = date(2026, 1, 1)
+YEARS = 10
+
+
+def _simulation(calc, monkeypatch, time_zone=None) -> Simulation:
+    clock = VirtualClock(datetime.combine(START, time(), TZ), TZ)
+    for name, module in homeassistant_modules(clock, None, time_zone).items():
+        monkeypatch.setitem(sys.modules, name, module)
+    # Replaced by the real package; restored after the test.
+    monkeypatch.setitem(sys.modules, "custom_components.isitpayday", None)
+    return Simulation(load_integration(), calc, clock)
+
+
+@pytest.fixture
+def simulation(calc, monkeypatch):
+    simulation = _simulation(calc, monkeypatch)
+    yield simulation
+    simulation.stop()
+
+
+def _paydays(calc, schedule, start: date, end: date) -> list[date]:
+    """Return the days between start and end that are their own next payday.
+
+    These are the days the binary sensor is on; a payday announced ahead
+    of time can still be dropped before it arrives.
+    """
+    paydays = []
+    day = start
+    while day < end:
+        if next(calc.iter_paydays(schedule, day, day + timedelta(days=1)), None) == day:
+            paydays.append(day)
+        day += timedelta(days=1)
+    return paydays
+
+
+SCHEDULES = {
+    "monthly": {
+        "country": "DK",
+        "pay_frequency": "monthly",
+        "pay_day": "last_bank_day",
+    },
+    "monthly_offset": {
+        "country": "DE",
+        "subdivision": "BY",
+        "pay_frequency": "monthly",
+        "pay_day": 15,
+        "bank_offset": 2,
+        "event_time": "23:30",
+    },
+    "14_days": {
+        "country": "DK",
+        "pay_frequency": "14_days",
+        "last_pay_date": "2025-12-19",
+    },
+    "weekly": {
+        "country": "US",
+        "subdivision": "CA",
+        "pay_frequency": "weekly",
+        "weekday": 4,
+    },
+}
+
+
+@pytest.mark.parametrize("name", SCHEDULES)
+def test_payday_event_fires_once_per_payday(calc, simulation, name):
+    config = SCHEDULES[name]
+    end = START.replace(year=START.year + YEARS)
+
+    async def run():
+        await simulation.async_setup()
+        await simulation.async_add_entry(config)
+        await simulation.async_run(
+            datetime.combine(end, time(), TZ) - simulation.clock.local()
+        )
+
+    asyncio.run(run())
+    report = simulation.report()
+
+    schedule = calc.PaydaySchedule.from_config(config)
+    expected = _paydays(calc, schedule, START, end)
+    fired = [
+        event for event in report.events if event.event_type == "isitpayday_payday"
+    ]
+    assert [date.fromisoformat(event.data["date"]) for event in fired] == expected
+
+    # Each event fires at the configured local time on the payday itself.
+    event_time = time.fromisoformat(config.get("event_time", "06:00"))
+    for event in fired:
+        local = event.time.astimezone(TZ)
+        assert local.date().isoformat() == event.data["date"]
+        assert local.time() == event_time
+
+    # One refresh at midnight, the safety net every 6 hours and one after
+    # each payday event; the cached window is reused between paydays.
+    paydays_per_day = len(expected) / report.days
+    assert report.refreshes_per_day <= 1 + 4 + paydays_per_day + 0.01
+    assert report.calculator_calls_per_day <= 3 * paydays_per_day + 0.01
+    assert report.executor_jobs_per_day <= 3 * paydays_per_day + 0.01
+    print(
+        f"{name}: {len(fired)} events in {report.days:.0f} days,"
+        f" {report.refreshes_per_day:.1f} refreshes,"
+        f" {report.calculator_calls_per_day:.3f} calculator calls and"
+        f" {report.executor_jobs_per_day:.3f} executor jobs per day"
+    )
+
+
+def test_refreshes_at_local_midnight(simulation):
+    updates = []
+
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(SCHEDULES["monthly"])
+        coordinator = simulation.hass.data["isitpayday"][entry.entry_id]["coordinator"]
+        coordinator.async_add_listener(lambda: updates.append(simulation.clock.local()))
+        # Across both daylight saving time changes.
+        await simulation.async_run(timedelta(days=365))
+
+    asyncio.run(run())
+    midnights = [update.date() for update in updates if update.time() == time()]
+    assert midnights == [START + timedelta(days=day) for day in range(1, 366)]
+
+
+def test_bank_days_until_payday_counted_from_data(calc, simulation):
+    counts = []
+
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(SCHEDULES["monthly_offset"])
+        coordinator = simulation.hass.data["isitpayday"][entry.entry_id]["coordinator"]
+
+        def listener():
+            data, today = coordinator.data, simulation.clock.today()
+            bank_days = data["bank_days_next"]
+            left = len(bank_days) - bisect_left(bank_days, today)
+            counts.append((today, data["payday_next"], left))
+
+        coordinator.async_add_listener(listener)
+        await simulation.async_run(timedelta(days=90))
+
+    asyncio.run(run())
+    schedule = calc.PaydaySchedule.from_config(SCHEDULES["monthly_offset"])
+    for today, payday, left in counts:
+        expected = schedule.bank_calendar.count_bank_days(today, max(today, payday))
+        assert left == expected
+
+
+def test_time_zone_mismatch_does_not_loop(calc, monkeypatch):
+    # Home Assistant's day starts 13 hours before the system's, so for most
+    # of the system's day the next midnight in Home Assistant has passed.
+    simulation = _simulation(calc, monkeypatch, ZoneInfo("Pacific/Kiritimati"))
+    updates = []
+
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(SCHEDULES["monthly"])
+        coordinator = simulation.hass.data["isitpayday"][entry.entry_id]["coordinator"]
+        coordinator.async_add_listener(lambda: updates.append(simulation.clock.now))
+        await simulation.async_run(timedelta(days=2))
+
+    asyncio.run(run())
+    simulation.stop()
+    gaps = [later - earlier for earlier, later in zip(updates, updates[1:])]
+    assert min(gaps) >= timedelta(minutes=5)
+
+
+@pytest.mark.parametrize("zone", ["Pacific/Kiritimati", "America/Los_Angeles"])
+def test_refreshes_at_home_assistant_midnight(calc, monkeypatch, zone):
+    # Home Assistant's day starts before (Kiritimati) or after (Los Angeles)
+    # the system's; the refreshes and the paydays follow Home Assistant's.
+    ha_tz = ZoneInfo(zone)
+    simulation = _simulation(calc, monkeypatch, ha_tz)
+    updates = []
+
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(SCHEDULES["weekly"])
+        coordinator = simulation.hass.data["isitpayday"][entry.entry_id]["coordinator"]
+
+        def listener():
+            local = simulation.clock.now.astimezone(ha_tz)
+            updates.append((local, coordinator.data["payday_next"]))
+
+        coordinator.async_add_listener(listener)
+        await simulation.async_run(timedelta(days=30))
+
+    asyncio.run(run())
+    simulation.stop()
+    midnights = [local.date() for local, _ in updates if local.time() == time()]
+    first = midnights[0]
+    assert midnights == [first + timedelta(days=day) for day in range(len(midnights))]
+    assert len(midnights) >= 29
+    # No polling in between: the safety net and midnight, at most.
+    assert len(updates) <= 30 * 5
+    assert all(payday >= local.date() for local, payday in updates)
+
+
+async def _async_run_entries(simulation, configs, days: int) -> int:
+    """Set up the entries, run them; return the calculator calls of the run."""
+    await simulation.async_setup()
+    for config in configs:
+        await simulation.async_add_entry(config)
+    calls = simulation.calculator_calls
+    await simulation.async_run(timedelta(days=days))
+    return simulation.calculator_calls - calls
+
+
+def test_entries_share_regions_and_windows(calc, simulation, monkeypatch):
+    distinct = [SCHEDULES["monthly"], SCHEDULES["14_days"], SCHEDULES["weekly"]]
+    run_calls = asyncio.run(_async_run_entries(simulation, distinct * 10, 365))
+    # Setting up compiles each region and calculates each distinct schedule
+    # once.
+    assert simulation.calculator_calls - run_calls == 2 + 3
+    info = simulation.hass.data["isitpayday"]["shared"].info()
+    assert (info["entries"], info["regions"], info["schedules"]) == (30, 2, 3)
+    assert info["hits"] > info["misses"]
+    # Every entry still fires its own events.
+    events = simulation.hass.bus.events
+    assert len({event.data["entry_id"] for event in events}) == 30
+
+    async def unload():
+        for entry in list(simulation.entries):
+            await simulation.async_unload_entry(entry)
+
+    asyncio.run(unload())
+    assert simulation.hass.data["isitpayday"]["shared"].info()["entries"] == 0
+    assert not calc._BANK_CALENDARS
+
+    # Thirty entries cost as much as one entry per distinct schedule.
+    single = _simulation(calc, monkeypatch)
+    assert asyncio.run(_async_run_entries(single, distinct, 365)) == run_calls
+    single.stop()
+
+
+def test_concurrent_setups_coalesce_calculations(simulation):
+    # As at startup, when Home Assistant sets up every entry at once.
+    distinct = [SCHEDULES["monthly"], SCHEDULES["14_days"], SCHEDULES["weekly"]]
+
+    async def run():
+        await simulation.async_setup()
+        await asyncio.gather(
+            *(simulation.async_add_entry(config) for config in distinct * 10)
+        )
+
+    asyncio.run(run())
+    # Two regions compiled and three windows calculated, once each.
+    assert simulation.calculator_calls == 2 + 3
+    info = simulation.hass.data["isitpayday"]["executor"].info()
+    # Plus one country check per country and an export of the bank days for
+    # saving, or two if a region finished compiling while the first ran; the
+    # other requests waited.
+    assert 2 + 2 + 3 + 1 <= info["jobs"] <= 2 + 2 + 3 + 2
+    assert info["coalesced"] > 0
+    assert info["in_flight"] == 0
+
+
+def test_unsupported_country_issue_survives_restart(calc, monkeypatch):
+    configs = [SCHEDULES["monthly"], {**SCHEDULES["monthly"], "country": "XX"}]
+
+    async def run(simulation):
+        await simulation.async_setup()
+        for config in configs:
+            await simulation.async_add_entry(config)
+        await simulation.async_run(timedelta(days=1))
+        simulation.stop()
+        return simulation.hass
+
+    first = asyncio.run(run(_simulation(calc, monkeypatch)))
+    assert list(first.issues) == [("isitpayday", "unsupported_country_entry2")]
+    assert first.storage
+
+    # Restart with the saved bank days.
+    calc.clear_holiday_cache()
+    second = _simulation(calc, monkeypatch)
+    second.hass.storage = first.storage
+    assert list(asyncio.run(run(second)).issues) == list(first.issues)
+
+
+def test_closure_days_recalculate_affected_paydays_only(calc, simulation):
+    config = SCHEDULES["monthly"]
+
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(config)
+        await simulation.async_run(timedelta(days=1))
+        calls = [simulation.calculator_calls]
+        for closed in (["2027-09-15"], ["2027-09-15", "2026-08-31"]):
+            entry.options = {"closed_days": closed}
+            await simulation.integration._async_update_listener(simulation.hass, entry)
+            await simulation.async_run(timedelta(minutes=1))
+            calls.append(simulation.calculator_calls)
+        coordinator = simulation.hass.data["isitpayday"][entry.entry_id]["coordinator"]
+        return coordinator.data, calls
+
+    data, calls = asyncio.run(run())
+    # 15 September 2027 is beyond the cached paydays; 31 August is one of them,
+    # and only the paydays near it are calculated again.
+    assert calls[1] == calls[0]
+    assert calls[2] == calls[1] + 1
+    schedule = calc.PaydaySchedule.from_config(
+        {**config, "closed_days": ["2027-09-15", "2026-08-31"]}
+    )
+    window = calc.calculate_payday_window(schedule)
+    assert data["paydays_upcoming"] == window.upcoming
+    assert date(2026, 8, 28) in window.upcoming
+
+
+def test_invalid_settings_retry_setup(simulation):
+    config = {**SCHEDULES["14_days"], "last_pay_date": "19/12/2025"}
+
+    async def run():
+        await simulation.async_setup()
+        await simulation.async_add_entry(config)
+
+    with pytest.raises(sys.modules["homeassistant.exceptions"].ConfigEntryNotReady):
+        asyncio.run(run())
+
+
+def test_failed_setup_releases_region(calc, simulation, monkeypatch):
+    async def fail(entry, platforms):
+        raise RuntimeError("platform failed")
+
+    monkeypatch.setattr(
+        simulation.hass.config_entries, "async_forward_entry_setups", fail
+    )
+
+    async def run():
+        await simulation.async_setup()
+        await simulation.async_add_entry(SCHEDULES["monthly"])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    data = simulation.hass.data["isitpayday"]
+    assert data["shared"].info()["regions"] == 0
+    assert "entry1" not in data
+    assert not calc._BANK_CALENDARS
+
+
+def test_unload_stops_events(simulation):
+    async def run():
+        await simulation.async_setup()
+        entry = await simulation.async_add_entry(SCHEDULES["weekly"])
+        await simulation.async_run(timedelta(days=14))
+        fired = len(simulation.hass.bus.events)
+        entry.unload()
+        await simulation.async_run(timedelta(days=14))
+        return fired
+
+    assert asyncio.run(run()) == 2
+    assert len(simulation.hass.bus.events) == 2